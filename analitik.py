@@ -0,0 +1,129 @@
+import os
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+# Görüntülenme olaylarından günlük özetler ve yönetim paneli grafikleri.
+#   ozetle(conn)                     -> son işaretten sonraki ham olayları günlük toplamlara ekler
+#   grafikleri_ciz(conn, klasor, ..) -> özet tablosundan PNG'ler (panel bunları dosyadan sunar)
+# analitik_gunluk: (boyut, gun, anahtar) başına adet; boyut "yazi" / "yazar" / "kategori" / "kaynak".
+# Panel sadece özet tablosunu ve çizilmiş grafikleri okur, ham olaylar istek sırasında hiç taranmaz.
+# pandas/matplotlib ağır: app.py bu modülü sadece özet işinde ve CLI'da yükler.
+
+# boyut -> olay tablosundaki sütun (yazar ve kategori yazıdan, özetleme anındaki değeriyle)
+BOYUTLAR = {"yazi": "post_id", "yazar": "author_id", "kategori": "kategori", "kaynak": "kaynak"}
+
+_OLAY_SQL = """
+    SELECT o.id, o.post_id, o.zaman, o.kaynak, y.author_id, y.kategori
+    FROM goruntulenme_olaylari o
+    LEFT JOIN yazilar y ON y.id = o.post_id
+    WHERE o.id > ?
+    ORDER BY o.id
+    LIMIT ?
+"""
+_EKLE_SQL = """
+    INSERT INTO analitik_gunluk (boyut, gun, anahtar, adet) VALUES (?, ?, ?, ?)
+    ON CONFLICT (boyut, gun, anahtar) DO UPDATE SET adet = adet + excluded.adet
+"""
+
+
+def gunluk_toplamlar(olaylar, saat_dilimi):
+    # olaylar: id, post_id, zaman (unix sn), kaynak, author_id, kategori -> boyut, gun, anahtar, adet
+    gun = pd.to_datetime(olaylar["zaman"], unit="s", utc=True).dt.tz_convert(saat_dilimi).dt.strftime("%Y-%m-%d")
+    olaylar = olaylar.assign(gun=gun)
+    parcalar = []
+    for boyut, sutun in BOYUTLAR.items():
+        # silinmiş yazının olayı yazar/kategoriye sayılmaz
+        sayilar = olaylar.dropna(subset=[sutun]).groupby(["gun", sutun], sort=False).size()
+        if sayilar.empty:
+            continue
+        parca = sayilar.rename("adet").reset_index().rename(columns={sutun: "anahtar"})
+        if parca["anahtar"].dtype.kind == "f":  # LEFT JOIN'den float gelen id'ler
+            parca["anahtar"] = parca["anahtar"].astype("int64")
+        parca["anahtar"] = parca["anahtar"].astype(str)
+        parca.insert(0, "boyut", boyut)
+        parcalar.append(parca)
+    return pd.concat(parcalar, ignore_index=True)
+
+
+def ozetle(conn, saat_dilimi="UTC", parti=50_000, saklama_gun=90):
+    # tekrar çalışmaya dayanıklı: işaret ve toplamlar aynı transaction'da ilerler.
+    # BEGIN IMMEDIATE: aynı anda iki özet işi aynı olayları iki kez saymasın
+    toplam = 0
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            satir = conn.execute("SELECT deger FROM analitik_durum WHERE ad = 'son_olay'").fetchone()
+            son = satir[0] if satir else 0
+            olaylar = pd.read_sql_query(_OLAY_SQL, conn, params=(son, parti))
+            if olaylar.empty:
+                conn.rollback()
+                break
+            toplamlar = gunluk_toplamlar(olaylar, saat_dilimi)
+            # numpy sayıları sqlite'a verilmez; tolist() düz Python değerleri döndürür
+            conn.executemany(_EKLE_SQL, zip(*(toplamlar[s].tolist() for s in ("boyut", "gun", "anahtar", "adet"))))
+            son = int(olaylar["id"].max())
+            conn.execute(
+                "INSERT INTO analitik_durum (ad, deger) VALUES ('son_olay', ?) "
+                "ON CONFLICT (ad) DO UPDATE SET deger = excluded.deger",
+                (son,),
+            )
+            # özetlenmiş ve saklama süresini geçmiş ham olaylar
+            conn.execute(
+                "DELETE FROM goruntulenme_olaylari WHERE id <= ? AND zaman < ?",
+                (son, int(time.time()) - saklama_gun * 86400),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        toplam += len(olaylar)
+        if len(olaylar) < parti:
+            break
+    return toplam
+
+
+def _kaydet(fig, yol):
+    # yarım yazılmış dosya sunulmasın
+    gecici = f"{yol}.{os.getpid()}.tmp"
+    fig.savefig(gecici, format="png", dpi=100, bbox_inches="tight")
+    os.replace(gecici, yol)
+
+
+def grafikleri_ciz(conn, klasor, bugun=None, gun=30, kaynak_adlari=None):
+    # gunluk.png: günlük okunma, kaynağa göre yığılı; kategori.png: dönemdeki kategori toplamları
+    os.makedirs(klasor, exist_ok=True)
+    bugun = bugun or date.today()
+    gunler = [(bugun - timedelta(days=i)).isoformat() for i in range(gun - 1, -1, -1)]
+    ozet = pd.read_sql_query(
+        "SELECT boyut, gun, anahtar, adet FROM analitik_gunluk WHERE boyut IN ('kaynak', 'kategori') AND gun >= ?",
+        conn,
+        params=(gunler[0],),
+    )
+
+    kaynaklar = (
+        ozet[ozet["boyut"] == "kaynak"]
+        .pivot_table(index="gun", columns="anahtar", values="adet", aggfunc="sum", fill_value=0)
+        .reindex(gunler, fill_value=0)
+        .rename(columns=kaynak_adlari or {})
+    )
+    fig = Figure(figsize=(9, 3.2))
+    ax = fig.subplots()
+    if kaynaklar.columns.size:
+        ax.stackplot(range(len(gunler)), kaynaklar.T.to_numpy(), labels=list(kaynaklar.columns), alpha=0.85)
+        ax.legend(loc="upper left", fontsize=8, frameon=False)
+    ax.set_xticks(range(0, len(gunler), 5), [g[5:] for g in gunler[::5]])
+    ax.set_ylabel("okunma")
+    ax.spines[["top", "right"]].set_visible(False)
+    _kaydet(fig, os.path.join(klasor, "gunluk.png"))
+
+    kategoriler = ozet[ozet["boyut"] == "kategori"].groupby("anahtar")["adet"].sum().sort_values()
+    fig = Figure(figsize=(5, 3.2))
+    ax = fig.subplots()
+    ax.barh(kategoriler.index, kategoriler.to_numpy(), color="#556B2F")
+    ax.set_xlabel("okunma")
+    ax.spines[["top", "right"]].set_visible(False)
+    _kaydet(fig, os.path.join(klasor, "kategori.png"))
+    return ["gunluk", "kategori"]
@@ -1,43 +1,1794 @@
+import atexit
+import contextlib
+import hashlib
+import itertools
+import json
+import math
+import mimetypes
 import os
+import queue
+import re
+import shutil
 import sqlite3
-from flask import Flask, render_template, request, url_for, redirect, session, abort
-from werkzeug.security import generate_password_hash, check_password_hash
+import threading
+import time
+import click
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+from zoneinfo import ZoneInfo
+from flask import Flask, render_template, request, url_for, redirect, session, abort, g, send_file
+from flask import stream_template
+from flask import before_render_template, template_rendered
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
+from markupsafe import Markup, escape
+from onbellek import BellekOnbellek, DiskOnbellek
+from sablon_onbellegi import ParcaOnbellegi
+import depo
+import isler
+import olcum
+import resim_isleme
+import sifreleme
+import sikistirma
+import sinirlama
+import yazar_onbellegi
 
 app = Flask(__name__)
 app.secret_key = "cok_gizli_anahtar"
 
 # --- AYARLAR ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "database.db")
+DB_PATH = os.environ.get("PROMETHEON_DB", os.path.join(BASE_DIR, "database.db"))
 UPLOAD_FOLDER = os.path.join(BASE_DIR, "static/uploads")
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# yüklemeler önce burada (statik değil) bekler; iş kuyruğu metadata'sını temizleyip uploads/'a yayımlar
+BEKLEYEN_FOLDER = os.path.join(BASE_DIR, "yuklemeler_bekleyen")
+app.config["BEKLEYEN_FOLDER"] = BEKLEYEN_FOLDER
+# yüklenen resimlerin küçültülmüş webp/jpg kopyaları (srcset)
+VARYANT_FOLDER = os.path.join(BASE_DIR, "static/varyantlar")
+app.config["VARYANT_FOLDER"] = VARYANT_FOLDER
+
+# veritabanı bağlantı havuzu (0 = her istekte yeni bağlantı aç/kapat)
+app.config["DB_HAVUZ_BOYUTU"] = 8
+# WAL + performans pragmaları (False = sqlite varsayılanları)
+app.config["DB_PRAGMALAR"] = True
+app.config["DB_CACHE_KB"] = 16 * 1024
+app.config["DB_MMAP_BYTE"] = 128 * 1024 * 1024
+# görüntülenme sayaçları bellekte biriktirilip toplu yazılır
+app.config["GORUNTULENME_FLUSH_SN"] = 5
+app.config["GORUNTULENME_FLUSH_ESIK"] = 200
+# her okunma ayrıca olay olarak yazılır (yazı, zaman, nereden gelindiği); özet işi bunları günlük
+# toplamlara çevirir (analitik.py). Panel sadece özetleri okur. Ham olaylar bu kadar gün saklanır
+app.config["ANALITIK_ARALIK_SN"] = 300
+app.config["ANALITIK_SAKLAMA_GUN"] = 90
+app.config["ANALITIK_SAAT_DILIMI"] = "Europe/Istanbul"
+app.config["ANALITIK_KLASORU"] = os.path.join(BASE_DIR, "onbellek", "analitik")
+# yavaş yan işler (resim küçültme, görüntülenme yazımı) isler tablosundaki kuyruktan çalışır.
+# süreç başına bu kadar işçi thread'i; 0 = süreç içi işçi yok, `flask is-iscisi` ayrı çalıştırılır
+app.config["IS_ISCI_SAYISI"] = int(os.environ.get("PROMETHEON_IS_ISCI", "2"))
+# bu türler web süreçlerinin işçi thread'lerinde hiç çalışmaz, sadece `flask is-iscisi`nde:
+# analitik pandas/matplotlib yükler (~90 MB) ve PNG çizer. is-iscisi çalışmıyorsa özetler beklemede kalır
+app.config["IS_AYRI_SUREC_TURLERI"] = {"analitik"}
+app.config["IS_AZAMI_DENEME"] = 5
+app.config["IS_BEKLEME_SN"] = 2
+# şifre özetleri (KDF) ayrı süreçlerde: aynı anda en fazla SIFRE_ISCI_SAYISI, SIFRE_KUYRUK kadarı sırada.
+# SIFRE_BEKLEME_SN içinde sıra gelmezse "yoğun, tekrar deneyin" (503); 0 işçi = istek thread'inde hesapla
+app.config["SIFRE_ISCI_SAYISI"] = int(os.environ.get("PROMETHEON_SIFRE_ISCI", "2"))
+app.config["SIFRE_KUYRUK"] = 16
+app.config["SIFRE_BEKLEME_SN"] = 3
+# werkzeug yöntemi; maliyet değiştirilirse (örn. "scrypt:65536:8:1") eski özetler doğru girişte yenilenir
+app.config["SIFRE_YONTEMI"] = "scrypt"
+# giriş/kayıt deneme sınırı (jeton kovası): (kapasite, periyot sn) = periyotta en fazla kapasite deneme
+app.config["GIRIS_SINIRI"] = os.environ.get("PROMETHEON_GIRIS_SINIRI", "1") == "1"
+app.config["GIRIS_IP_KOVA"] = (20, 60)
+app.config["GIRIS_EMAIL_KOVA"] = (5, 300)
+app.config["KAYIT_IP_KOVA"] = (10, 3600)
+# önümüzdeki ters vekil (nginx vb.) sayısı: IP sınırı X-Forwarded-For'daki sondan bu kadarıncı adrese göre
+# tutulur, yoksa tüm istemciler vekilin tek IP'sini paylaşır. Doğrudan açıkken 0 olmalı; aksi halde
+# istemci başlığı kendisi yazıp sınırı atlatır
+app.config["VEKIL_SAYISI"] = int(os.environ.get("PROMETHEON_VEKIL", "1"))
+# listelerde sayfa başına yazı
+app.config["SAYFA_BOYUTU"] = 12
+app.config["GALERI_SAYFA_BOYUTU"] = 24
+# yazar adları/profilleri süreç içinde tutulur; başka worker'daki değişiklik en geç bu kadar sn sonra görünür
+app.config["YAZAR_ONBELLEK_KONTROL_SN"] = 2
+# yorumlar: sayfa başına ana yorum, düğüm başına ilk gösterilen cevap, tek sayfada yüklenecek en fazla yorum
+app.config["YORUM_SAYFA_BOYUTU"] = 20
+app.config["CEVAP_SAYFA_BOYUTU"] = 5
+app.config["YORUM_AGAC_LIMIT"] = 300
+# yönetim paneli: liste başına satır, toplu işlemde tek seferde en fazla kayıt
+app.config["ADMIN_SAYFA_BOYUTU"] = 50
+app.config["ADMIN_TOPLU_EN_FAZLA"] = 500
+# yazı kaydedilirken saklanan düz metin özetin uzunluğu
+OZET_UZUNLUK = 300
+# giriş yapmamış okurlar için tam sayfa önbelleği.
+# "bellek": worker başına LRU; "disk": tüm worker'ların paylaştığı SQLite dosyası
+app.config["SAYFA_ONBELLEK"] = os.environ.get("PROMETHEON_ONBELLEK", "bellek")
+app.config["SAYFA_ONBELLEK_YOLU"] = os.path.join(BASE_DIR, "onbellek", "sayfalar.db")
+app.config["SAYFA_ONBELLEK_TTL"] = 60
+app.config["SAYFA_ONBELLEK_BOYUT"] = 512
+# anonim sayfalar için ara vekil (proxy) kaç saniye yeniden doğrulamadan sunabilir
+app.config["PROXY_MAX_AGE"] = 30
+# bu eşikleri aşan sorgu ve istekler loglanır (ms)
+app.config["YAVAS_SORGU_MS"] = 100
+app.config["YAVAS_ISTEK_MS"] = 1000
+# yanıtlara Server-Timing başlığı (tarayıcı geliştirici araçlarında görünür); hata ayıklarken açın
+app.config["SERVER_TIMING"] = os.environ.get("PROMETHEON_SERVER_TIMING") == "1"
+# HTML/JSON yanıtları gzip/brotli ile sıkıştırılır; bu boyuttan (byte) küçükler olduğu gibi gider
+app.config["SIKISTIRMA"] = True
+app.config["SIKISTIRMA_EN_AZ"] = 1024
+# bu view'lar HTML'i parça parça gönderir: <head> ve menü, gövde çizilmeden tarayıcıya gider.
+# boş küme = hepsi tek parça. Sayfa önbelleğine girecek (anonim) yanıtlar yine tek parça çizilir
+app.config["AKIS_ROTALARI"] = {"detay", "yazilarim", "admin_panel"}
+# Jinja her ifadeyi ayrı parça üretir; en az bu kadar byte birikince gönderilir (her parça ayrı sıkıştırılır)
+app.config["AKIS_PARCA_BAYT"] = 8192
+# {% cache %} ile işaretli şablon parçaları (yazı kartı, menü/footer) için worker başına LRU
+app.config["PARCA_ONBELLEK"] = True
+app.config["PARCA_ONBELLEK_BOYUT"] = 2048
+app.config["PARCA_ONBELLEK_TTL"] = 300
+# derlenmiş şablonlar (Jinja bytecode) diske yazılır; yeni worker şablonları baştan derlemez ("" = kapalı)
+app.config["SABLON_ONBELLEK_YOLU"] = os.environ.get(
+    "PROMETHEON_SABLON_ONBELLEK", os.path.join(BASE_DIR, "onbellek", "sablonlar")
+)
+# açılışta tüm şablonları derleyip belleğe al; ilk istek derleme beklemesin
+app.config["SABLON_ISIT"] = os.environ.get("PROMETHEON_SABLON_ISIT", "1") == "1"
+# None: sadece debug'da her render'da dosya değişti mi bakılır; production'da kapalı
+app.config["TEMPLATES_AUTO_RELOAD"] = None
+
+if app.config["VEKIL_SAYISI"]:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["VEKIL_SAYISI"], x_proto=app.config["VEKIL_SAYISI"])
+
+if app.config["SABLON_ONBELLEK_YOLU"]:
+    os.makedirs(app.config["SABLON_ONBELLEK_YOLU"], exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(app.config["SABLON_ONBELLEK_YOLU"])
+
+
+# --- VERİTABANI ---
+_db_havuzu = queue.LifoQueue()
+
+
+def _yeni_baglanti():
+    # cached_statements: aynı SQL metni tekrar derlenmesin (prepared statement cache)
+    conn = sqlite3.connect(
+        DB_PATH, timeout=10, check_same_thread=False, cached_statements=256, factory=olcum.OlculenBaglanti
+    )
+    conn.row_factory = sqlite3.Row
+    conn.yavas_esik = app.config["YAVAS_SORGU_MS"] / 1000
+    # eski arama göçü (3) indeksi bununla doldurur; tetikleyiciler artık yazilar.metin'i kullanır
+    conn.create_function("duz_metin", 1, duz_metin, deterministic=True)
+    if app.config["DB_PRAGMALAR"]:
+        # WAL: yazan bir istek okuyanları kilitlemez
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{app.config['DB_CACHE_KB']}")
+        conn.execute(f"PRAGMA mmap_size={app.config['DB_MMAP_BYTE']}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+    if DB_PATH not in _sema_guncel:
+        sema_guncelle(conn)
+    return conn
 
 
 def db_baglantisi_kur():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    # istek başına tek bağlantı; havuzda boşta olan varsa onu kullan
+    if "db" not in g:
+        try:
+            g.db = _db_havuzu.get_nowait()
+        except queue.Empty:
+            g.db = _yeni_baglanti()
+        g.db.sifirla()
+    return g.db
+
+
+@app.teardown_appcontext
+def db_baglantisi_birak(hata):
+    conn = g.pop("db", None)
+    if conn is None:
+        return
+
+    # commit edilmemiş bir şey kaldıysa (hata/abort) geri al
+    if conn.in_transaction:
+        conn.rollback()
+
+    if _db_havuzu.qsize() < app.config["DB_HAVUZ_BOYUTU"]:
+        _db_havuzu.put(conn)
+    else:
+        conn.close()
+
+
+# --- İSTEK ÖLÇÜMÜ ---
+istek_suresi = olcum.Histogram("prometheon_istek_sure_sn", "İsteğin uygulamada geçen süresi.", ("rota", "yontem"))
+istek_sayisi = olcum.Sayac("prometheon_istek_toplam", "Tamamlanan istekler.", ("rota", "durum"))
+sql_sorgu_sayisi = olcum.Sayac("prometheon_sql_sorgu_toplam", "İsteklerde çalışan SQL ifadeleri.", ("rota",))
+sql_suresi = olcum.Sayac("prometheon_sql_sure_sn_toplam", "İsteklerde SQL'de geçen süre.", ("rota",))
+sablon_suresi = olcum.Sayac("prometheon_sablon_sure_sn_toplam", "İsteklerde şablon çiziminde geçen süre.", ("rota",))
+
+
+@app.before_request
+def olcumu_baslat():
+    g.olcum_basi = time.perf_counter()
+
+
+@before_render_template.connect_via(app)
+def _sablon_basladi(sender, template, context, **ek):
+    g.sablon_basi = time.perf_counter()
+
+
+@template_rendered.connect_via(app)
+def _sablon_bitti(sender, template, context, **ek):
+    g.sablon_suresi = g.get("sablon_suresi", 0.0) + time.perf_counter() - g.pop("sablon_basi", time.perf_counter())
+
+
+# after_request'ler ters sırada çalışır: en önce kaydedilen bu, en son çalışır (sıkıştırma vb. dahil).
+# stream edilen yanıtlarda gövdenin üretimi bu süreye girmez
+@app.after_request
+def olcumu_kaydet(cevap):
+    bas = g.get("olcum_basi")
+    if bas is None:
+        return cevap
+    toplam = time.perf_counter() - bas
+    rota = request.endpoint or "bulunamadi"
+    db = g.get("db")
+    sql_adet, sql_sure = (db.adet, db.sure) if db is not None else (0, 0.0)
+    sablon = g.get("sablon_suresi", 0.0)
+
+    istek_suresi.gozlemle((rota, request.method), toplam)
+    istek_sayisi.ekle((rota, str(cevap.status_code)))
+    sql_sorgu_sayisi.ekle((rota,), sql_adet)
+    sql_suresi.ekle((rota,), sql_sure)
+    sablon_suresi.ekle((rota,), sablon)
+
+    if toplam * 1000 >= app.config["YAVAS_ISTEK_MS"]:
+        app.logger.warning(
+            "yavaş istek %s %s: %.0f ms (sql %d sorgu %.0f ms, şablon %.0f ms)",
+            request.method, request.full_path.rstrip("?"), toplam * 1000, sql_adet, sql_sure * 1000, sablon * 1000,
+        )
+    if app.config["SERVER_TIMING"]:
+        cevap.headers["Server-Timing"] = (
+            f'sql;dur={sql_sure * 1000:.1f};desc="{sql_adet} sorgu", '
+            f"sablon;dur={sablon * 1000:.1f}, uygulama;dur={toplam * 1000:.1f}"
+        )
+    return cevap
+
+
+# --- İŞ KUYRUĞU ---
+kuyruk = isler.IsKuyrugu(
+    _yeni_baglanti,
+    baglam=app.app_context,
+    azami_deneme=app.config["IS_AZAMI_DENEME"],
+    bekleme_sn=app.config["IS_BEKLEME_SN"],
+)
+
+
+@app.before_request
+def is_iscilerini_baslat():
+    # ilk istekte; önceki çalışmadan kalan işler de yeni bir iş eklenmesini beklemeden işlenir
+    if app.config["IS_ISCI_SAYISI"]:
+        kuyruk.baslat(app.config["IS_ISCI_SAYISI"], turler=set(kuyruk.gorevler) - app.config["IS_AYRI_SUREC_TURLERI"])
+
+
+@app.cli.command("is-iscisi")
+@click.option("--isci", default=2, show_default=True, help="Aynı anda çalışan iş sayısı.")
+@click.option("--bir-kez", is_flag=True, help="Vadesi gelmiş işleri bitirip çık.")
+def is_iscisi(isci, bir_kez):
+    """İş kuyruğunu işler (web süreçlerinde IS_ISCI_SAYISI=0 ise gerekli)."""
+    if bir_kez:
+        print(f"✅ {kuyruk.bosalt()} iş çalıştırıldı.")
+        return
+    kuyruk.baslat(isci)
+    print(f"⏳ {isci} işçi kuyruğu dinliyor (Ctrl+C ile çık).")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        kuyruk.durdur()
+
+
+@app.cli.command("is-kuyrugu")
+@click.option("--tekrar-dene", is_flag=True, help="Kalıcı hata veren işleri yeniden kuyruğa al.")
+def is_kuyrugu(tekrar_dene):
+    """Bekleyen, çalışan ve hata veren işleri gösterir."""
+    conn = db_baglantisi_kur()
+    if tekrar_dene:
+        adet = conn.execute(
+            "UPDATE isler SET durum = ?, deneme = 0, zaman = ? WHERE durum = ?",
+            (isler.BEKLIYOR, time.time(), isler.HATA),
+        ).rowcount
+        conn.commit()
+        print(f"🔁 {adet} iş yeniden kuyruğa alındı.")
+    simdi = time.time()
+    for tur, durum, adet, en_eski in kuyruk.durum(conn):
+        gecikme = f"   en eski {max(simdi - en_eski, 0):.0f} sn bekliyor" if durum == isler.BEKLIYOR else ""
+        print(f"   {tur:15s} {durum:10s} {adet:6d}{gecikme}")
+    for h in conn.execute(
+        "SELECT id, tur, deneme, hata FROM isler WHERE durum = ? ORDER BY id DESC LIMIT 10", (isler.HATA,)
+    ):
+        print(f"❌ #{h['id']} {h['tur']} ({h['deneme']} deneme): {h['hata']}")
+
+
+# --- GÖRÜNTÜLENME TAMPONU (write-behind) ---
+_goruntulenme_bekleyen = {}
+_goruntulenme_olaylari = []  # (post_id, unix zaman, kaynak)
+_goruntulenme_kilit = threading.Lock()
+_goruntulenme_thread = None
+
+
+ARAMA_MOTORLARI = {"google", "bing", "yandex", "duckduckgo", "yahoo", "ecosia"}
+SOSYAL_AGLAR = {
+    "facebook", "twitter", "instagram", "linkedin", "reddit", "eksisozluk", "whatsapp", "telegram", "youtube",
+}
+SOSYAL_KISA = {"t.co", "x.com", "fb.me", "lnkd.in"}
+KAYNAK_ADLARI = {
+    "dogrudan": "Doğrudan", "ic": "Site içi", "arama": "Arama motoru", "sosyal": "Sosyal medya",
+    "diger": "Diğer siteler",
+}
+
+
+def yonlendiren_sinifi(referrer, host):
+    if not referrer:
+        return "dogrudan"
+    alan = (urlsplit(referrer).hostname or "").lower()
+    if alan == host.split(":")[0].lower():
+        return "ic"
+    etiketler = set(alan.split("."))
+    if etiketler & ARAMA_MOTORLARI:
+        return "arama"
+    if etiketler & SOSYAL_AGLAR or alan.removeprefix("www.") in SOSYAL_KISA:
+        return "sosyal"
+    return "diger"
+
+
+def goruntulenme_ekle(post_id):
+    global _goruntulenme_thread
+
+    olay = (post_id, int(time.time()), yonlendiren_sinifi(request.referrer, request.host))
+    with _goruntulenme_kilit:
+        _goruntulenme_bekleyen[post_id] = _goruntulenme_bekleyen.get(post_id, 0) + 1
+        _goruntulenme_olaylari.append(olay)
+        toplam = sum(_goruntulenme_bekleyen.values())
+        if _goruntulenme_thread is None:
+            _goruntulenme_thread = threading.Thread(
+                target=_goruntulenme_dongusu, name="goruntulenme-flush", daemon=True
+            )
+            _goruntulenme_thread.start()
+
+    if toplam >= app.config["GORUNTULENME_FLUSH_ESIK"]:
+        goruntulenme_bosalt()
+
+
+def goruntulenme_bekleyen(post_id):
+    # henüz yazılmamış artış; sayfada gösterilen sayıya eklenir
+    return _goruntulenme_bekleyen.get(post_id, 0)
+
+
+def goruntulenme_bosalt():
+    with _goruntulenme_kilit:
+        if not _goruntulenme_bekleyen:
+            return 0
+        parti = list(_goruntulenme_bekleyen.items())
+        olaylar = _goruntulenme_olaylari[:]
+        _goruntulenme_bekleyen.clear()
+        _goruntulenme_olaylari.clear()
+
+    # tek satırlık bir iş olarak kuyruğa; yazılar tablosuna yazım işçide, kilitlenirse tekrar denenir
+    try:
+        with app.app_context():
+            conn = db_baglantisi_kur()
+            kuyruk.ekle(conn, "goruntulenme", {"sayilar": parti, "olaylar": olaylar})
+            conn.commit()
+    except Exception:
+        app.logger.exception("goruntulenme kuyruğa yazılamadı, tekrar denenecek")
+        # kaybolmasın: bir sonraki flush'a geri koy
+        with _goruntulenme_kilit:
+            for post_id, adet in parti:
+                _goruntulenme_bekleyen[post_id] = _goruntulenme_bekleyen.get(post_id, 0) + adet
+            _goruntulenme_olaylari[:0] = olaylar
+        return 0
+
+    return len(parti)
+
+
+@kuyruk.gorev("goruntulenme")
+def _goruntulenme_yaz(sayilar, olaylar=()):
+    conn = db_baglantisi_kur()
+    # artışlar tekrar çalışınca iki kez sayılır: iş, yazılarla aynı commit'te bitti işaretlenir
+    if not kuyruk.tamamla(conn):
+        conn.rollback()
+        return
+    conn.executemany(
+        "UPDATE yazilar SET goruntulenme = COALESCE(goruntulenme,0) + ? WHERE id = ?",
+        [(adet, post_id) for post_id, adet in sayilar],
+    )
+    if olaylar:
+        conn.executemany("INSERT INTO goruntulenme_olaylari (post_id, zaman, kaynak) VALUES (?, ?, ?)", olaylar)
+        analitik_planla(conn)
+    conn.commit()
+
+
+def _goruntulenme_dongusu():
+    while True:
+        time.sleep(app.config["GORUNTULENME_FLUSH_SN"])
+        goruntulenme_bosalt()
+
+
+# kapanışta bekleyen sayaçları kaybetme
+atexit.register(goruntulenme_bosalt)
+
+
+# --- YANIT SIKIŞTIRMA ---
+def sikistirilmis_gonder(cevap, govdeler):
+    # govdeler: {kodlama: sıkıştırılmış gövde}; istemci birini kabul ediyorsa gövde onunla değişir
+    cevap.vary.add("Accept-Encoding")
+    kodlama = sikistirma.kodlama_sec(request.accept_encodings, govdeler)
+    if kodlama is None:
+        return cevap
+    cevap.set_data(govdeler[kodlama])
+    cevap.headers["Content-Encoding"] = kodlama
+    _etag_zayiflat(cevap)
+    return cevap
+
+
+def _etag_zayiflat(cevap):
+    # sıkıştırılmış gövde bayt bayt aynı değil; güçlü ETag zayıfa çevrilir (304 yine çalışır)
+    etag, zayif = cevap.get_etag()
+    if etag and not zayif:
+        cevap.set_etag(etag, weak=True)
+
+
+# sayfa önbelleğine yazandan sonra çalışsın diye ondan önce kaydedilir (after_request ters sırada çalışır);
+# önbellekten gelen ya da önbelleğe yeni giren yanıt zaten sıkıştırılmış olur ve burada atlanır
+@app.after_request
+def yaniti_sikistir(cevap):
+    if (
+        not app.config["SIKISTIRMA"]
+        or "Content-Encoding" in cevap.headers
+        or cevap.direct_passthrough
+        or cevap.status_code in (204, 206, 304)
+        or not sikistirma.uygun_tur(cevap.mimetype)
+        or cevap.cache_control.no_transform
+    ):
+        return cevap
+    cevap.vary.add("Accept-Encoding")
+    kodlama = sikistirma.kodlama_sec(request.accept_encodings)
+    if kodlama is None:
+        return cevap
+
+    if cevap.is_streamed:
+        cevap.response = sikistirma.akis(cevap.response, kodlama)
+        cevap.headers.pop("Content-Length", None)
+    elif cevap.content_length is None or cevap.content_length < app.config["SIKISTIRMA_EN_AZ"]:
+        return cevap
+    else:
+        cevap.set_data(sikistirma.sikistir(cevap.get_data(), kodlama))
+    cevap.headers["Content-Encoding"] = kodlama
+    _etag_zayiflat(cevap)
+    return cevap
+
+
+# --- SAYFA ÖNBELLEĞİ (anonim okurlar) ---
+if app.config["SAYFA_ONBELLEK"] == "disk":
+    sayfa_onbellegi = DiskOnbellek(app.config["SAYFA_ONBELLEK_YOLU"], app.config["SAYFA_ONBELLEK_BOYUT"])
+else:
+    sayfa_onbellegi = BellekOnbellek(app.config["SAYFA_ONBELLEK_BOYUT"])
+
+# parçalar giriş yapmış kullanıcılarda da kullanılır; anahtarlar role göre ayrılır
+parca_onbellegi = BellekOnbellek(app.config["PARCA_ONBELLEK_BOYUT"])
+app.jinja_env.add_extension(ParcaOnbellegi)
+app.jinja_env.parca_onbellegi = parca_onbellegi if app.config["PARCA_ONBELLEK"] else None
+app.jinja_env.parca_onbellegi_ttl = app.config["PARCA_ONBELLEK_TTL"]
+
+
+def onbellek_etiketle(*etiketler):
+    # view bu sayfayı önbelleğe alınabilir işaretler; etiketler hassas silme içindir
+    g.onbellek_etiketleri = g.get("onbellek_etiketleri", ()) + etiketler
+
+
+def onbellegi_temizle(*etiketler):
+    sayfa_onbellegi.etiketleri_sil(etiketler)
+    parca_onbellegi.etiketleri_sil(etiketler)
+
+
+def yazi_etiketleri(yazi):
+    # yazının görüldüğü her sayfa: kendi sayfası, anasayfa, kategorisi, yazar profili
+    return f"yazi:{yazi['id']}", "anasayfa", f"kategori:{yazi['kategori']}", f"kullanici:{yazi['author_id']}"
+
+
+def yazi_onbellegini_temizle(yazi, *ek_etiketler):
+    onbellegi_temizle(*yazi_etiketleri(yazi), *ek_etiketler)
+
+
+def yorum_onbellegini_temizle(conn, post_id):
+    # yorum sayısı yazı kartlarında da görünür (anasayfa, kategori, yazar profili): yazının tüm sayfaları silinir
+    yazi = conn.execute("SELECT id, kategori, author_id FROM yazilar WHERE id = ?", (post_id,)).fetchone()
+    if yazi is None:
+        onbellegi_temizle(f"yazi:{post_id}")
+    else:
+        yazi_onbellegini_temizle(yazi)
+
+
+# tam sayfa önbelleğine giren view'lar (etiketlerini onbellek_etiketle ile verirler)
+ONBELLEKLI_SAYFALAR = {"anasayfa", "detay", "kategori_sayfasi", "yazarlar_sayfasi", "yazar_profili"}
+
+
+def _onbellege_uygun():
+    return request.method == "GET" and request.endpoint in ONBELLEKLI_SAYFALAR and not session
+
+
+@app.before_request
+def onbellekten_sun():
+    if not _onbellege_uygun():
+        return None
+
+    kayit = sayfa_onbellegi.al(request.full_path)
+    if kayit is None:
+        g.onbellege_yaz = True
+        return None
+
+    # önbellekten sunulsa da okunma sayılsın
+    if request.endpoint == "detay":
+        goruntulenme_ekle(request.view_args["id"])
+
+    cevap = app.response_class(kayit["govde"], status=kayit["durum"], content_type=kayit["tur"])
+    cevap.headers.update(kayit["basliklar"])
+    cevap.headers["X-Onbellek"] = "HIT"
+    if kayit.get("kodlu"):
+        sikistirilmis_gonder(cevap, kayit["kodlu"])
+    # istemcinin ETag'i tutuyorsa gövdeyi hiç göndermeden 304
+    return cevap.make_conditional(request)
+
+
+@app.after_request
+def onbellege_yaz(cevap):
+    etiketler = g.get("onbellek_etiketleri")
+    if (
+        g.get("onbellege_yaz")
+        and etiketler
+        and cevap.status_code == 200
+        and not session.modified
+        and "Set-Cookie" not in cevap.headers
+        and not cevap.is_streamed
+    ):
+        govde = cevap.get_data()
+        # sıkıştırılmış hâller bir kez üretilip gövdeyle birlikte saklanır
+        kodlu = {}
+        if app.config["SIKISTIRMA"] and len(govde) >= app.config["SIKISTIRMA_EN_AZ"]:
+            kodlu = sikistirma.hepsi(govde)
+        sayfa_onbellegi.koy(
+            request.full_path,
+            {
+                "govde": govde,
+                "kodlu": kodlu,
+                "durum": cevap.status_code,
+                "tur": cevap.content_type,
+                "basliklar": {
+                    k: v for k, v in cevap.headers.items() if k in ("ETag", "Last-Modified", "Cache-Control")
+                },
+            },
+            app.config["SAYFA_ONBELLEK_TTL"],
+            etiketler,
+        )
+        cevap.headers["X-Onbellek"] = "MISS"
+        if kodlu:
+            sikistirilmis_gonder(cevap, kodlu)
+    return cevap
+
+
+# --- AKIŞLI ŞABLONLAR ---
+AKIS_ISARETI = "\x00akis\x00"
+
+
+@app.template_global()
+def akis_bosalt():
+    # layout'ta menüden sonra: akışlı yanıtta o ana kadar biriken hemen gönderilir; normal çizimde boş
+    return AKIS_ISARETI if g.get("akis") else ""
+
+
+def _parcalari_birlestir(parcalar, boyut):
+    tampon, uzunluk = [], 0
+    try:
+        for parca in parcalar:
+            if AKIS_ISARETI in parca:
+                once, _, sonra = parca.partition(AKIS_ISARETI)
+                tampon.append(once)
+                yield "".join(tampon)
+                tampon, uzunluk = [sonra], len(sonra)
+                continue
+            tampon.append(parca)
+            uzunluk += len(parca)
+            if uzunluk >= boyut:
+                yield "".join(tampon)
+                tampon, uzunluk = [], 0
+        if tampon:
+            yield "".join(tampon)
+    finally:
+        # stream_with_context'in bağlamı (ve DB bağlantısı) ancak kapatılınca bırakılır
+        parcalar.close()
+
+
+def sayfa_ciz(sablon, **baglam):
+    # render_template yerine; AKIS_ROTALARI'ndaki view'larda şablon parça parça gönderilir.
+    # baglam'a liste yerine imleç (cursor) verilebilir: satırlar şablon onlara geldikçe okunur
+    if request.endpoint not in app.config["AKIS_ROTALARI"] or g.get("onbellege_yaz"):
+        return render_template(sablon, **baglam)
+    g.akis = True
+    parcalar = _parcalari_birlestir(stream_template(sablon, **baglam), app.config["AKIS_PARCA_BAYT"])
+    return app.response_class(parcalar, mimetype="text/html")
+
+
+# --- METRİKLER ---
+@app.route("/metrics")
+def metrikler():
+    satirlar = [
+        "# HELP prometheon_sayfa_onbellegi_istek_toplam Anonim sayfa önbelleği sorguları.",
+        "# TYPE prometheon_sayfa_onbellegi_istek_toplam counter",
+        f'prometheon_sayfa_onbellegi_istek_toplam{{sonuc="hit"}} {sayfa_onbellegi.isabet}',
+        f'prometheon_sayfa_onbellegi_istek_toplam{{sonuc="miss"}} {sayfa_onbellegi.iska}',
+        "# HELP prometheon_sayfa_onbellegi_kayit Önbellekteki sayfa sayısı.",
+        "# TYPE prometheon_sayfa_onbellegi_kayit gauge",
+        f"prometheon_sayfa_onbellegi_kayit {len(sayfa_onbellegi)}",
+        "# HELP prometheon_parca_onbellegi_istek_toplam Şablon parçası önbelleği sorguları.",
+        "# TYPE prometheon_parca_onbellegi_istek_toplam counter",
+        f'prometheon_parca_onbellegi_istek_toplam{{sonuc="hit"}} {parca_onbellegi.isabet}',
+        f'prometheon_parca_onbellegi_istek_toplam{{sonuc="miss"}} {parca_onbellegi.iska}',
+        "# HELP prometheon_parca_onbellegi_kayit Önbellekteki parça sayısı.",
+        "# TYPE prometheon_parca_onbellegi_kayit gauge",
+        f"prometheon_parca_onbellegi_kayit {len(parca_onbellegi)}",
+        "# HELP prometheon_yazar_dizini_istek_toplam Yazar dizini (ad/profil) sorguları.",
+        "# TYPE prometheon_yazar_dizini_istek_toplam counter",
+        f'prometheon_yazar_dizini_istek_toplam{{sonuc="hit"}} {yazar_dizini.isabet}',
+        f'prometheon_yazar_dizini_istek_toplam{{sonuc="miss"}} {yazar_dizini.iska}',
+        "# HELP prometheon_yazar_dizini_kayit Dizindeki kullanıcı sayısı.",
+        "# TYPE prometheon_yazar_dizini_kayit gauge",
+        f"prometheon_yazar_dizini_kayit {len(yazar_dizini)}",
+    ]
+    # kuyruk tablosundan anlık (tüm süreçler)
+    simdi = time.time()
+    durum = kuyruk.durum(db_baglantisi_kur())
+    satirlar.extend(olcum.aile_satirlari(
+        "prometheon_is_kuyrugu_is", "Bitmemiş iş sayısı (tüm süreçler).", "gauge", ("tur", "durum"),
+        [((tur, d), adet) for tur, d, adet, _ in durum],
+    ))
+    satirlar.extend(olcum.aile_satirlari(
+        "prometheon_is_kuyrugu_en_eski_sn", "Vadesi gelmiş en eski bekleyen işin beklediği süre.", "gauge", ("tur",),
+        [((tur,), max(simdi - en_eski, 0.0)) for tur, d, _, en_eski in durum if d == isler.BEKLIYOR],
+    ))
+    for metrik in (istek_suresi, istek_sayisi, sql_sorgu_sayisi, sql_suresi, sablon_suresi,
+                   sifre_suresi, sifre_sonucu, sinirlanan):
+        satirlar.extend(metrik.satirlar())
+    # bu süreçte işlenenler
+    sayaclar = sorted((tur, dict(s)) for tur, s in list(kuyruk.sayaclar.items()))
+    satirlar.extend(olcum.aile_satirlari(
+        "prometheon_is_kuyrugu_islenen_toplam", "Bu süreçte çalıştırılan işler.", "counter", ("tur", "sonuc"),
+        [((tur, sonuc), s[sonuc]) for tur, s in sayaclar for sonuc in ("tamam", "tekrar", "hata")],
+    ))
+    satirlar.extend(olcum.aile_satirlari(
+        "prometheon_is_kuyrugu_bekleme_sn_toplam", "Vadeden başlamaya kadar geçen süre toplamı.", "counter",
+        ("tur",), [((tur,), s["bekleme"]) for tur, s in sayaclar],
+    ))
+    satirlar.extend(olcum.aile_satirlari(
+        "prometheon_is_kuyrugu_sure_sn_toplam", "İşlerin çalışma süresi toplamı.", "counter",
+        ("tur",), [((tur,), s["sure"]) for tur, s in sayaclar],
+    ))
+    return "\n".join(satirlar) + "\n", 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+
+# --- KOŞULLU YANITLAR (ETag / Last-Modified) ---
+def _sablon_surumu():
+    # şablon değişince (deploy) eski ETag'ler geçersiz olsun; içerik hash'i tüm worker'larda aynıdır
+    h = hashlib.sha1()
+    for kok, _, dosyalar in sorted(os.walk(os.path.join(BASE_DIR, "templates"))):
+        for ad in sorted(dosyalar):
+            with open(os.path.join(kok, ad), "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()[:12]
+
+
+_SABLON_SURUMU = _sablon_surumu()
+
+
+def son_degisiklik(*tablolar):
+    yer = ",".join("?" * len(tablolar))
+    satir = db_baglantisi_kur().execute(
+        f"SELECT max(deger) FROM surumler WHERE ad IN ({yer})", tablolar
+    ).fetchone()
+    return satir[0] or 0
+
+
+def kosullu_yanit(*zamanlar):
+    # view'ın başında, ağır sorgulardan önce çağrılır: istemcinin kopyası hâlâ güncelse 304 döner
+    son = max(z or 0 for z in zamanlar)
+    kimlik = f"{_SABLON_SURUMU}:{son!r}:{session.get('user_id')}:{session.get('rol')}"
+    etag = hashlib.sha1(kimlik.encode()).hexdigest()[:24]
+    son_zaman = datetime.fromtimestamp(int(son), timezone.utc)
+    g.dogrulayicilar = (etag, son_zaman)
+
+    if request.if_none_match:
+        # sıkıştırılmış yanıtlarda ETag zayıf gider; If-None-Match zaten zayıf karşılaştırılır
+        guncel = request.if_none_match.contains_weak(etag)
+    else:
+        guncel = request.if_modified_since is not None and son_zaman <= request.if_modified_since
+    if guncel:
+        abort(app.response_class(status=304))
+
+
+# after_request'ler ters sırada çalışır: bu, sayfa önbelleğine yazandan önce çalışsın ki
+# önbelleğe başlıklarla birlikte girsin
+@app.after_request
+def dogrulayicilari_ekle(cevap):
+    dogrulayicilar = g.get("dogrulayicilar")
+    if dogrulayicilar and cevap.status_code in (200, 304):
+        etag, son_zaman = dogrulayicilar
+        cevap.set_etag(etag)
+        cevap.last_modified = son_zaman
+        if session:
+            cevap.cache_control.private = True
+            cevap.cache_control.no_cache = True
+        else:
+            cevap.cache_control.public = True
+            cevap.cache_control.max_age = 0
+            cevap.cache_control.s_maxage = app.config["PROXY_MAX_AGE"]
+    return cevap
+
+
+# --- SAYFALAMA (keyset) ---
+# listeler icerik yerine kayıtta hesaplanan özeti çeker
+LISTE_SUTUNLARI = "id, author_id, baslik, kategori, resim, durum, tarih, ozet, yorum_sayisi, guncellenme"
+# yönetim panelinde gösterilenler
+ADMIN_YAZI_SUTUNLARI = "id, author_id, baslik, kategori"
+ADMIN_KULLANICI_SUTUNLARI = "id, ad_soyad, email, rol"
+
+
+# sqlite INTEGER işaretli 64 bit; dışındaki sayı bağlanırken OverflowError verir
+SQLITE_TAMSAYI = range(-(2**63), 2**63)
+
+
+def sqlite_tamsayi(deger):
+    # request.args.get(..., type=sqlite_tamsayi): sayı değilse ya da sqlite'a sığmıyorsa varsayılan döner
+    sayi = int(deger)
+    if sayi not in SQLITE_TAMSAYI:
+        raise ValueError(f"sqlite tamsayı aralığı dışında: {deger}")
+    return sayi
+
+
+def _sayfa_linki(onek="", **imlec):
+    # aynı sayfadaki diğer listelerin imleçleri (başka önekler) korunur; view argümanıyla aynı adlı
+    # sorgu parametresi (ör. /kategori/Hukuk?isim=x) url_for'a iki kez gitmesin diye atılır
+    atla = {f"{onek}once", f"{onek}sonra", "s", *request.view_args}
+    args = {k: v for k, v in request.args.items() if k not in atla}
+    imlec = {f"{onek}{k}": v for k, v in imlec.items()}
+    return url_for(request.endpoint, **request.view_args, **args, **imlec)
+
+
+def _imlec_oku(ad, anahtarlar):
+    # tek sütun: ?once=42; çok sütun: ?once=["Ayşe Yılmaz", 42] (JSON)
+    if len(anahtarlar) == 1:
+        return request.args.get(ad, type=sqlite_tamsayi)
+    try:
+        deger = json.loads(request.args.get(ad, "null"))
+    except ValueError:
+        return None
+    if not isinstance(deger, list) or len(deger) != len(anahtarlar):
+        return None
+    # elemanlar doğrudan sorguya bağlanır: sqlite'ın bağlayabildiği skalerler dışındakiler (dict, list)
+    # ve 64 bite sığmayan tamsayılar reddedilir
+    if not all(d is None or isinstance(d, (str, float)) or (isinstance(d, int) and d in SQLITE_TAMSAYI) for d in deger):
+        return None
+    return tuple(deger)
+
+
+def sayfala(conn, tablo, sutunlar, kosul, parametreler=(), anahtar="id", boyut=None, onek="", artan=False):
+    # ?once=<id>  -> listede bu kayıttan sonra gelenler (sonraki sayfa; varsayılan sırada daha eskiler)
+    # ?sonra=<id> -> listede bu kayıttan önce gelenler (önceki sayfa)
+    # sutunlar anahtarı "id" adıyla döndürmeli (rowid ise "rowid AS id")
+    # anahtar bir demet olabilir, ör. ("ad_soyad", "id"): satır karşılaştırması, imleç JSON liste
+    # onek: aynı sayfada birden fazla liste varsa her birinin kendi parametreleri (?k_once=...)
+    # artan: liste küçükten büyüğe sıralanır (ör. ada göre)
+    boyut = boyut or app.config["SAYFA_BOYUTU"]
+    anahtarlar = (anahtar,) if isinstance(anahtar, str) else tuple(anahtar)
+    if len(anahtarlar) == 1:
+        sol, sag = anahtarlar[0], "?"
+    else:
+        sol, sag = f"({', '.join(anahtarlar)})", f"({', '.join('?' * len(anahtarlar))})"
+    ileri, geri = ("ASC", "DESC") if artan else ("DESC", "ASC")
+    ileri_op, geri_op = (">", "<") if artan else ("<", ">")
+
+    def sirala(yon):
+        return ", ".join(f"{a} {yon}" for a in anahtarlar)
+
+    def imlec(satir):
+        if len(anahtarlar) == 1:
+            return satir["id"]
+        return json.dumps([satir[a] for a in anahtarlar], ensure_ascii=False)
+
+    def degerler(imlec):
+        return (imlec,) if len(anahtarlar) == 1 else imlec
+
+    once = _imlec_oku(f"{onek}once", anahtarlar)
+    sonra = _imlec_oku(f"{onek}sonra", anahtarlar)
+
+    if sonra is not None:
+        satirlar = conn.execute(
+            f"SELECT {sutunlar} FROM {tablo} WHERE {kosul} AND {sol} {geri_op} {sag} "
+            f"ORDER BY {sirala(geri)} LIMIT ?",
+            (*parametreler, *degerler(sonra), boyut + 1),
+        ).fetchall()
+        daha_yeni = len(satirlar) > boyut
+        satirlar = satirlar[:boyut][::-1]
+        daha_eski = bool(satirlar)
+    else:
+        if once is not None:
+            kosul += f" AND {sol} {ileri_op} {sag}"
+            parametreler = (*parametreler, *degerler(once))
+        satirlar = conn.execute(
+            f"SELECT {sutunlar} FROM {tablo} WHERE {kosul} ORDER BY {sirala(ileri)} LIMIT ?",
+            (*parametreler, boyut + 1),
+        ).fetchall()
+        daha_eski = len(satirlar) > boyut
+        satirlar = satirlar[:boyut]
+        daha_yeni = once is not None and bool(satirlar)
+
+    sayfa = {
+        "onceki": _sayfa_linki(onek, sonra=imlec(satirlar[0])) if daha_yeni else None,
+        "sonraki": _sayfa_linki(onek, once=imlec(satirlar[-1])) if daha_eski else None,
+    }
+    return satirlar, sayfa
+
+
+def yazilari_sayfala(conn, kosul, parametreler=()):
+    return sayfala(conn, "yazilar", LISTE_SUTUNLARI, kosul, parametreler)
+
+
+# --- ÖZET / KELİME SAYISI ---
+def duz_metin(icerik):
+    # CKEditor HTML'i -> düz metin
+    return Markup(icerik or "").striptags()
+
+
+def ozet_hesapla(icerik):
+    # her render'da striptags yapılmasın diye kayıtta bir kez: (ozet, kelime_sayisi, metin).
+    # metin arama indeksine girer; tetikleyiciler Python fonksiyonu çağırmasın diye burada hesaplanır
+    metin = duz_metin(icerik)
+    kelimeler = metin.split()
+    ozet = metin
+    if len(ozet) > OZET_UZUNLUK:
+        ozet = ozet[:OZET_UZUNLUK].rsplit(" ", 1)[0] + "..."
+    return ozet, len(kelimeler), metin
+
+
+@app.cli.command("ozet-doldur")
+@click.option("--hepsi", is_flag=True, help="Sadece boş olanları değil, tüm yazıları yeniden hesapla.")
+def ozet_doldur(hepsi):
+    """Eski yazıların ozet, kelime_sayisi ve metin (arama) sütunlarını doldurur."""
+    conn = db_baglantisi_kur()
+    kosul = "1=1" if hepsi else "(ozet IS NULL OR kelime_sayisi IS NULL OR metin IS NULL)"
+    son_id, toplam = 0, 0
+
+    while True:
+        satirlar = conn.execute(
+            f"SELECT id, icerik FROM yazilar WHERE {kosul} AND id > ? ORDER BY id LIMIT 500",
+            (son_id,),
+        ).fetchall()
+        if not satirlar:
+            break
+
+        conn.executemany(
+            "UPDATE yazilar SET ozet=?, kelime_sayisi=?, metin=? WHERE id=?",
+            [(*ozet_hesapla(s["icerik"]), s["id"]) for s in satirlar],
+        )
+        conn.commit()
+        son_id = satirlar[-1]["id"]
+        toplam += len(satirlar)
+
+    print(f"✅ {toplam} yazının özeti güncellendi.")
+
+
+# --- ARAMA İNDEKSİ (FTS5) ---
+# remove_diacritics ş/ç/ğ/ö/ü'yü katlar; ı/i farkını sorgu tarafında açıyoruz
+ARAMA_SEMASI = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS yazilar_fts USING fts5(
+        baslik, metin, tokenize = "unicode61 remove_diacritics 2"
+    )
+    """,
+]
+# indeks yazilar.metin'den beslenir (ozet_hesapla ile kayıtta hesaplanır). Tetikleyiciler düz SQL:
+# sqlite3 komut satırı, bakım betikleri ve yedekten dönüş de yazilar'a yazabilir
+ARAMA_TETIKLEYICILERI = [
+    """
+    CREATE TRIGGER IF NOT EXISTS yazilar_fts_ekle AFTER INSERT ON yazilar BEGIN
+        INSERT INTO yazilar_fts (rowid, baslik, metin) VALUES (new.id, new.baslik, new.metin);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS yazilar_fts_sil AFTER DELETE ON yazilar BEGIN
+        DELETE FROM yazilar_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS yazilar_fts_guncelle AFTER UPDATE OF baslik, metin ON yazilar BEGIN
+        DELETE FROM yazilar_fts WHERE rowid = old.id;
+        INSERT INTO yazilar_fts (rowid, baslik, metin) VALUES (new.id, new.baslik, new.metin);
+    END
+    """,
+]
+# vurgu işaretleri: metinde geçmeyen kontrol karakterleri, escape'ten sonra <mark> olur
+_VURGU_BAS, _VURGU_SON = "\x02", "\x03"
+
+
+def _goc_arama_indeksi(conn):
+    # göç 3: metin sütunu henüz yok, ilk doldurma bağlantıdaki duz_metin ile
+    for sql in ARAMA_SEMASI:
+        conn.execute(sql)
+    if conn.execute("SELECT 1 FROM yazilar_fts LIMIT 1").fetchone() is None:
+        conn.execute(
+            "INSERT INTO yazilar_fts (rowid, baslik, metin) SELECT id, baslik, duz_metin(icerik) FROM yazilar"
+        )
+
+
+def _goc_arama_metni(conn):
+    # göç 13: düz metin yazilar'a taşınır; indeksteki kopyadan doldurulur (HTML yeniden ayrıştırılmaz)
+    _sutun_ekle(conn, "yazilar", "metin", "TEXT")
+    conn.execute("UPDATE yazilar SET metin = (SELECT metin FROM yazilar_fts WHERE rowid = yazilar.id)")
+    for ad in ("yazilar_fts_ekle", "yazilar_fts_guncelle"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {ad}")
+    for sql in ARAMA_TETIKLEYICILERI:
+        conn.execute(sql)
+
+
+def arama_indeksi_kur(conn):
+    # indeksi yazilar.metin'den sıfırdan kurar; metni boş yazılar için önce `flask ozet-doldur`
+    for sql in ARAMA_SEMASI + ARAMA_TETIKLEYICILERI:
+        conn.execute(sql)
+    conn.execute("DELETE FROM yazilar_fts")
+    conn.execute("INSERT INTO yazilar_fts (rowid, baslik, metin) SELECT id, baslik, metin FROM yazilar")
+
+
+@app.cli.command("arama-indeksle")
+def arama_indeksle():
+    """FTS arama indeksini sıfırdan kurar."""
+    conn = db_baglantisi_kur()
+    arama_indeksi_kur(conn)
+    conn.commit()
+    adet = conn.execute("SELECT count(*) FROM yazilar_fts").fetchone()[0]
+    print(f"✅ {adet} yazı arama indeksine eklendi.")
+
+
+def fts_sorgusu(kelime):
+    # Türkçe: I/İ/ı/i hepsi aynı harf sayılsın. unicode61 'ı'yı 'i'ye katlamadığı için
+    # her kelimenin i/ı varyantlarını OR'luyoruz (kelime başına en fazla 2^5)
+    kelime = kelime.replace("İ", "i").replace("I", "i").lower()
+    parcalar = []
+    for token in re.findall(r"\w+", kelime)[:8]:
+        yerler = [i for i, h in enumerate(token) if h in "iı"]
+        if len(yerler) > 5:
+            yerler = []
+        varyantlar = set()
+        for secim in itertools.product("iı", repeat=len(yerler)):
+            harfler = list(token)
+            for yer, harf in zip(yerler, secim):
+                harfler[yer] = harf
+            varyantlar.add("".join(harfler))
+        parcalar.append("(" + " OR ".join(f'"{v}"*' for v in sorted(varyantlar)) + ")")
+    return " AND ".join(parcalar)
+
+
+def vurgula(metin):
+    metin = str(escape(metin or ""))
+    return Markup(metin.replace(_VURGU_BAS, "<mark>").replace(_VURGU_SON, "</mark>"))
+
+
+# --- ŞEMA GÖÇLERİ ---
+# sürüm PRAGMA user_version'da tutulur; yeni değişiklik = listenin sonuna yeni adım.
+# adım: SQL listesi ya da conn alan fonksiyon
+def _sutun_ekle(conn, tablo, sutun, tanim):
+    sutunlar = {s["name"] for s in conn.execute(f"PRAGMA table_info({tablo})")}
+    if sutun not in sutunlar:
+        conn.execute(f"ALTER TABLE {tablo} ADD COLUMN {sutun} {tanim}")
+
+
+def _goc_temel_sema(conn):
+    # eski init_db.py / db_gunceller.py / /tamir ile kurulmuş veritabanlarını da aynı noktaya getirir
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ad_soyad TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            sifre TEXT NOT NULL,
+            rol TEXT DEFAULT 'okur',
+            profil_resmi TEXT DEFAULT '',
+            biyografi TEXT DEFAULT 'Henüz bir biyografi eklenmemiş.'
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS yazilar (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            author_id INTEGER NOT NULL,
+            baslik TEXT NOT NULL,
+            icerik TEXT NOT NULL,
+            kategori TEXT NOT NULL,
+            resim TEXT,
+            durum INTEGER DEFAULT 0,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            goruntulenme INTEGER DEFAULT 0,
+            ozet TEXT,
+            kelime_sayisi INTEGER,
+            FOREIGN KEY (author_id) REFERENCES users (id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS yorumlar (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            post_id INTEGER,
+            user_id INTEGER,
+            yorum TEXT,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            parent_id INTEGER
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS mesajlar (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            isim TEXT NOT NULL,
+            email TEXT NOT NULL,
+            konu TEXT NOT NULL,
+            mesaj TEXT NOT NULL,
+            okundu INTEGER DEFAULT 0,
+            tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    _sutun_ekle(conn, "yorumlar", "parent_id", "INTEGER")
+    _sutun_ekle(conn, "yazilar", "goruntulenme", "INTEGER DEFAULT 0")
+    _sutun_ekle(conn, "yazilar", "ozet", "TEXT")
+    _sutun_ekle(conn, "yazilar", "kelime_sayisi", "INTEGER")
+    _sutun_ekle(conn, "users", "profil_resmi", "TEXT")
+    _sutun_ekle(conn, "users", "biyografi", "TEXT")
+
+
+def _goc_ozetler(conn):
+    # metin sütunu henüz yok (göç 13); sadece ilk iki değer
+    bos = conn.execute("SELECT id, icerik FROM yazilar WHERE ozet IS NULL OR kelime_sayisi IS NULL").fetchall()
+    conn.executemany(
+        "UPDATE yazilar SET ozet=?, kelime_sayisi=? WHERE id=?",
+        [(*ozet_hesapla(s["icerik"])[:2], s["id"]) for s in bos],
+    )
+
+
+# sayaçların doğru değeri; göç ve tutarlılık kontrolü aynı tanımı kullanır
+YORUM_SAYISI_SQL = "SELECT count(*) FROM yorumlar WHERE yorumlar.post_id = yazilar.id"
+CEVAP_SAYISI_SQL = "SELECT count(*) FROM yorumlar c WHERE c.post_id = yorumlar.post_id AND c.parent_id = yorumlar.id"
+
+
+# unix zamanı (ms hassasiyetli); ETag aynı saniyedeki iki değişikliği de ayırt etsin
+_SIMDI_SQL = "((julianday('now') - 2440587.5) * 86400.0)"
+
+
+def _surum_artir_sql(ad):
+    return (
+        f"INSERT INTO surumler (ad, deger) VALUES ('{ad}', {_SIMDI_SQL}) "
+        f"ON CONFLICT (ad) DO UPDATE SET deger = max(excluded.deger, deger + 0.001);"
+    )
+
+
+def _goc_degisiklik_zamanlari(conn):
+    # yazilar.guncellenme: yazının kendisi ya da yorumları değişince
+    # surumler: listeler için tablo bazında son değişiklik ("yazilar", "users")
+    _sutun_ekle(conn, "yazilar", "guncellenme", "REAL")
+    conn.execute(f"UPDATE yazilar SET guncellenme = {_SIMDI_SQL}")
+    conn.execute("CREATE TABLE IF NOT EXISTS surumler (ad TEXT PRIMARY KEY, deger REAL NOT NULL)")
+    conn.execute(_surum_artir_sql("yazilar"))
+    conn.execute(_surum_artir_sql("users"))
+
+    yazi_damgala = f"UPDATE yazilar SET guncellenme = {_SIMDI_SQL} WHERE id = {{}}.id;"
+    tetikleyiciler = {
+        "yazilar_surum_ekle": ("AFTER INSERT ON yazilar", yazi_damgala.format("new") + _surum_artir_sql("yazilar")),
+        "yazilar_surum_guncelle": (
+            "AFTER UPDATE OF baslik, icerik, kategori, resim, durum ON yazilar",
+            yazi_damgala.format("new") + _surum_artir_sql("yazilar"),
+        ),
+        "yazilar_surum_sil": ("AFTER DELETE ON yazilar", _surum_artir_sql("yazilar")),
+        "users_surum_ekle": ("AFTER INSERT ON users", _surum_artir_sql("users")),
+        "users_surum_guncelle": (
+            "AFTER UPDATE OF ad_soyad, biyografi, profil_resmi, rol ON users",
+            _surum_artir_sql("users"),
+        ),
+        "users_surum_sil": ("AFTER DELETE ON users", _surum_artir_sql("users")),
+    }
+    for olay, kayit in (("ekle", "new"), ("guncelle", "new"), ("sil", "old")):
+        tetikleyiciler[f"yorumlar_surum_{olay}"] = (
+            f"AFTER {dict(ekle='INSERT', guncelle='UPDATE', sil='DELETE')[olay]} ON yorumlar",
+            f"UPDATE yazilar SET guncellenme = {_SIMDI_SQL} WHERE id = {kayit}.post_id;",
+        )
+    for ad, (olay, govde) in tetikleyiciler.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {ad} {olay} BEGIN {govde} END")
+
+
+def _goc_galeri_dizini(conn):
+    _sutun_ekle(conn, "dosyalar", "genislik", "INTEGER")
+    _sutun_ekle(conn, "dosyalar", "yukseklik", "INTEGER")
+    _sutun_ekle(conn, "dosyalar", "degisme", "REAL")
+    # sadece sütunlar: göç yazma kilidini tutarken binlerce dosya hash'lenmesin. İsimle kaydedilmiş eski
+    # yüklemelerin galeriye girmesi için kurulumdan sonra bir kez `flask galeri-esitle` (partiler hâlinde)
+
+
+def _goc_kaynak_hash(conn):
+    # yayımlanan dosyanın adı temizlenmiş içeriğin hash'i; yüklenen baytın hash'i sadece
+    # tekrar yükleme anahtarı. Eski içerik adresli yüklemelerin adı yüklenen baytın hash'iydi
+    _sutun_ekle(conn, "dosyalar", "kaynak_sha256", "TEXT")
+    conn.execute(
+        "UPDATE dosyalar SET kaynak_sha256 = substr(yol, 7, 64) WHERE kaynak_sha256 IS NULL "
+        "AND yol GLOB '[0-9a-f][0-9a-f]/[0-9a-f][0-9a-f]/" + "[0-9a-f]" * 64 + "*'"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_dosyalar_kaynak ON dosyalar (kaynak_sha256)")
+
+
+def _goc_yorum_sayaclari(conn):
+    # yazilar.yorum_sayisi (cevaplar dahil) ve yorumlar.cevap_sayisi (doğrudan cevaplar) tetikleyicilerle tutulur;
+    # listeler kart başına COUNT(*) atmadan gösterir. Kayma olursa: `flask yorum-sayaclari`
+    _sutun_ekle(conn, "yazilar", "yorum_sayisi", "INTEGER NOT NULL DEFAULT 0")
+    _sutun_ekle(conn, "yorumlar", "cevap_sayisi", "INTEGER NOT NULL DEFAULT 0")
+    conn.execute(f"UPDATE yazilar SET yorum_sayisi = ({YORUM_SAYISI_SQL})")
+    conn.execute(f"UPDATE yorumlar SET cevap_sayisi = ({CEVAP_SAYISI_SQL})")
+
+    yazi_sayaci = "UPDATE yazilar SET yorum_sayisi = yorum_sayisi {} 1 WHERE id = {}.post_id;"
+    cevap_sayaci = "UPDATE yorumlar SET cevap_sayisi = cevap_sayisi {} 1 WHERE id = {}.parent_id;"
+    tetikleyiciler = {
+        "yorumlar_sayac_ekle": (
+            "AFTER INSERT ON yorumlar",
+            yazi_sayaci.format("+", "new") + _surum_artir_sql("yorumlar"),
+        ),
+        "yorumlar_sayac_sil": (
+            "AFTER DELETE ON yorumlar",
+            yazi_sayaci.format("-", "old") + _surum_artir_sql("yorumlar"),
+        ),
+        "yorumlar_sayac_tasi": (
+            "AFTER UPDATE OF post_id ON yorumlar",
+            yazi_sayaci.format("-", "old") + yazi_sayaci.format("+", "new") + _surum_artir_sql("yorumlar"),
+        ),
+        "yorumlar_cevap_ekle": ("AFTER INSERT ON yorumlar WHEN new.parent_id", cevap_sayaci.format("+", "new")),
+        "yorumlar_cevap_sil": ("AFTER DELETE ON yorumlar WHEN old.parent_id", cevap_sayaci.format("-", "old")),
+        "yorumlar_cevap_tasi": (
+            "AFTER UPDATE OF parent_id ON yorumlar",
+            cevap_sayaci.format("-", "old") + cevap_sayaci.format("+", "new"),
+        ),
+    }
+    for ad, (olay, govde) in tetikleyiciler.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {ad} {olay} BEGIN {govde} END")
+
+
+GOCLER = [
+    (1, "temel şema", _goc_temel_sema),
+    (2, "eksik özetler", _goc_ozetler),
+    (3, "FTS5 arama indeksi", _goc_arama_indeksi),
+    (4, "liste/yorum sorgu indeksleri", [
+        "CREATE INDEX IF NOT EXISTS idx_yazilar_durum ON yazilar (durum, id)",
+        "CREATE INDEX IF NOT EXISTS idx_yazilar_kategori ON yazilar (kategori, durum, id)",
+        "CREATE INDEX IF NOT EXISTS idx_yazilar_yazar ON yazilar (author_id, durum, id)",
+        "CREATE INDEX IF NOT EXISTS idx_yorumlar_post ON yorumlar (post_id, parent_id, id)",
+    ]),
+    (5, "ETag için değişiklik zamanları", _goc_degisiklik_zamanlari),
+    (6, "içerik adresli yükleme deposu", [
+        "CREATE TABLE IF NOT EXISTS dosyalar ("
+        " yol TEXT PRIMARY KEY, sha256 TEXT NOT NULL, boyut INTEGER NOT NULL, ad TEXT, eklenme REAL)",
+        # hangi yazı/kullanıcı hangi dosyayı kullanıyor; sahipsiz dosyalar buradan bulunur
+        "CREATE TABLE IF NOT EXISTS dosya_baglari ("
+        " yol TEXT NOT NULL, sahip_turu TEXT NOT NULL, sahip_id INTEGER NOT NULL,"
+        " PRIMARY KEY (sahip_turu, sahip_id, yol))",
+        "CREATE INDEX IF NOT EXISTS idx_dosya_baglari_yol ON dosya_baglari (yol)",
+        # eski, isimle kaydedilmiş kapak/profil resimleri de bağlansın
+        "INSERT OR IGNORE INTO dosya_baglari (yol, sahip_turu, sahip_id) "
+        "SELECT resim, 'yazi', id FROM yazilar WHERE resim IS NOT NULL AND resim != ''",
+        "INSERT OR IGNORE INTO dosya_baglari (yol, sahip_turu, sahip_id) "
+        "SELECT profil_resmi, 'kullanici', id FROM users WHERE profil_resmi IS NOT NULL AND profil_resmi != ''",
+    ]),
+    (7, "galeri dizini", _goc_galeri_dizini),
+    # eski yorum silme yalnız doğrudan cevapları siliyordu; kalan yetim cevaplar ağaçta görünmez
+    (8, "yetim yorumlar", [
+        """
+        WITH RECURSIVE yetim (id) AS (
+            SELECT id FROM yorumlar
+            WHERE parent_id IS NOT NULL AND parent_id != 0 AND parent_id NOT IN (SELECT id FROM yorumlar)
+            UNION
+            SELECT y.id FROM yetim JOIN yorumlar y ON y.parent_id = yetim.id
+        )
+        DELETE FROM yorumlar WHERE id IN yetim
+        """,
+    ]),
+    (9, "yorum sayaçları", _goc_yorum_sayaclari),
+    (10, "iş kuyruğu", isler.SEMA),
+    (11, "görüntülenme olayları ve günlük özetler", [
+        # sadece eklenir; özet işi son işlediği id'yi analitik_durum'da tutar
+        "CREATE TABLE IF NOT EXISTS goruntulenme_olaylari ("
+        " id INTEGER PRIMARY KEY, post_id INTEGER NOT NULL, zaman INTEGER NOT NULL, kaynak TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS analitik_gunluk ("
+        " boyut TEXT NOT NULL, gun TEXT NOT NULL, anahtar TEXT NOT NULL, adet INTEGER NOT NULL,"
+        " PRIMARY KEY (boyut, gun, anahtar)) WITHOUT ROWID",
+        "CREATE TABLE IF NOT EXISTS analitik_durum (ad TEXT PRIMARY KEY, deger INTEGER NOT NULL)",
+    ]),
+    # panelde kullanıcılar ada göre sayfalanır; bekleyenler için idx_yazilar_durum (durum, id) zaten var
+    (12, "yönetim paneli indeksleri", [
+        "CREATE INDEX IF NOT EXISTS idx_users_ad_soyad ON users (ad_soyad)",
+    ]),
+    (13, "arama metni sütunu", _goc_arama_metni),
+    (14, "yükleme kaynak hash'i", _goc_kaynak_hash),
+]
+_sema_guncel = set()
+_sema_kilit = threading.Lock()
+
+
+def sema_guncelle(conn):
+    # süreç başına bir kez, ilk bağlantıda çalışır. BEGIN IMMEDIATE: aynı anda açılan
+    # gunicorn worker'larından yalnızca biri göç uygular, diğerleri sürümü güncel bulur
+    with _sema_kilit:
+        if DB_PATH in _sema_guncel:
+            return
+        for surum, aciklama, adim in GOCLER:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= surum:
+                    conn.rollback()
+                    continue
+                if callable(adim):
+                    adim(conn)
+                else:
+                    for sql in adim:
+                        conn.execute(sql)
+                conn.execute(f"PRAGMA user_version = {surum}")
+                conn.commit()
+                app.logger.info("şema göçü uygulandı: %s (%s)", surum, aciklama)
+            except Exception:
+                conn.rollback()
+                raise
+        _sema_guncel.add(DB_PATH)
+
+
+# sık çalışan sorgular; `flask sorgu-plani` ve tests/test_sorgu_plani.py bunların hiçbirinin tabloyu
+# baştan sona taramadığını doğrular
+SICAK_SORGULAR = {
+    "anasayfa": ("SELECT {s} FROM yazilar WHERE durum = 1 AND id < ? ORDER BY id DESC LIMIT ?", (1, 13)),
+    "anasayfa (geri)": ("SELECT {s} FROM yazilar WHERE durum = 1 AND id > ? ORDER BY id ASC LIMIT ?", (1, 13)),
+    "kategori": (
+        "SELECT {s} FROM yazilar WHERE kategori = ? AND durum = 1 AND id < ? ORDER BY id DESC LIMIT ?",
+        ("Felsefe", 1, 13),
+    ),
+    "yazar": (
+        "SELECT {s} FROM yazilar WHERE author_id = ? AND durum = 1 AND id < ? ORDER BY id DESC LIMIT ?",
+        (1, 1, 13),
+    ),
+    "yazilarim": ("SELECT {s} FROM yazilar WHERE author_id = ? ORDER BY id DESC", (1,)),
+    "detay": (
+        "SELECT * FROM yazilar WHERE id = ?",
+        (1,),
+    ),
+    "detay ana yorumlar": (
+        "SELECT id FROM yorumlar WHERE post_id = ? AND (parent_id IS NULL OR parent_id = 0) AND id < ? "
+        "ORDER BY id DESC LIMIT ?",
+        (1, 1, 21),
+    ),
+    "cevap sayfası": (
+        "SELECT id FROM yorumlar WHERE post_id = ? AND parent_id = ? AND id > ? ORDER BY id LIMIT ?",
+        (1, 1, 0, 5),
+    ),
+    "admin bekleyenler": (
+        f"SELECT {ADMIN_YAZI_SUTUNLARI} FROM yazilar WHERE durum = 0 AND id < ? ORDER BY id DESC LIMIT ?",
+        (1, 51),
+    ),
+    "admin kullanıcılar": (
+        f"SELECT {ADMIN_KULLANICI_SUTUNLARI} FROM users WHERE 1 = 1 AND (ad_soyad, id) > (?, ?) "
+        "ORDER BY ad_soyad ASC, id ASC LIMIT ?",
+        ("A", 1, 51),
+    ),
+    "giriş": ("SELECT * FROM users WHERE email=?", ("a@b.c",)),
+    "iş kuyruğu": (
+        "SELECT id FROM isler WHERE durum = 'bekliyor' AND zaman <= ? ORDER BY zaman LIMIT 1", (0,)
+    ),
+}
+
+
+def bos_sema(conn):
+    # planlayıcı ANALYZE istatistiklerine bakar: birkaç satırlık tabloyu taramak indeksten ucuzdur ve
+    # kontrol veriye göre değişir. Planlar aynı şemanın boş kopyasında çıkarılır; indeks var mı ve
+    # sorgu onu kullanabiliyor mu, sadece buna bakılır
+    sema = conn.execute(
+        "SELECT type, name, sql FROM sqlite_master WHERE sql IS NOT NULL AND type IN ('table', 'index', 'view') "
+        "AND name NOT LIKE 'sqlite_%' ORDER BY type != 'table'"
+    ).fetchall()
+    # sanal tablonun (FTS5) kendi oluşturduğu gölge tablolar atlanır
+    sanal = [ad for _, ad, sql in sema if sql.upper().startswith("CREATE VIRTUAL TABLE")]
+    kopya = sqlite3.connect(":memory:")
+    kopya.row_factory = sqlite3.Row
+    for _, ad, sql in sema:
+        if not any(ad.startswith(f"{s}_") for s in sanal):
+            kopya.execute(sql)
+    return kopya
+
+
+def sorgu_planlari(conn):
+    # her sıcak sorgu için (ad, plan adımları, tam tarama yapan adımlar)
+    # CTE (ör. yorum ağacı) taramaları tablo taraması değildir; sadece gerçek tablolar sayılır
+    tablolar = {s["name"] for s in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for ad, (sql, parametreler) in SICAK_SORGULAR.items():
+        adimlar = [
+            adim["detail"]
+            for adim in conn.execute("EXPLAIN QUERY PLAN " + sql.format(s=LISTE_SUTUNLARI), parametreler)
+        ]
+        yield ad, adimlar, [adim for adim in adimlar if _tam_tarama_mi(adim, tablolar)]
+
+
+def _tam_tarama_mi(adim, tablolar):
+    # SCAN <tablo>: baştan sona. Sadece rowid aralığı (rowid<?): süzen indeks yok, tablonun çoğu okunur.
+    # AUTOMATIC INDEX: sqlite eksik indeksi her sorguda geçici olarak kuruyor
+    parcalar = adim.split()
+    if parcalar[0] not in ("SCAN", "SEARCH") or (parcalar[1] not in tablolar and "AUTOMATIC" not in adim):
+        return False
+    if parcalar[0] == "SCAN":
+        return "VIRTUAL TABLE" not in adim
+    return "AUTOMATIC" in adim or re.search(r"INTEGER PRIMARY KEY \(rowid[<>]", adim) is not None
+
+
+@app.cli.command("sorgu-plani")
+@click.option("--veriyle", is_flag=True, help="Planları bu veritabanının istatistikleriyle göster (hata vermez).")
+def sorgu_plani(veriyle):
+    """Sıcak sorguların EXPLAIN QUERY PLAN çıktısını gösterir; tam tablo taraması varsa hata verir."""
+    conn = db_baglantisi_kur()
+    taramalar = []
+    for ad, adimlar, tam in sorgu_planlari(conn if veriyle else bos_sema(conn)):
+        print(f"-- {ad}")
+        for adim in adimlar:
+            print(f"   {adim}")
+        taramalar.extend(f"{ad}: {adim}" for adim in tam)
+
+    if veriyle:
+        # küçük tablolarda tarama planlayıcının doğru seçimi olabilir; sadece bilgi
+        return
+    if taramalar:
+        print("\n❌ Tam tarama yapan sorgular:")
+        for t in taramalar:
+            print(f"   {t}")
+        raise SystemExit(1)
+    print("\n✅ Hiçbir sıcak sorgu tam tarama yapmıyor.")
+
+
+# --- YÜKLEME DEPOSU (içerik adresli) ---
+UZUN_ONBELLEK_SN = 365 * 24 * 3600
+
+
+# yüklenen bayt önce BEKLEYEN_FOLDER'a (statik değil) yazılır; kayıtlardaki yolu "bekleyen/ab/cd/<kaynak>.jpg".
+# "resim" işi metadata'yı temizler, sonucu kendi hash'iyle uploads/'a koyar ve bekleyen yolu her yerde
+# (dosyalar, dosya_baglari, yazilar.resim, users.profil_resmi) yayımlanan yolla değiştirir.
+# uploads/ altındaki bir yol yazıldıktan sonra asla değişmez.
+BEKLEYEN_ONEK = "bekleyen/"
+
+
+@app.template_global()
+def bekleyen_mi(yol):
+    return bool(yol) and yol.startswith(BEKLEYEN_ONEK)
+
+
+def dosya_kaydet(dosya, *turler, hemen=False):
+    # dönen göreli yol yazilar.resim / users.profil_resmi'ye yazılır; commit çağıranda.
+    # aynı bayt daha önce yüklendiyse (kaynak_sha256) o kayıt kullanılır, tekrar işlenmez.
+    # hemen=True: işi beklemeden bu istekte yayımla (adres hemen gereken yerler, ör. editör)
+    kaynak, goreli, boyut = depo.kaydet(dosya, app.config["BEKLEYEN_FOLDER"])
+    conn = db_baglantisi_kur()
+    satir = conn.execute("SELECT yol FROM dosyalar WHERE kaynak_sha256 = ? LIMIT 1", (kaynak,)).fetchone()
+    if satir is None:
+        yol = BEKLEYEN_ONEK + goreli
+        conn.execute(
+            "INSERT OR IGNORE INTO dosyalar (yol, sha256, kaynak_sha256, boyut, ad, eklenme) VALUES (?, ?, ?, ?, ?, ?)",
+            (yol, kaynak, kaynak, boyut, secure_filename(dosya.filename), time.time()),
+        )
+    else:
+        yol = satir["yol"]
+        if not bekleyen_mi(yol):
+            _bekleyeni_sil(goreli)  # zaten yayında; bekleyen kopya gereksiz
+
+    if hemen and bekleyen_mi(yol):
+        yol = yuklemeyi_yayinla(conn, yol)
+    if bekleyen_mi(yol) or not all(resim_isleme.hazir_mi(app.config["VARYANT_FOLDER"], yol, t) for t in turler):
+        # önceki iş kalıcı hataya düşmüş olsa da tekrar yükleme yeni iş açar
+        kuyruk.ekle(conn, "resim", {"kaynak": kaynak, "turler": turler})
+    return yol
+
+
+def _bekleyeni_sil(goreli):
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(os.path.join(app.config["BEKLEYEN_FOLDER"], goreli))
+
+
+def yuklemeyi_yayinla(conn, bekleyen):
+    # bekleyen yüklemenin temiz kopyasını yayımlar ve yeni yolu döndürür; kendi commit'ini yapar.
+    # tekrar çalışması güvenli: aynı giriş aynı baytı, dolayısıyla aynı yolu üretir
+    goreli = bekleyen[len(BEKLEYEN_ONEK):]
+    kaynak_yol = os.path.join(app.config["BEKLEYEN_FOLDER"], goreli)
+    kok = app.config["UPLOAD_FOLDER"]
+    fd, gecici = depo.gecici_dosya(kok)
+    os.close(fd)
+    acilan = resim_isleme.ac(kaynak_yol)
+    if acilan is None:
+        shutil.copyfile(kaynak_yol, gecici)  # resim değil ya da gif: bayt bayt
+    else:
+        resim_isleme.temiz_kaydet(*acilan, gecici)
+    sha256, yol, boyut = depo.yerlestir(gecici, kok, goreli)
+    tam_yol = os.path.join(kok, yol)
+
+    if conn.execute("SELECT 1 FROM dosyalar WHERE yol = ?", (yol,)).fetchone():
+        # başka bir yükleme aynı temiz dosyaya çıkmış
+        conn.execute("DELETE FROM dosyalar WHERE yol = ?", (bekleyen,))
+    else:
+        conn.execute(
+            "UPDATE dosyalar SET yol=?, sha256=?, boyut=?, degisme=?, genislik=?, yukseklik=? WHERE yol=?",
+            (yol, sha256, boyut, os.path.getmtime(tam_yol), *resim_isleme.olcu(tam_yol), bekleyen),
+        )
+    sahipler = conn.execute("SELECT sahip_turu, sahip_id FROM dosya_baglari WHERE yol = ?", (bekleyen,)).fetchall()
+    conn.execute("UPDATE OR IGNORE dosya_baglari SET yol = ? WHERE yol = ?", (yol, bekleyen))
+    conn.execute("DELETE FROM dosya_baglari WHERE yol = ?", (bekleyen,))
+    yazilar, kullanicilar = [], []
+    for sahip in sahipler:
+        if sahip["sahip_turu"] == "yazi":
+            yazilar += conn.execute(
+                "UPDATE yazilar SET resim = ? WHERE id = ? AND resim = ? RETURNING id, kategori, author_id",
+                (yol, sahip["sahip_id"], bekleyen),
+            ).fetchall()
+        elif sahip["sahip_turu"] == "kullanici":
+            kullanicilar += conn.execute(
+                "UPDATE users SET profil_resmi = ? WHERE id = ? AND profil_resmi = ? RETURNING id",
+                (yol, sahip["sahip_id"], bekleyen),
+            ).fetchall()
+    conn.commit()
+
+    _bekleyeni_sil(goreli)
+    if kullanicilar:
+        yazar_dizini.gecersiz_kil()
+    onbellegi_temizle(
+        *{e for y in yazilar for e in yazi_etiketleri(y)},
+        *(f"kullanici:{k['id']}" for k in kullanicilar), *(["yazarlar"] if kullanicilar else []),
+    )
+    return yol
+
+
+def dosya_bagla(yol, sahip_turu, sahip_id, degistir=False):
+    # degistir=True: sahibin bu türdeki eski bağı düşer (kapak/profil resmi değişti)
+    conn = db_baglantisi_kur()
+    if degistir:
+        conn.execute("DELETE FROM dosya_baglari WHERE sahip_turu = ? AND sahip_id = ?", (sahip_turu, sahip_id))
+    conn.execute(
+        "INSERT OR IGNORE INTO dosya_baglari (yol, sahip_turu, sahip_id) VALUES (?, ?, ?)",
+        (yol, sahip_turu, sahip_id),
+    )
+
+
+def _dosya_satiri(kok, yol, boyut, degisme):
+    # dosya taramayla okuma arasında silinmişse None
+    tam_yol = os.path.join(kok, yol)
+    try:
+        return (yol, depo.sha256(tam_yol), boyut, os.path.basename(yol), degisme, degisme,
+                *resim_isleme.olcu(tam_yol))
+    except FileNotFoundError:
+        return None
+
+
+def dosyalari_esitle(conn, parti=500):
+    # diskteki yüklemelerle dosyalar tablosunu eşitler (elle kopyalanan/silinen dosyalar).
+    # sadece boyutu ya da mtime'ı değişen dosyalar yeniden okunur. Hash ve ölçü transaction dışında hesaplanır,
+    # her parti ayrı commit: yazma kilidi sadece parti yazılırken tutulur, istekler beklemez.
+    # bekleyen yüklemeler uploads/'ta değil; onlara dokunulmaz
+    kok = app.config["UPLOAD_FOLDER"]
+    kayitli = {
+        s["yol"]: (s["boyut"], s["degisme"])
+        for s in conn.execute("SELECT yol, boyut, degisme FROM dosyalar WHERE yol NOT GLOB 'bekleyen/*'")
+    }
+    conn.commit()
+    yeniler, degisenler = [], []
+    for yol, boyut, degisme in depo.tara(kok):
+        onceki = kayitli.pop(yol, None)
+        if onceki != (boyut, degisme):
+            (yeniler if onceki is None else degisenler).append((yol, boyut, degisme))
+
+    # galeri rowid sırasıyla (yeniden eskiye) listelenir; eskiler yüklenme sırasına girsin
+    yeniler.sort(key=lambda dosya: dosya[2])
+    for i in range(0, len(yeniler), parti):
+        satirlar = [s for s in (_dosya_satiri(kok, *d) for d in yeniler[i:i + parti]) if s]
+        conn.executemany(
+            "INSERT OR IGNORE INTO dosyalar (yol, sha256, boyut, ad, eklenme, degisme, genislik, yukseklik) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            satirlar,
+        )
+        conn.commit()
+    for i in range(0, len(degisenler), parti):
+        satirlar = [s for s in (_dosya_satiri(kok, *d) for d in degisenler[i:i + parti]) if s]
+        conn.executemany(
+            "UPDATE dosyalar SET sha256=?, boyut=?, degisme=?, genislik=?, yukseklik=? WHERE yol=?",
+            [(sha256, boyut, degisme, genislik, yukseklik, yol)
+             for yol, sha256, boyut, _, _, degisme, genislik, yukseklik in satirlar],
+        )
+        conn.commit()
+    conn.executemany("DELETE FROM dosyalar WHERE yol = ?", [(yol,) for yol in kayitli])
+    conn.commit()
+    return len(yeniler), len(degisenler), len(kayitli)
+
+
+@app.cli.command("galeri-esitle")
+@click.option("--parti", default=500, show_default=True, help="Her commit'te işlenecek dosya sayısı.")
+def galeri_esitle(parti):
+    """Yükleme klasörünü tarar; dışarıdan eklenen/silinen dosyaları galeri dizinine işler."""
+    conn = db_baglantisi_kur()
+    eklenen, guncellenen, silinen = dosyalari_esitle(conn, parti)
+    print(f"✅ {eklenen} dosya eklendi, {guncellenen} güncellendi, {silinen} kayıt silindi.")
+
+
+@app.after_request
+def degismez_dosyalari_onbellekle(cevap):
+    # içerik adresli yol hiç değişmez: tarayıcı bir yıl boyunca yeniden sormasın
+    if request.endpoint != "static" or cevap.status_code not in (200, 304):
+        return cevap
+    klasor, _, goreli = (request.view_args or {}).get("filename", "").partition("/")
+    if klasor == "dist":
+        cevap.vary.add("Accept-Encoding")
+    if (klasor in ("uploads", "varyantlar") and depo.degismez_mi(goreli)) or (
+        klasor == "dist" and goreli != "manifest.json"
+    ):
+        cevap.cache_control.no_cache = None
+        cevap.cache_control.public = True
+        cevap.cache_control.max_age = UZUN_ONBELLEK_SN
+        cevap.cache_control.immutable = True
+    return cevap
+
+
+# --- STATİK VARLIKLAR (varlik_derle.py) ---
+VARLIK_MANIFESTI = os.path.join(app.static_folder, "dist", "manifest.json")
+
+
+def varliklari_yukle():
+    # "style.css" -> "dist/style.<hash>.css"; manifest yoksa boş (CDN'li eski şablon düzeni)
+    try:
+        with open(VARLIK_MANIFESTI, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+VARLIKLAR = varliklari_yukle()
+app.jinja_env.globals["paket_hazir"] = "paket.css" in VARLIKLAR and "paket.js" in VARLIKLAR
+
+
+@app.url_defaults
+def varlik_parmak_izi(endpoint, degerler):
+    # url_for('static', filename='logo.png') derlenmiş varlık varsa parmak izli kopyayı gösterir
+    if endpoint == "static" and degerler.get("filename") in VARLIKLAR:
+        degerler["filename"] = VARLIKLAR[degerler["filename"]]
+
+
+@app.before_request
+def sikistirilmis_varlik_sun():
+    # dist/ altındakiler derlemede .br/.gz olarak da yazıldı; istemci destekliyorsa hazır olanı gönder
+    if request.endpoint != "static":
+        return None
+    dosya = (request.view_args or {}).get("filename", "")
+    if not dosya.startswith("dist/"):
+        return None
+    tam_yol = safe_join(app.static_folder, dosya)
+    if tam_yol is None:
+        return None
+    for kodlama, uzanti in (("br", ".br"), ("gzip", ".gz")):
+        if request.accept_encodings[kodlama] and os.path.isfile(tam_yol + uzanti):
+            cevap = send_file(
+                tam_yol + uzanti,
+                mimetype=mimetypes.guess_type(dosya)[0] or "application/octet-stream",
+                conditional=True,
+            )
+            cevap.headers["Content-Encoding"] = kodlama
+            return cevap
+    return None
+
+
+# --- RESİM VARYANTLARI ---
+@kuyruk.gorev("resim")
+def _resim_isi(turler, kaynak=None, dosya=None, normallestir=None):
+    # iş, yüklemeyi yapan isteğin commit'iyle birlikte kaydolur. Pillow resize/encode sırasında GIL'i bırakır;
+    # işçi thread'leri yeterli. Tekrar denenen iş yayımlanmış dosyayı yeniden kodlamaz, sadece eksik varyantlar.
+    # dosya/normallestir: eski biçimde kuyruğa girmiş işler (yerinde yeniden yazılmaz, sadece varyant)
+    conn = db_baglantisi_kur()
+    if kaynak is not None:
+        satir = conn.execute("SELECT yol FROM dosyalar WHERE kaynak_sha256 = ? LIMIT 1", (kaynak,)).fetchone()
+        if satir is None:
+            return  # yükleyen istek geri alınmış ya da kayıt silinmiş
+        dosya = satir["yol"]
+        if bekleyen_mi(dosya):
+            dosya = yuklemeyi_yayinla(conn, dosya)
+    if turler:
+        resim_isleme.varyantlari_uret(
+            app.config["UPLOAD_FOLDER"], app.config["VARYANT_FOLDER"], dosya, tuple(turler)
+        )
+
+
+@app.template_global()
+def resim_kaynaklari(dosya, tur):
+    # varyantlar hazırsa srcset'ler, değilse None (şablon orijinali gösterir; bekleyen yüklemede hiçbir şey)
+    if not dosya or bekleyen_mi(dosya) or not resim_isleme.hazir_mi(app.config["VARYANT_FOLDER"], dosya, tur):
+        return None
+    kaynaklar = {}
+    for uzanti in resim_isleme.FORMATLAR:
+        kaynaklar[uzanti] = ", ".join(
+            url_for("static", filename="varyantlar/" + resim_isleme.varyant_adi(dosya, tur, w, uzanti)) + f" {w}w"
+            for w in resim_isleme.VARYANTLAR[tur]
+        )
+    en_kucuk = resim_isleme.VARYANTLAR[tur][0]
+    kaynaklar["varsayilan"] = url_for(
+        "static", filename="varyantlar/" + resim_isleme.varyant_adi(dosya, tur, en_kucuk, "jpg")
+    )
+    return kaynaklar
+
+
+# --- YAZAR DİZİNİ ---
+# yorum/yazı sorguları users'a JOIN yapmaz; ad ve profil buradan (yazar_onbellegi.py)
+yazar_dizini = yazar_onbellegi.YazarOnbellegi(db_baglantisi_kur, app.config["YAZAR_ONBELLEK_KONTROL_SN"])
+SICAK_SORGULAR["yazar dizini"] = (f"SELECT {yazar_onbellegi.ALANLAR} FROM users WHERE id IN (?, ?)", (1, 2))
+
+
+# --- YORUM AĞACI ---
+ANA_YORUM = "(parent_id IS NULL OR parent_id = 0)"
+YORUM_AGACI_SQL = """
+    WITH RECURSIVE agac (id, derinlik) AS (
+        SELECT id, 0 FROM yorumlar WHERE id IN ({yer})
+        UNION ALL
+        SELECT y.id, agac.derinlik + 1 FROM agac JOIN yorumlar y ON y.post_id = ? AND y.parent_id = agac.id
+        ORDER BY 2
+        LIMIT ?
+    )
+    SELECT yorumlar.*, agac.derinlik
+    FROM agac
+    JOIN yorumlar ON yorumlar.id = agac.id
+    ORDER BY yorumlar.id
+"""
+SICAK_SORGULAR["yorum ağacı"] = (YORUM_AGACI_SQL.format(yer="?"), (1, 1, 300))
+
+
+def yorum_agaci(conn, post_id, kok_idler):
+    # kökleri ve tüm alt cevaplarını tek özyinelemeli sorguyla çeker, tek geçişte ağaca dizer.
+    # önce sığ yorumlar gelir (ORDER BY derinlik); çok uzun zincirler YORUM_AGAC_LIMIT'te kesilir,
+    # kesilen ya da CEVAP_SAYFA_BOYUTU'nu aşan dallar "daha fazla cevap" ile ayrıca yüklenir
+    if not kok_idler:
+        return []
+    yer = ",".join("?" * len(kok_idler))
+    satirlar = conn.execute(
+        YORUM_AGACI_SQL.format(yer=yer), (*kok_idler, post_id, app.config["YORUM_AGAC_LIMIT"])
+    ).fetchall()
+
+    # cevap her zaman üst yorumdan sonra eklenir: id sırasıyla gezerken üst düğüm hazırdır
+    yazarlar = yazar_dizini.al({s["user_id"] for s in satirlar})
+    dugumler = {}
+    for satir in satirlar:
+        yazar = yazarlar.get(satir["user_id"])
+        dugum = dict(satir, ad_soyad=yazar and yazar["ad_soyad"], cevaplar=[], devami=None)
+        dugumler[satir["id"]] = dugum
+        if satir["derinlik"] and satir["parent_id"] in dugumler:
+            dugumler[satir["parent_id"]]["cevaplar"].append(dugum)
+
+    boyut = app.config["CEVAP_SAYFA_BOYUTU"]
+    for dugum in dugumler.values():
+        dugum["cevaplar"] = dugum["cevaplar"][:boyut]
+        kalan = dugum["cevap_sayisi"] - len(dugum["cevaplar"])
+        if kalan > 0:
+            sonra = dugum["cevaplar"][-1]["id"] if dugum["cevaplar"] else 0
+            dugum["devami"] = {"sonra": sonra, "kalan": kalan}
+    return [dugumler[i] for i in kok_idler if i in dugumler]
+
+
+def alt_yorumlari_sil(conn, yorum_id, post_id):
+    # yorumu ve her derinlikteki cevaplarını siler (tek seviye silme yetim cevaplar bırakıyordu)
+    conn.execute(
+        """
+        WITH RECURSIVE alt (id) AS (
+            SELECT ?
+            UNION ALL
+            SELECT y.id FROM alt JOIN yorumlar y ON y.post_id = ? AND y.parent_id = alt.id
+        )
+        DELETE FROM yorumlar WHERE id IN alt
+        """,
+        (yorum_id, post_id),
+    )
+
+
+@app.cli.command("yorum-sayaclari")
+@click.option("--sadece-rapor", is_flag=True, help="Düzeltme yapma; kayma varsa çıkış kodu 1.")
+def yorum_sayaclari(sadece_rapor):
+    """yorum_sayisi / cevap_sayisi sayaçlarını toplu yeniden hesaplar ve kaymaları raporlar."""
+    conn = db_baglantisi_kur()
+    kontroller = {
+        # tablo: (sayaç, doğru değeri veren alt sorgu)
+        "yazilar": ("yorum_sayisi", YORUM_SAYISI_SQL),
+        "yorumlar": ("cevap_sayisi", CEVAP_SAYISI_SQL),
+    }
+    toplam_kayma = 0
+    for tablo, (sutun, dogru_sql) in kontroller.items():
+        kaymalar = conn.execute(
+            f"SELECT * FROM (SELECT id, {sutun} AS kayitli, ({dogru_sql}) AS gercek FROM {tablo}) "
+            "WHERE kayitli != gercek"
+        ).fetchall()
+        for k in kaymalar[:20]:
+            print(f"   {tablo}.{sutun} id={k['id']}: kayıtlı {k['kayitli']}, gerçek {k['gercek']}")
+        if len(kaymalar) > 20:
+            print(f"   ... ve {len(kaymalar) - 20} satır daha")
+        if kaymalar and not sadece_rapor:
+            conn.executemany(
+                f"UPDATE {tablo} SET {sutun} = ? WHERE id = ?", [(k["gercek"], k["id"]) for k in kaymalar]
+            )
+        toplam_kayma += len(kaymalar)
+    conn.commit()
+
+    if not toplam_kayma:
+        print("✅ Yorum sayaçları tutarlı.")
+    elif sadece_rapor:
+        print(f"❌ {toplam_kayma} satırda sayaç kayması var.")
+        raise SystemExit(1)
+    else:
+        print(f"✅ {toplam_kayma} satırın sayacı düzeltildi.")
+
+
+@app.route("/yorum/<int:yorum_id>/cevaplar")
+def yorum_cevaplari(yorum_id):
+    # "daha fazla cevap": bir yorumun sonraki cevap sayfasını (alt ağaçlarıyla) parça HTML olarak döner
+    conn = db_baglantisi_kur()
+    ust = conn.execute(
+        "SELECT yorumlar.post_id, yazilar.guncellenme FROM yorumlar "
+        "JOIN yazilar ON yazilar.id = yorumlar.post_id WHERE yorumlar.id = ?",
+        (yorum_id,),
+    ).fetchone()
+    if ust is None:
+        abort(404)
+    kosullu_yanit(ust["guncellenme"], yazar_dizini.surum())
+
+    post_id = ust["post_id"]
+    sonra = request.args.get("sonra", 0, type=sqlite_tamsayi)
+    boyut = app.config["CEVAP_SAYFA_BOYUTU"]
+    idler = [
+        s["id"]
+        for s in conn.execute(
+            "SELECT id FROM yorumlar WHERE post_id = ? AND parent_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (post_id, yorum_id, sonra, boyut),
+        )
+    ]
+    cevaplar = yorum_agaci(conn, post_id, idler)
+
+    devami = None
+    if idler:
+        kalan = conn.execute(
+            "SELECT count(*) FROM yorumlar WHERE post_id = ? AND parent_id = ? AND id > ?",
+            (post_id, yorum_id, idler[-1]),
+        ).fetchone()[0]
+        if kalan:
+            devami = {"sonra": idler[-1], "kalan": kalan}
+    return render_template(
+        "yorum_cevaplari.html", yorum_id=yorum_id, post_id=post_id, cevaplar=cevaplar, devami=devami
+    )
+
 
- 
 # --- FİLTRE ---
 @app.template_filter("okuma_suresi")
-def okuma_suresi(metin):
-    if not metin:
+def okuma_suresi(kelime_sayisi):
+    if not kelime_sayisi:
         return "1 dk"
-    return f"{max(1, int(len(metin.split()) / 200))} dk"
+    return f"{max(1, int(kelime_sayisi / 200))} dk"
 
 
 # --- ANASAYFA ---
 @app.route("/")
 def anasayfa():
+    kosullu_yanit(son_degisiklik("yazilar", "yorumlar"))
     conn = db_baglantisi_kur()
-    yazilar = conn.execute(
-        "SELECT * FROM yazilar WHERE durum = 1 ORDER BY id DESC"
-    ).fetchall()
-    conn.close()
-    return render_template("index.html", posts=yazilar)
+    yazilar, sayfa = yazilari_sayfala(conn, "durum = 1")
+    onbellek_etiketle("anasayfa")
+    return render_template("index.html", posts=yazilar, sayfa=sayfa)
 
 
 # --- DETAY + YORUM LİSTELEME (cevap_map ile) ---
@@ -45,60 +1796,37 @@ def anasayfa():
 def detay(id):
     conn = db_baglantisi_kur()
 
-    # görüntülenme
-    try:
-        conn.execute(
-            "UPDATE yazilar SET goruntulenme = COALESCE(goruntulenme,0) + 1 WHERE id = ?",
-            (id,),
-        )
-        conn.commit()
-    except Exception as e:
-        print("goruntulenme:", e)
-
-    yazi = conn.execute(
-        """
-        SELECT yazilar.*, users.ad_soyad
-        FROM yazilar
-        JOIN users ON yazilar.author_id = users.id
-        WHERE yazilar.id = ?
-        """,
-        (id,),
-    ).fetchone()
+    # önce ucuz sürüm kontrolü: yazı/yorumlar ve kullanıcılar değişmediyse 304
+    damga = conn.execute("SELECT guncellenme FROM yazilar WHERE id = ?", (id,)).fetchone()
+    if damga is None:
+        abort(404)
+    goruntulenme_ekle(id)
+    kosullu_yanit(damga["guncellenme"], yazar_dizini.surum())
 
+    yazi = conn.execute("SELECT * FROM yazilar WHERE id = ?", (id,)).fetchone()
     if yazi is None:
-        conn.close()
         abort(404)
+    yazi = dict(yazi, ad_soyad=yazar_dizini.ad(yazi["author_id"]))
 
-    # ana yorumlar
-    yorumlar = conn.execute(
-        """
-        SELECT yorumlar.*, users.ad_soyad
-        FROM yorumlar
-        JOIN users ON yorumlar.user_id = users.id
-        WHERE post_id = ? AND (parent_id IS NULL OR parent_id = 0)
-        ORDER BY id DESC
-        """,
-        (id,),
-    ).fetchall()
+    # görüntülenme tampona yazıldı (yukarıda, 304'ler de sayılsın); gösterilen = DB + bekleyen
+    goruntulenme = (yazi["goruntulenme"] or 0) + goruntulenme_bekleyen(id)
 
-    # cevaplar
-    cevaplar = conn.execute(
-        """
-        SELECT yorumlar.*, users.ad_soyad
-        FROM yorumlar
-        JOIN users ON yorumlar.user_id = users.id
-        WHERE post_id = ? AND parent_id IS NOT NULL AND parent_id != 0
-        ORDER BY id ASC
-        """,
-        (id,),
-    ).fetchall()
+    # ana yorumlar sayfalı (yeniden eskiye); her sayfa alt cevaplarıyla tek sorguda
+    kokler, yorum_sayfasi = sayfala(
+        conn, "yorumlar", "id", f"post_id = ? AND {ANA_YORUM}", (id,), boyut=app.config["YORUM_SAYFA_BOYUTU"]
+    )
+    yorumlar = yorum_agaci(conn, id, [k["id"] for k in kokler])
 
-    cevap_map = {}
-    for c in cevaplar:
-        cevap_map.setdefault(c["parent_id"], []).append(c)
+    # yazar ya da yorum yapanlardan biri adını değiştirirse bu sayfa da düşsün
+    kullanicilar = {yazi["author_id"]}
+    bekleyen = list(yorumlar)
+    while bekleyen:
+        yorum = bekleyen.pop()
+        kullanicilar.add(yorum["user_id"])
+        bekleyen.extend(yorum["cevaplar"])
+    onbellek_etiketle(f"yazi:{id}", *(f"kullanici:{k}" for k in kullanicilar))
 
-    conn.close()
-    return render_template("detay.html", yazi=yazi, yorumlar=yorumlar, cevap_map=cevap_map)
+    return sayfa_ciz("detay.html", yazi=yazi, yorumlar=yorumlar, sayfa=yorum_sayfasi, goruntulenme=goruntulenme)
 
 
 # --- YORUM EKLE (ana yorum) ---
@@ -117,7 +1845,7 @@ def yorum_ekle(post_id):
         (post_id, session["user_id"], yorum_metin),
     )
     conn.commit()
-    conn.close()
+    yorum_onbellegini_temizle(conn, post_id)
     return redirect(url_for("detay", id=post_id))
 
 
@@ -132,16 +1860,19 @@ def yorum_yanitla(post_id, parent_id):
         return redirect(url_for("detay", id=post_id))
 
     conn = db_baglantisi_kur()
-    conn.execute( 
+    # üst yorum başka bir yazıya aitse ağaç bozulur
+    if conn.execute("SELECT 1 FROM yorumlar WHERE id = ? AND post_id = ?", (parent_id, post_id)).fetchone() is None:
+        abort(404)
+    conn.execute(
         "INSERT INTO yorumlar (post_id, user_id, yorum, parent_id) VALUES (?, ?, ?, ?)",
         (post_id, session["user_id"], metin, parent_id),
     )
     conn.commit()
-    conn.close()
+    yorum_onbellegini_temizle(conn, post_id)
     return redirect(url_for("detay", id=post_id))
 
 
-# --- YORUM SİL (ve alt cevaplarını da sil) ---
+# --- YORUM SİL (ve tüm alt cevaplarını da sil) ---
 @app.route("/yorum-sil/<int:yorum_id>", methods=["POST"])
 def yorum_sil(yorum_id):
     if not session.get("giris_yapildi"):
@@ -150,19 +1881,16 @@ def yorum_sil(yorum_id):
     conn = db_baglantisi_kur()
     yorum = conn.execute("SELECT * FROM yorumlar WHERE id=?", (yorum_id,)).fetchone()
     if yorum is None:
-        conn.close()
         abort(404)
 
     if session.get("rol") != "admin" and session.get("user_id") != yorum["user_id"]:
-        conn.close()
         return "Yetkisiz", 403
 
     post_id = yorum["post_id"]
 
-    # yorumu + cevaplarını sil
-    conn.execute("DELETE FROM yorumlar WHERE id=? OR parent_id=?", (yorum_id, yorum_id))
+    alt_yorumlari_sil(conn, yorum_id, post_id)
     conn.commit()
-    conn.close() 
+    yorum_onbellegini_temizle(conn, post_id)
     return redirect(url_for("detay", id=post_id))
 
 
@@ -175,11 +1903,9 @@ def yorum_duzenle(yorum_id):
     conn = db_baglantisi_kur()
     yorum = conn.execute("SELECT * FROM yorumlar WHERE id=?", (yorum_id,)).fetchone()
     if yorum is None:
-        conn.close()
         abort(404)
 
     if session.get("rol") != "admin" and session.get("user_id") != yorum["user_id"]:
-        conn.close()
         return "Yetkisiz", 403
 
     if request.method == "POST":
@@ -187,11 +1913,10 @@ def yorum_duzenle(yorum_id):
         if yeni:
             conn.execute("UPDATE yorumlar SET yorum=? WHERE id=?", (yeni, yorum_id))
             conn.commit()
+            yorum_onbellegini_temizle(conn, yorum["post_id"])
         post_id = yorum["post_id"]
-        conn.close()
         return redirect(url_for("detay", id=post_id))
 
-    conn.close()
     return render_template("yorum_duzenle.html", yorum=yorum)
 
 
@@ -207,29 +1932,36 @@ def yeni_yazi():
         kategori = request.form["kategori"]
         resim = request.files.get("resim")
 
+        conn = db_baglantisi_kur()
         resim_adi = ""
         if resim and resim.filename:
-            resim_adi = secure_filename(resim.filename)
-            resim.save(os.path.join(app.config["UPLOAD_FOLDER"], resim_adi))
+            resim_adi = dosya_kaydet(resim, "kart", "kapak")
 
         durum = 1 if session["rol"] == "admin" else 0
+        ozet, kelime_sayisi, metin = ozet_hesapla(icerik)
 
-        conn = db_baglantisi_kur()
-        conn.execute(
+        imlec = conn.execute(
             """
-            INSERT INTO yazilar (baslik, icerik, kategori, author_id, durum, resim)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO yazilar (baslik, icerik, kategori, author_id, durum, resim, ozet, kelime_sayisi, metin)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (baslik, icerik, kategori, session["user_id"], durum, resim_adi),
+            (baslik, icerik, kategori, session["user_id"], durum, resim_adi, ozet, kelime_sayisi, metin),
         )
+        if resim_adi:
+            dosya_bagla(resim_adi, "yazi", imlec.lastrowid)
         conn.commit()
-        conn.close()
+        if durum == 1:
+            yazi_onbellegini_temizle({"id": imlec.lastrowid, "kategori": kategori, "author_id": session["user_id"]})
         return redirect(url_for("anasayfa"))
 
     return render_template("yeni.html")
 
 
 # --- YAZI DÜZENLE ---
+# reddedilen (durum 2) yazı düzenlenince yeniden onay bekler
+ONAYA_DON = "durum = CASE durum WHEN 2 THEN 0 ELSE durum END"
+
+
 @app.route("/<int:id>/duzenle", methods=("GET", "POST"))
 def duzenle(id):
     if not session.get("giris_yapildi"):
@@ -239,11 +1971,9 @@ def duzenle(id):
     yazi = conn.execute("SELECT * FROM yazilar WHERE id = ?", (id,)).fetchone()
 
     if yazi is None:
-        conn.close()
         abort(404)
 
     if session["rol"] != "admin" and session["user_id"] != yazi["author_id"]:
-        conn.close()
         return "Yetkisiz", 403
 
     if request.method == "POST":
@@ -251,25 +1981,28 @@ def duzenle(id):
         icerik = request.form["icerik"]
         kategori = request.form["kategori"]
         resim = request.files.get("resim")
+        ozet, kelime_sayisi, metin = ozet_hesapla(icerik)
 
         if resim and resim.filename:
-            dosya = secure_filename(resim.filename)
-            resim.save(os.path.join(app.config["UPLOAD_FOLDER"], dosya))
+            dosya = dosya_kaydet(resim, "kart", "kapak")
+            dosya_bagla(dosya, "yazi", id, degistir=True)
             conn.execute(
-                "UPDATE yazilar SET baslik=?, icerik=?, kategori=?, resim=? WHERE id=?",
-                (baslik, icerik, kategori, dosya, id),
+                "UPDATE yazilar SET baslik=?, icerik=?, kategori=?, resim=?, ozet=?, kelime_sayisi=?, metin=?, "
+                f"{ONAYA_DON} WHERE id=?",
+                (baslik, icerik, kategori, dosya, ozet, kelime_sayisi, metin, id),
             )
         else:
             conn.execute(
-                "UPDATE yazilar SET baslik=?, icerik=?, kategori=? WHERE id=?",
-                (baslik, icerik, kategori, id),
+                "UPDATE yazilar SET baslik=?, icerik=?, kategori=?, ozet=?, kelime_sayisi=?, metin=?, "
+                f"{ONAYA_DON} WHERE id=?",
+                (baslik, icerik, kategori, ozet, kelime_sayisi, metin, id),
             )
 
         conn.commit()
-        conn.close()
+        # kategori değiştiyse eski kategori sayfası da
+        yazi_onbellegini_temizle(yazi, f"kategori:{kategori}")
         return redirect(url_for("detay", id=id))
 
-    conn.close()
     return render_template("duzenle.html", yazi=yazi)
 
 
@@ -282,37 +2015,106 @@ def sil(id):
     conn = db_baglantisi_kur()
     yazi = conn.execute("SELECT * FROM yazilar WHERE id=?", (id,)).fetchone()
     if yazi is None:
-        conn.close()
         abort(404)
 
     if session.get("rol") != "admin" and session.get("user_id") != yazi["author_id"]:
-        conn.close()
         return "Yetkisiz", 403
 
     conn.execute("DELETE FROM yazilar WHERE id=?", (id,))
+    conn.execute("DELETE FROM dosya_baglari WHERE sahip_turu = 'yazi' AND sahip_id = ?", (id,))
     conn.commit()
-    conn.close()
+    yazi_onbellegini_temizle(yazi)
     return redirect(url_for("anasayfa"))
 
 
+# --- ŞİFRE HAVUZU / DENEME SINIRI ---
+sifre_havuzu = sifreleme.SifreHavuzu(
+    isci=app.config["SIFRE_ISCI_SAYISI"],
+    kuyruk=app.config["SIFRE_KUYRUK"],
+    bekleme_sn=app.config["SIFRE_BEKLEME_SN"],
+    yontem=app.config["SIFRE_YONTEMI"],
+)
+atexit.register(sifre_havuzu.kapat)
+giris_ip_kovasi = sinirlama.JetonKovasi(*app.config["GIRIS_IP_KOVA"])
+# e-posta kovasını sadece hatalı denemeler harcar; doğru şifreyle sık giren kullanıcı takılmaz
+giris_email_kovasi = sinirlama.JetonKovasi(*app.config["GIRIS_EMAIL_KOVA"])
+kayit_ip_kovasi = sinirlama.JetonKovasi(*app.config["KAYIT_IP_KOVA"])
+sifre_suresi = olcum.Histogram("prometheon_sifre_sure_sn", "Şifre özetleme: sırada bekleme + hesaplama.", ("islem",))
+sifre_sonucu = olcum.Sayac("prometheon_sifre_islem_toplam", "Şifre özetleme işleri.", ("islem", "sonuc"))
+sinirlanan = olcum.Sayac("prometheon_sinirlanan_toplam", "Deneme sınırına takılan istekler.", ("kova",))
+
+
+def sifre_isi(islem, fonksiyon, *argumanlar):
+    bas = time.perf_counter()
+    try:
+        sonuc = fonksiyon(*argumanlar)
+    except sifreleme.Mesgul:
+        sifre_sonucu.ekle((islem, "mesgul"))
+        raise
+    sifre_suresi.gozlemle((islem,), time.perf_counter() - bas)
+    sifre_sonucu.ekle((islem, "tamam"))
+    return sonuc
+
+
+def deneme_siniri(ad, kova, anahtar, harca=True):
+    # 0: devam; değilse kaç sn sonra tekrar denenebilir
+    if not app.config["GIRIS_SINIRI"]:
+        return 0
+    bekle = kova.dene(anahtar) if harca else kova.bekleme(anahtar)
+    if bekle:
+        sinirlanan.ekle((ad,))
+    return bekle
+
+
+def cok_deneme(sablon, bekle):
+    sn = math.ceil(bekle)
+    hata = f"Çok fazla deneme yapıldı. Lütfen {sn} sn sonra tekrar deneyin."
+    return render_template(sablon, hata=hata), 429, {"Retry-After": str(sn)}
+
+
+def sunucu_yogun(sablon):
+    hata = "Sunucu şu an çok yoğun. Lütfen birkaç saniye sonra tekrar deneyin."
+    return render_template(sablon, hata=hata), 503, {"Retry-After": "5"}
+
+
 # --- GİRİŞ / KAYIT / ÇIKIŞ ---
 @app.route("/giris", methods=("GET", "POST"))
 def giris():
     if request.method == "POST":
         email = request.form["email"]
         sifre = request.form["sifre"]
+        email_anahtari = email.strip().lower()
+
+        bekle = max(
+            deneme_siniri("giris_ip", giris_ip_kovasi, request.remote_addr),
+            deneme_siniri("giris_email", giris_email_kovasi, email_anahtari, harca=False),
+        )
+        if bekle:
+            return cok_deneme("giris.html", bekle)
 
         conn = db_baglantisi_kur()
         user = conn.execute("SELECT * FROM users WHERE email=?", (email,)).fetchone()
-        conn.close()
 
-        if user and check_password_hash(user["sifre"], sifre):
+        dogru = False
+        if user:
+            try:
+                dogru, yeni_ozet = sifre_isi("dogrula", sifre_havuzu.dogrula, user["sifre"], sifre)
+            except sifreleme.Mesgul:
+                return sunucu_yogun("giris.html")
+
+        if dogru:
+            if yeni_ozet:
+                # SIFRE_YONTEMI değişmiş; eski parametreli özet bu girişte yenisiyle değiştirilir
+                conn.execute("UPDATE users SET sifre=? WHERE id=?", (yeni_ozet, user["id"]))
+                conn.commit()
+                sifre_sonucu.ekle(("dogrula", "yenilendi"))
             session["user_id"] = user["id"]
             session["ad_soyad"] = user["ad_soyad"]
             session["rol"] = user["rol"]
             session["giris_yapildi"] = True
             return redirect(url_for("admin_panel") if user["rol"] == "admin" else url_for("anasayfa"))
 
+        deneme_siniri("giris_email", giris_email_kovasi, email_anahtari)
         return render_template("giris.html", hata="E-posta veya şifre hatalı!")
 
     return render_template("giris.html")
@@ -321,20 +2123,23 @@ def giris():
 @app.route("/kayit", methods=("GET", "POST"))
 def kayit():
     if request.method == "POST":
+        bekle = deneme_siniri("kayit_ip", kayit_ip_kovasi, request.remote_addr)
+        if bekle:
+            return cok_deneme("kayit.html", bekle)
+        try:
+            sifre = sifre_isi("ozetle", sifre_havuzu.ozetle, request.form["sifre"])
+        except sifreleme.Mesgul:
+            return sunucu_yogun("kayit.html")
+
         try:
             conn = db_baglantisi_kur()
             conn.execute(
                 "INSERT INTO users (ad_soyad, email, sifre) VALUES (?,?,?)",
-                (
-                    request.form["ad_soyad"],
-                    request.form["email"],
-                    generate_password_hash(request.form["sifre"]),
-                ),
+                (request.form["ad_soyad"], request.form["email"], sifre),
             )
             conn.commit()
-            conn.close()
             return redirect(url_for("giris"))
-        except:
+        except sqlite3.IntegrityError:
             return render_template("kayit.html", hata="Bu e-posta zaten kayıtlı!")
 
     return render_template("kayit.html")
@@ -360,8 +2165,8 @@ def profil_duzenle():
         profil_resmi_dosya = request.files.get("profil_resmi")
 
         if profil_resmi_dosya and profil_resmi_dosya.filename:
-            dosya_adi = secure_filename(profil_resmi_dosya.filename)
-            profil_resmi_dosya.save(os.path.join(app.config["UPLOAD_FOLDER"], dosya_adi))
+            dosya_adi = dosya_kaydet(profil_resmi_dosya, "avatar")
+            dosya_bagla(dosya_adi, "kullanici", session["user_id"], degistir=True)
             conn.execute(
                 "UPDATE users SET ad_soyad=?, biyografi=?, profil_resmi=? WHERE id=?",
                 (ad_soyad, biyografi, dosya_adi, session["user_id"]),
@@ -373,72 +2178,92 @@ def profil_duzenle():
             )
 
         conn.commit()
+        yazar_dizini.gecersiz_kil()
+        onbellegi_temizle(f"kullanici:{session['user_id']}", "yazarlar")
         session["ad_soyad"] = ad_soyad
-        conn.close()
         return redirect(url_for("anasayfa"))
 
     user = conn.execute("SELECT * FROM users WHERE id=?", (session["user_id"],)).fetchone()
-    conn.close()
     return render_template("profil_duzenle.html", user=user)
 
 
 # --- YAZARLAR ---
 @app.route("/yazarlar")
 def yazarlar_sayfasi():
-    conn = db_baglantisi_kur()
-    yazarlar = conn.execute("SELECT * FROM users WHERE rol IN ('admin','yazar')").fetchall()
-    conn.close()
-    return render_template("yazarlar.html", yazarlar=yazarlar)
+    # sürüm ve liste yazar dizininden: sıcakken SQLite'a hiç uğramaz
+    kosullu_yanit(yazar_dizini.surum())
+    onbellek_etiketle("yazarlar")
+    return render_template("yazarlar.html", yazarlar=yazar_dizini.yazarlar())
 
 
 @app.route("/yazar/<int:id>")
 def yazar_profili(id):
+    kosullu_yanit(yazar_dizini.surum(), son_degisiklik("yazilar", "yorumlar"))
     conn = db_baglantisi_kur()
-    yazar = conn.execute("SELECT * FROM users WHERE id=?", (id,)).fetchone()
+    yazar = yazar_dizini.al([id]).get(id)
     if yazar is None:
-        conn.close()
         abort(404)
 
-    yazilar = conn.execute(
-        "SELECT * FROM yazilar WHERE author_id=? AND durum=1 ORDER BY id DESC",
-        (id,),
-    ).fetchall() 
-    conn.close()
-    return render_template("yazar_detay.html", yazar=yazar, yazilar=yazilar)
+    yazilar, sayfa = yazilari_sayfala(conn, "author_id = ? AND durum = 1", (id,))
+    onbellek_etiketle(f"kullanici:{id}")
+    return render_template("yazar_detay.html", yazar=yazar, yazilar=yazilar, sayfa=sayfa)
 
 
 # --- KATEGORİ ---
 @app.route("/kategori/<isim>")
 def kategori_sayfasi(isim):
+    kosullu_yanit(son_degisiklik("yazilar", "yorumlar"))
     conn = db_baglantisi_kur()
-    yazilar = conn.execute(
-        "SELECT * FROM yazilar WHERE kategori = ? AND durum = 1 ORDER BY id DESC",
-        (isim,),
-    ).fetchall()
-    conn.close()
-    return render_template("index.html", posts=yazilar)
+    yazilar, sayfa = yazilari_sayfala(conn, "kategori = ? AND durum = 1", (isim,))
+    onbellek_etiketle(f"kategori:{isim}")
+    return render_template("index.html", posts=yazilar, sayfa=sayfa)
 
 
 # --- ARAMA ---
 @app.route("/arama")
 def arama():
     kelime = request.args.get("q", "").strip()
-    conn = db_baglantisi_kur()
+    boyut = app.config["SAYFA_BOYUTU"]
+    # OFFSET (sayfa_no - 1) * boyut sqlite tamsayısına sığmalı
+    sayfa_no = min(max(request.args.get("s", 1, type=int), 1), SQLITE_TAMSAYI.stop // boyut)
+    posts, toplam = [], 0
+    sayfa = {"onceki": None, "sonraki": None}
+
+    sorgu = fts_sorgusu(kelime)
+    kosullu_yanit(son_degisiklik("yazilar", "yorumlar"))
+    if sorgu:
+        conn = db_baglantisi_kur()
+        toplam = conn.execute(
+            """
+            SELECT count(*) FROM yazilar_fts
+            JOIN yazilar ON yazilar.id = yazilar_fts.rowid
+            WHERE yazilar_fts MATCH ? AND yazilar.durum = 1
+            """,
+            (sorgu,),
+        ).fetchone()[0]
 
-    if kelime:
-        posts = conn.execute(
+        # bm25: başlıktaki eşleşme gövdedekinden 10 kat ağır
+        satirlar = conn.execute(
             """
-            SELECT * FROM yazilar
-            WHERE durum = 1 AND (baslik LIKE ? OR icerik LIKE ?)
-            ORDER BY id DESC
+            SELECT yazilar.id, yazilar.kategori, yazilar.resim, yazilar.yorum_sayisi,
+                   highlight(yazilar_fts, 0, ?, ?) AS baslik,
+                   snippet(yazilar_fts, 1, ?, ?, '…', 24) AS parca
+            FROM yazilar_fts
+            JOIN yazilar ON yazilar.id = yazilar_fts.rowid
+            WHERE yazilar_fts MATCH ? AND yazilar.durum = 1
+            ORDER BY bm25(yazilar_fts, 10.0, 1.0)
+            LIMIT ? OFFSET ?
             """,
-            (f"%{kelime}%", f"%{kelime}%"),
+            (_VURGU_BAS, _VURGU_SON, _VURGU_BAS, _VURGU_SON, sorgu, boyut, (sayfa_no - 1) * boyut),
         ).fetchall()
-    else:
-        posts = []
+        posts = [dict(p, baslik=vurgula(p["baslik"]), parca=vurgula(p["parca"])) for p in satirlar]
+
+        if sayfa_no > 1:
+            sayfa["onceki"] = _sayfa_linki(s=sayfa_no - 1)
+        if sayfa_no * boyut < toplam:
+            sayfa["sonraki"] = _sayfa_linki(s=sayfa_no + 1)
 
-    conn.close()
-    return render_template("arama.html", kelime=kelime, posts=posts)
+    return render_template("arama.html", kelime=kelime, posts=posts, toplam=toplam, sayfa=sayfa)
 
 
 # --- GALERİ ---
@@ -452,18 +2277,23 @@ def galeri():
 
         for f in dosyalar:
             if f and f.filename:
-                fname = secure_filename(f.filename)
-                f.save(os.path.join(app.config["UPLOAD_FOLDER"], fname))
+                fname = dosya_kaydet(f, "kart")
+                dosya_bagla(fname, "galeri", session.get("user_id", 0))
                 kaydedilenler.append(fname)
+        db_baglantisi_kur().commit()
 
         mesaj = f"{len(kaydedilenler)} adet resim yüklendi." if kaydedilenler else "Hiç dosya seçilmedi."
 
-    try:
-        resimler = sorted(os.listdir(app.config["UPLOAD_FOLDER"]))
-    except FileNotFoundError:
-        resimler = []
-
-    return render_template("galeri.html", resimler=resimler, mesaj=mesaj)
+    # klasör her istekte taranmaz; dizin kayıtta ve `flask galeri-esitle` ile güncellenir
+    resimler, sayfa = sayfala(
+        db_baglantisi_kur(),
+        "dosyalar",
+        "rowid AS id, yol, ad, boyut, genislik, yukseklik",
+        "genislik IS NOT NULL",
+        anahtar="rowid",
+        boyut=app.config["GALERI_SAYFA_BOYUTU"],
+    )
+    return render_template("galeri.html", resimler=resimler, sayfa=sayfa, mesaj=mesaj)
 
 
 # --- CKEDITOR UPLOAD ---
@@ -475,65 +2305,235 @@ def upload_file():
     if f.filename == "":
         return "No selected file", 400
 
-    fname = secure_filename(f.filename)
-    f.save(os.path.join(app.config["UPLOAD_FOLDER"], fname))
+    # yazı içi resim: sadece boyut sınırı + metadata temizliği. Editör adresi hemen yazının HTML'ine koyar,
+    # sonradan değiştirilemez: temizlik bu istekte yapılır
+    try:
+        fname = dosya_kaydet(f, hemen=True)
+    except OSError:
+        app.logger.warning("editör yüklemesi okunamadı: %s", f.filename, exc_info=True)
+        return "Resim okunamadı", 400
+    dosya_bagla(fname, "icerik", session.get("user_id", 0))
+    db_baglantisi_kur().commit()
     file_url = url_for("static", filename="uploads/" + fname)
 
     callback = request.args.get("CKEditorFuncNum")
     return f"<script>window.parent.CKEDITOR.tools.callFunction({callback}, '{file_url}', '');</script>"
 
 
+# --- ANALİTİK (günlük özetler) ---
+def analitik_planla(conn):
+    # bekleyen özet işi yoksa ANALITIK_ARALIK_SN sonrasına bir tane; trafik yokken hiç çalışmaz.
+    # iki süreç aynı anda eklerse ikinci iş işlenecek olay bulamaz, zararı yok
+    bekleyen = conn.execute(
+        "SELECT 1 FROM isler WHERE tur = 'analitik' AND durum IN (?, ?) LIMIT 1", (isler.BEKLIYOR, isler.CALISIYOR)
+    ).fetchone()
+    if bekleyen is None:
+        kuyruk.ekle(conn, "analitik", gecikme=app.config["ANALITIK_ARALIK_SN"])
+
+
+def _bugun():
+    return datetime.now(ZoneInfo(app.config["ANALITIK_SAAT_DILIMI"])).date()
+
+
+def analitigi_guncelle():
+    # pandas/matplotlib ağır; sadece `flask is-iscisi` sürecindeki özet işinde ve CLI'da yüklenir
+    # (IS_AYRI_SUREC_TURLERI), web süreçleri hiç yüklemez
+    import analitik
+
+    conn = db_baglantisi_kur()
+    adet = analitik.ozetle(
+        conn, saat_dilimi=app.config["ANALITIK_SAAT_DILIMI"], saklama_gun=app.config["ANALITIK_SAKLAMA_GUN"]
+    )
+    analitik.grafikleri_ciz(conn, app.config["ANALITIK_KLASORU"], bugun=_bugun(), kaynak_adlari=KAYNAK_ADLARI)
+    return adet
+
+
+@kuyruk.gorev("analitik")
+def _analitik_isi():
+    analitigi_guncelle()
+
+
+@app.cli.command("analitik-ozetle")
+def analitik_ozetle():
+    """Bekleyen görüntülenme olaylarını günlük özetlere ekler ve panel grafiklerini yeniden çizer."""
+    bas = time.perf_counter()
+    adet = analitigi_guncelle()
+    print(f"✅ {adet} olay özetlendi ({time.perf_counter() - bas:.1f} sn).")
+
+
+def _en_cok(conn, boyut, baslangic, limit=10):
+    return conn.execute(
+        "SELECT anahtar, sum(adet) AS adet FROM analitik_gunluk WHERE boyut = ? AND gun >= ? "
+        "GROUP BY anahtar ORDER BY adet DESC LIMIT ?",
+        (boyut, baslangic, limit),
+    ).fetchall()
+
+
+SICAK_SORGULAR["analitik"] = (
+    "SELECT anahtar, sum(adet) AS adet FROM analitik_gunluk WHERE boyut = ? AND gun >= ? GROUP BY anahtar",
+    ("yazi", "2024-01-01"),
+)
+
+
+def analitik_ozeti(conn, gun=30):
+    # panel için; sadece analitik_gunluk (özet) okunur
+    bugun = _bugun()
+    donem = (bugun - timedelta(days=gun - 1)).isoformat()
+    hafta = (bugun - timedelta(days=6)).isoformat()
+
+    populer = [(int(p["anahtar"]), p["adet"]) for p in _en_cok(conn, "yazi", hafta)]
+    basliklar = {}
+    if populer:
+        yer = ",".join("?" * len(populer))
+        basliklar = dict(
+            conn.execute(f"SELECT id, baslik FROM yazilar WHERE id IN ({yer})", [i for i, _ in populer]).fetchall()
+        )
+    yazarlar = [(int(y["anahtar"]), y["adet"]) for y in _en_cok(conn, "yazar", donem, 5)]
+    adlar = yazar_dizini.al([i for i, _ in yazarlar])
+    kaynaklar = _en_cok(conn, "kaynak", donem)
+
+    grafikler = {}
+    for ad in ("gunluk", "kategori"):
+        yol = os.path.join(app.config["ANALITIK_KLASORU"], f"{ad}.png")
+        if os.path.exists(yol):
+            grafikler[ad] = int(os.path.getmtime(yol))  # adres sürümü: yeniden çizilince tarayıcı yenisini alır
+    return {
+        "gun": gun,
+        "toplam": sum(k["adet"] for k in kaynaklar),
+        "populer": [(i, basliklar.get(i, "(silinmiş yazı)"), adet) for i, adet in populer],
+        "yazarlar": [(adlar[i]["ad_soyad"] if i in adlar else "?", adet) for i, adet in yazarlar],
+        "kaynaklar": [(KAYNAK_ADLARI.get(k["anahtar"], k["anahtar"]), k["adet"]) for k in kaynaklar],
+        "grafikler": grafikler,
+    }
+
+
+@app.route("/admin/grafik/<ad>.png")
+def analitik_grafik(ad):
+    if session.get("rol") != "admin":
+        return "Yetkisiz", 403
+    yol = safe_join(app.config["ANALITIK_KLASORU"], f"{ad}.png")
+    if yol is None or not os.path.isfile(yol):
+        abort(404)
+    # adres ?v=<mtime> ile değişir; aynı adres hep aynı resim. Sadece admin görür: tarayıcı saklar,
+    # ara vekiller saklamaz (send_file max_age ile "public" koyar)
+    cevap = send_file(yol, mimetype="image/png", max_age=86400, conditional=True)
+    cevap.cache_control.public = False
+    cevap.cache_control.private = True
+    return cevap
+
+
 # --- ADMIN ---
+# yazı durumları: 0 onay bekliyor, 1 yayında, 2 reddedildi (yazar düzenleyince 0'a döner)
 @app.route("/admin")
 def admin_panel():
     if session.get("rol") != "admin":
         return "Yetkisiz", 403
 
     conn = db_baglantisi_kur()
-    bekleyenler = conn.execute( 
-        """
-        SELECT yazilar.*, users.ad_soyad AS yazar_adi
-        FROM yazilar
-        JOIN users ON yazilar.author_id = users.id
-        WHERE yazilar.durum = 0
-        ORDER BY yazilar.id DESC
-        """
-    ).fetchall()
-
-    users = conn.execute("SELECT * FROM users ORDER BY ad_soyad").fetchall()
+    boyut = app.config["ADMIN_SAYFA_BOYUTU"]
+    # üç liste aynı sayfada, her biri kendi imleciyle: ?b_once=, ?k_once=, ?m_once=
+    bekleyenler, bekleyen_sayfa = sayfala(
+        conn, "yazilar", ADMIN_YAZI_SUTUNLARI, "durum = 0", boyut=boyut, onek="b_"
+    )
+    yazarlar = yazar_dizini.al({y["author_id"] for y in bekleyenler})
+    bekleyenler = [
+        dict(y, yazar_adi=yazarlar[y["author_id"]]["ad_soyad"]) for y in bekleyenler if y["author_id"] in yazarlar
+    ]
+
+    users, kullanici_sayfa = sayfala(
+        conn, "users", ADMIN_KULLANICI_SUTUNLARI, "1 = 1",
+        anahtar=("ad_soyad", "id"), artan=True, boyut=boyut, onek="k_",
+    )
 
     # iletişim tablon yoksa patlamasın
     try:
-        mesajlar = conn.execute("SELECT * FROM iletisim_mesajlari ORDER BY tarih DESC").fetchall()
-    except:
-        mesajlar = []
+        mesajlar, mesaj_sayfa = sayfala(
+            conn, "iletisim_mesajlari", "rowid AS id, tarih, isim, email, konu, mesaj", "1 = 1",
+            anahtar="rowid", boyut=boyut, onek="m_",
+        )
+    except sqlite3.OperationalError as hata:
+        app.logger.warning("iletişim mesajları okunamadı: %s", hata)
+        mesajlar, mesaj_sayfa = [], None
+
+    return sayfa_ciz(
+        "admin.html",
+        bekleyenler=bekleyenler, bekleyen_sayfa=bekleyen_sayfa,
+        users=users, kullanici_sayfa=kullanici_sayfa,
+        mesajlar=mesajlar, mesaj_sayfa=mesaj_sayfa,
+        analitik=analitik_ozeti(conn),
+    )
+
 
-    conn.close()
-    return render_template("admin.html", bekleyenler=bekleyenler, users=users, mesajlar=mesajlar)
+def secilen_idler():
+    # toplu işlem formundaki işaretli satırlar; çok fazlası tek istekte işlenmez
+    idler = list(dict.fromkeys(request.form.getlist("id", type=sqlite_tamsayi)))
+    if len(idler) > app.config["ADMIN_TOPLU_EN_FAZLA"]:
+        abort(413)
+    return idler
+
+
+def yazi_durumlarini_degistir(conn, idler, durum):
+    # N yazı tek transaction'da (tek commit, tek fsync); önbellek etiketleri tek seferde silinir
+    if not idler:
+        return 0
+    yer = ",".join("?" * len(idler))
+    yazilar = conn.execute(
+        f"SELECT id, kategori, author_id FROM yazilar WHERE id IN ({yer}) AND durum != ?", (*idler, durum)
+    ).fetchall()
+    conn.executemany("UPDATE yazilar SET durum = ? WHERE id = ?", [(durum, y["id"]) for y in yazilar])
+    conn.commit()
+    onbellegi_temizle(*{e for y in yazilar for e in yazi_etiketleri(y)})
+    return len(yazilar)
+
+
+def rolleri_degistir(conn, idler, rol):
+    # admin'lerin rolü panelden değişmez
+    if not idler:
+        return 0
+    degisen = conn.executemany("UPDATE users SET rol = ? WHERE id = ? AND rol != 'admin'", [(rol, i) for i in idler])
+    conn.commit()
+    yazar_dizini.gecersiz_kil()
+    onbellegi_temizle("yazarlar", *(f"kullanici:{i}" for i in idler))
+    return degisen.rowcount
 
 
 @app.route("/admin/onayla/<int:id>", methods=("POST",))
 def onayla(id):
     if session.get("rol") != "admin":
         return "Yetkisiz", 403
-    conn = db_baglantisi_kur() 
-    conn.execute("UPDATE yazilar SET durum=1 WHERE id=?", (id,))
-    conn.commit()
-    conn.close()
+    yazi_durumlarini_degistir(db_baglantisi_kur(), [id], 1)
+    return redirect(url_for("admin_panel"))
+
+
+@app.route("/admin/toplu/yazilar", methods=("POST",))
+def admin_toplu_yazi():
+    if session.get("rol") != "admin":
+        return "Yetkisiz", 403
+    durum = {"onayla": 1, "reddet": 2}.get(request.form.get("islem"))
+    if durum is None:
+        return "Geçersiz işlem", 400
+    yazi_durumlarini_degistir(db_baglantisi_kur(), secilen_idler(), durum)
     return redirect(url_for("admin_panel"))
 
 
 @app.route("/admin/rutbe/<int:user_id>/<rol>", methods=("POST",))
 def admin_rutbe(user_id, rol):
     if session.get("rol") != "admin":
-        return "Yetkisiz", 403 
+        return "Yetkisiz", 403
     if rol not in ["okur", "yazar"]:
         return "Geçersiz rol", 400
+    rolleri_degistir(db_baglantisi_kur(), [user_id], rol)
+    return redirect(url_for("admin_panel"))
 
-    conn = db_baglantisi_kur()
-    conn.execute("UPDATE users SET rol=? WHERE id=?", (rol, user_id))
-    conn.commit()
-    conn.close()
+
+@app.route("/admin/toplu/rutbe", methods=("POST",))
+def admin_toplu_rutbe():
+    if session.get("rol") != "admin":
+        return "Yetkisiz", 403
+    rol = request.form.get("rol")
+    if rol not in ["okur", "yazar"]:
+        return "Geçersiz rol", 400
+    rolleri_degistir(db_baglantisi_kur(), secilen_idler(), rol)
     return redirect(url_for("admin_panel"))
 
 
@@ -561,71 +2561,33 @@ def yazilarim():
         return "Yetkisiz", 403
 
     conn = db_baglantisi_kur()
-    yazilar = conn.execute("""
-        SELECT *
+    yazilar = conn.execute(f"""
+        SELECT {LISTE_SUTUNLARI}
         FROM yazilar
         WHERE author_id = ?
         ORDER BY id DESC
-    """, (session["user_id"],)).fetchall()
-    conn.close()
+    """, (session["user_id"],))
 
-    return render_template("yazilarim.html", yazilar=yazilar)
+    return sayfa_ciz("yazilarim.html", yazilar=yazilar)
 
-# --- TAMİR (DB migrate) ---
-@app.route("/tamir")
-def tamir_et():
-    conn = db_baglantisi_kur()
-    mesaj = []
 
-    # yorumlar tablosu (parent_id dahil)
-    try:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS yorumlar (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                post_id INTEGER,
-                user_id INTEGER,
-                yorum TEXT,
-                tarih TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                parent_id INTEGER
-            )
-            """
-        )
-        conn.commit()
-        mesaj.append("✅ yorumlar tablosu OK")
-    except Exception as e:
-        mesaj.append(f"❌ yorumlar: {e}")
+# --- ŞABLON ISITMA ---
+# filtreler/global'ler derleme anında aranır; bu yüzden tüm tanımlardan sonra
+def sablonlari_derle():
+    bas = time.perf_counter()
+    adlar = app.jinja_env.list_templates()
+    for ad in adlar:
+        app.jinja_env.get_template(ad)
+    return len(adlar), time.perf_counter() - bas
 
-    # parent_id yoksa ekle (eski tabloda)
-    try:
-        conn.execute("ALTER TABLE yorumlar ADD COLUMN parent_id INTEGER")
-        conn.commit()
-        mesaj.append("✅ parent_id eklendi")
-    except:
-        mesaj.append("ℹ️ parent_id zaten var")
 
-    # goruntulenme
-    try:
-        conn.execute("ALTER TABLE yazilar ADD COLUMN goruntulenme INTEGER DEFAULT 0")
-        conn.commit()
-        mesaj.append("✅ goruntulenme OK")
-    except:
-        mesaj.append("ℹ️ goruntulenme zaten var")
+@app.cli.command("sablon-derle")
+def sablon_derle():
+    """Tüm şablonları derler ve bytecode önbelleğine yazar (deploy'da worker'lar başlamadan önce)."""
+    adet, sure = sablonlari_derle()
+    yer = app.config["SABLON_ONBELLEK_YOLU"] or "önbellek kapalı"
+    print(f"✅ {adet} şablon derlendi ({sure * 1000:.0f} ms) -> {yer}")
 
-    # profil alanları
-    try:
-        conn.execute("ALTER TABLE users ADD COLUMN profil_resmi TEXT")
-        conn.commit()
-        mesaj.append("✅ profil_resmi OK")
-    except:
-        mesaj.append("ℹ️ profil_resmi zaten var")
- 
-    try:
-        conn.execute("ALTER TABLE users ADD COLUMN biyografi TEXT")
-        conn.commit()
-        mesaj.append("✅ biyografi OK")
-    except:
-        mesaj.append("ℹ️ biyografi zaten var")
 
-    conn.close()
-    return "<br>".join(mesaj) 
\ No newline at end of file
+if app.config["SABLON_ISIT"]:
+    sablonlari_derle()
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import re
+import tempfile
+
+# İçerik adresli yükleme deposu: dosya adı = içeriğin sha256'sı.
+#   ab/cd/abcdef...123.jpg
+# Aynı dosya iki kez yüklenirse diskte tek kopya kalır; iki farklı "image.jpg" artık çakışmaz.
+# Ad içerikten türediği için bir yol bir kez yazıldıktan sonra değişmez (uzun süreli önbelleklenebilir);
+# yerine başka bayt yazılmaz. Sonradan işlenecek dosya başka bir kökte bekler, sonucu yerlestir() ile girer.
+
+PARCA = 1024 * 1024
+GECICI_KLASOR = ".gecici"
+HASH_YOLU = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}")
+
+
+def _uzanti(dosya_adi):
+    uzanti = os.path.splitext(dosya_adi or "")[1].lower()
+    return uzanti if re.fullmatch(r"\.[a-z0-9]{1,8}", uzanti) else ""
+
+
+def gecici_dosya(kok):
+    # kök ile aynı dosya sisteminde: yerleştirme os.replace ile atomik
+    gecici_klasor = os.path.join(kok, GECICI_KLASOR)
+    os.makedirs(gecici_klasor, exist_ok=True)
+    return tempfile.mkstemp(dir=gecici_klasor)
+
+
+def _yerine_koy(gecici, kok, ozet, uzanti):
+    goreli = f"{ozet[:2]}/{ozet[2:4]}/{ozet}{uzanti}"
+    yol = os.path.join(kok, goreli)
+    if os.path.exists(yol):
+        os.remove(gecici)  # aynı içerik zaten depoda
+    else:
+        os.makedirs(os.path.dirname(yol), exist_ok=True)
+        os.replace(gecici, yol)
+    return goreli
+
+
+def kaydet(dosya, kok):
+    # werkzeug FileStorage'ı parça parça diske yazar, yazarken hash'ler; bellekte tamamı tutulmaz
+    fd, gecici = gecici_dosya(kok)
+    h = hashlib.sha256()
+    boyut = 0
+    try:
+        with os.fdopen(fd, "wb") as hedef:
+            while True:
+                parca = dosya.stream.read(PARCA)
+                if not parca:
+                    break
+                h.update(parca)
+                hedef.write(parca)
+                boyut += len(parca)
+
+        ozet = h.hexdigest()
+        goreli = _yerine_koy(gecici, kok, ozet, _uzanti(dosya.filename))
+    except BaseException:
+        if os.path.exists(gecici):
+            os.remove(gecici)
+        raise
+    return ozet, goreli, boyut
+
+
+def yerlestir(gecici, kok, ad):
+    # gecici_dosya() ile yazılmış, bitmiş dosyayı kendi hash'iyle depoya taşır -> (sha256, göreli yol, boyut).
+    # uzantı ad'dan alınır
+    try:
+        ozet = sha256(gecici)
+        boyut = os.path.getsize(gecici)
+        goreli = _yerine_koy(gecici, kok, ozet, _uzanti(ad))
+    except BaseException:
+        if os.path.exists(gecici):
+            os.remove(gecici)
+        raise
+    return ozet, goreli, boyut
+
+
+def sha256(yol):
+    h = hashlib.sha256()
+    with open(yol, "rb") as f:
+        for parca in iter(lambda: f.read(PARCA), b""):
+            h.update(parca)
+    return h.hexdigest()
+
+
+def tara(kok):
+    # (göreli_yol, boyut, mtime) üretir. os.scandir: stat bilgisi dizin okumasından gelir,
+    # on binlerce dosyada listdir + isfile + getsize'dan çok daha az sistem çağrısı
+    yigin = [""]
+    while yigin:
+        alt = yigin.pop()
+        try:
+            girdiler = os.scandir(os.path.join(kok, alt))
+        except FileNotFoundError:
+            continue
+        with girdiler:
+            for girdi in girdiler:
+                goreli = f"{alt}/{girdi.name}" if alt else girdi.name
+                if girdi.is_dir(follow_symlinks=False):
+                    if girdi.name != GECICI_KLASOR:
+                        yigin.append(goreli)
+                elif girdi.is_file() and not girdi.name.endswith(".tmp"):
+                    bilgi = girdi.stat()
+                    yield goreli, bilgi.st_size, bilgi.st_mtime
+
+
+def degismez_mi(goreli_yol):
+    # içerik adresli yol mu (eski, isimle kaydedilmiş yüklemeler değil)
+    return bool(HASH_YOLU.match(goreli_yol))
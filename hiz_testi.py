@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from veri_uret import AGIRLIKLAR, KATEGORILER, SOZLUK, ornek_icerik
+
+
+def ornek_veritabani(uygulama, yol, yazi_sayisi=200):
+    # şemayı uygulamanın göçleri kurar; FTS tetikleyicileri de bu bağlantıyla çalışır
+    uygulama.DB_PATH = yol
+    with uygulama.app.app_context():
+        conn = uygulama.db_baglantisi_kur()
+        _ornek_satirlar(uygulama, conn, yazi_sayisi)
+
+
+def _ornek_satirlar(uygulama, conn, yazi_sayisi):
+    conn.execute(
+        "INSERT INTO users (ad_soyad, email, sifre, rol) VALUES ('Test Yazar', 'test@prometheon.com', '-', 'yazar')"
+    )
+    rnd = random.Random(42)
+
+    def satirlar():
+        for i in range(yazi_sayisi):
+            icerik = ornek_icerik(rnd)
+            baslik = f"Yazı {i}: " + " ".join(rnd.choices(SOZLUK, weights=AGIRLIKLAR, k=4))
+            yield (baslik, icerik, rnd.choice(KATEGORILER), *uygulama.ozet_hesapla(icerik))
+
+    conn.executemany(
+        "INSERT INTO yazilar (author_id, baslik, icerik, kategori, durum, ozet, kelime_sayisi, metin) "
+        "VALUES (1, ?, ?, ?, 1, ?, ?, ?)",
+        satirlar(),
+    )
+    conn.commit()
+
+
+def havuzu_bosalt(uygulama):
+    # havuzdaki bağlantılar eski DB_PATH'e açık kalmasın; son kapanan WAL'ı da diske işler
+    while not uygulama._db_havuzu.empty():
+        uygulama._db_havuzu.get_nowait().close()
+
+
+def olc(app, yollar, istek_sayisi, thread_sayisi):
+    def calistir(yol):
+        istemci = app.test_client()
+        cevap = istemci.get(yol)
+        assert cevap.status_code == 200, (yol, cevap.status_code)
+
+    sonuc = {}
+    with ThreadPoolExecutor(max_workers=thread_sayisi) as havuz:
+        for yol in yollar:
+            list(havuz.map(calistir, [yol] * 10))  # ısınma
+            bas = time.perf_counter()
+            list(havuz.map(calistir, [yol] * istek_sayisi))
+            sonuc[yol] = istek_sayisi / (time.perf_counter() - bas)
+    return sonuc
+
+
+def arama_karsilastir(uygulama, gecici, yazi_sayisi, tekrar):
+    # eski LIKE taraması ile FTS5 sorgusunu aynı korpusta karşılaştırır
+    yol = os.path.join(gecici, "arama.db")
+    print(f"{yazi_sayisi} yazılık korpus hazırlanıyor...")
+    ornek_veritabani(uygulama, yol, yazi_sayisi)
+
+    # sık, orta, seyrek geçen kelimeler + ı/i katlaması + hiç geçmeyen
+    terimler = [SOZLUK[3], SOZLUK[150], SOZLUK[2000], SOZLUK[15000], "isik", "yokboylebirkelime"]
+    boyut = uygulama.app.config["SAYFA_BOYUTU"]
+
+    with uygulama.app.app_context():
+        conn = uygulama.db_baglantisi_kur()
+        bas = time.perf_counter()
+        uygulama.arama_indeksi_kur(conn)
+        conn.commit()
+        print(f"indeks kurulumu: {time.perf_counter() - bas:.1f} sn\n")
+
+        print(f"{'terim':<20}{'LIKE (ms)':>12}{'FTS5 (ms)':>12}{'sonuç':>8}")
+        for terim in terimler:
+            bas = time.perf_counter()
+            for _ in range(tekrar):
+                conn.execute(
+                    "SELECT id FROM yazilar WHERE durum = 1 AND (baslik LIKE ? OR icerik LIKE ?) "
+                    "ORDER BY id DESC LIMIT ?",
+                    (f"%{terim}%", f"%{terim}%", boyut),
+                ).fetchall()
+            like_ms = (time.perf_counter() - bas) * 1000 / tekrar
+
+            sorgu = uygulama.fts_sorgusu(terim)
+            bas = time.perf_counter()
+            for _ in range(tekrar):
+                toplam = conn.execute(
+                    "SELECT count(*) FROM yazilar_fts JOIN yazilar ON yazilar.id = yazilar_fts.rowid "
+                    "WHERE yazilar_fts MATCH ? AND yazilar.durum = 1",
+                    (sorgu,),
+                ).fetchone()[0]
+                conn.execute(
+                    "SELECT yazilar.id, snippet(yazilar_fts, 1, '[', ']', '…', 24) FROM yazilar_fts "
+                    "JOIN yazilar ON yazilar.id = yazilar_fts.rowid "
+                    "WHERE yazilar_fts MATCH ? AND yazilar.durum = 1 "
+                    "ORDER BY bm25(yazilar_fts, 10.0, 1.0) LIMIT ?",
+                    (sorgu, boyut),
+                ).fetchall()
+            fts_ms = (time.perf_counter() - bas) * 1000 / tekrar
+            print(f"{terim:<20}{like_ms:>12.1f}{fts_ms:>12.1f}{toplam:>8}")
+
+
+# taze bir Python sürecinde: app import süresi + her yolun ilk isteği (ms), JSON olarak
+ACILIS_KODU = """
+import json, sys, time
+bas = time.perf_counter()
+import app
+sonuc = {"import": (time.perf_counter() - bas) * 1000}
+istemci = app.app.test_client()
+for yol in sys.argv[1:]:
+    bas = time.perf_counter()
+    assert istemci.get(yol).status_code == 200, yol
+    sonuc[yol] = (time.perf_counter() - bas) * 1000
+print(json.dumps(sonuc))
+"""
+
+
+def acilis_karsilastir(uygulama, gecici, tekrar):
+    # her ölçüm yeni bir süreçte: deploy/autoscale sonrası soğuk worker'ın gördüğü gecikme
+    db = os.path.join(gecici, "acilis.db")
+    ornek_veritabani(uygulama, db, 50)
+    havuzu_bosalt(uygulama)
+    yollar = ["/", "/1", "/yazarlar"]
+    bytecode = os.path.join(gecici, "sablonlar")
+
+    modlar = {
+        "eski (derleme ilk istekte)": {"PROMETHEON_SABLON_ONBELLEK": "", "PROMETHEON_SABLON_ISIT": "0"},
+        "ısıtma, boş bytecode": {"PROMETHEON_SABLON_ONBELLEK": bytecode, "PROMETHEON_SABLON_ISIT": "1"},
+        "ısıtma + bytecode": {"PROMETHEON_SABLON_ONBELLEK": bytecode, "PROMETHEON_SABLON_ISIT": "1"},
+    }
+    sonuclar = {}
+    for ad, ortam in modlar.items():
+        olcumler = []
+        for _ in range(tekrar):
+            if ad == "ısıtma, boş bytecode":
+                shutil.rmtree(bytecode, ignore_errors=True)
+            cikti = subprocess.run(
+                [sys.executable, "-c", ACILIS_KODU, *yollar],
+                env={**os.environ, **ortam, "PROMETHEON_DB": db},
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                capture_output=True, text=True, check=True,
+            ).stdout
+            olcumler.append(json.loads(cikti.strip().splitlines()[-1]))
+        sonuclar[ad] = {k: statistics.median(o[k] for o in olcumler) for k in olcumler[0]}
+
+    basliklar = ["import", *yollar]
+    print(f"{'mod':<30}" + "".join(f"{b:>12}" for b in basliklar) + f"{'toplam':>12}")
+    for ad, olcum in sonuclar.items():
+        print(f"{ad:<30}" + "".join(f"{olcum[b]:>12.1f}" for b in basliklar) + f"{sum(olcum.values()):>12.1f}")
+    print("(ms, medyan; her satır yeni bir süreç)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prometheon istek/sn ölçümü (eski vs yeni bağlantı katmanı)")
+    parser.add_argument("--istek", type=int, default=500)
+    parser.add_argument("--thread", type=int, default=8)
+    parser.add_argument("--yazi", type=int, default=200)
+    parser.add_argument("--arama", action="store_true", help="LIKE ile FTS5 aramayı karşılaştır")
+    parser.add_argument("--arama-yazi", type=int, default=100_000)
+    parser.add_argument("--tekrar", type=int, default=5)
+    parser.add_argument("--acilis", action="store_true", help="soğuk worker açılışı ve ilk istek gecikmesi")
+    args = parser.parse_args()
+
+    import app as uygulama
+
+    if args.acilis:
+        gecici = tempfile.mkdtemp(prefix="prometheon_bench_")
+        try:
+            acilis_karsilastir(uygulama, gecici, args.tekrar)
+        finally:
+            shutil.rmtree(gecici, ignore_errors=True)
+        return
+
+    if args.arama:
+        gecici = tempfile.mkdtemp(prefix="prometheon_bench_")
+        try:
+            arama_karsilastir(uygulama, gecici, args.arama_yazi, args.tekrar)
+        finally:
+            shutil.rmtree(gecici, ignore_errors=True)
+        return
+
+    gecici = tempfile.mkdtemp(prefix="prometheon_bench_")
+    kaynak = os.path.join(gecici, "kaynak.db")
+    ornek_veritabani(uygulama, kaynak, args.yazi)
+    havuzu_bosalt(uygulama)
+    yollar = ["/", "/1"]
+
+    modlar = {
+        # eski davranış: her istekte connect/close, rollback journal
+        "once": {"DB_HAVUZ_BOYUTU": 0, "DB_PRAGMALAR": False},
+        # yeni: havuz + WAL pragmaları
+        "sonra": {"DB_HAVUZ_BOYUTU": 8, "DB_PRAGMALAR": True},
+    }
+
+    try:
+        sonuclar = {}
+        for ad, ayarlar in modlar.items():
+            yol = os.path.join(gecici, f"{ad}.db")
+            shutil.copy(kaynak, yol)
+            if not ayarlar["DB_PRAGMALAR"]:
+                sqlite3.connect(yol).execute("PRAGMA journal_mode=DELETE").connection.close()
+            uygulama.DB_PATH = yol
+            uygulama.app.config.update(ayarlar)
+            havuzu_bosalt(uygulama)
+            sonuclar[ad] = olc(uygulama.app, yollar, args.istek, args.thread)
+
+        print(f"{'yol':<8}{'önce (istek/sn)':>18}{'sonra (istek/sn)':>18}{'fark':>8}")
+        for yol in yollar:
+            once, sonra = sonuclar["once"][yol], sonuclar["sonra"][yol]
+            print(f"{yol:<8}{once:>18.1f}{sonra:>18.1f}{sonra / once:>7.2f}x")
+    finally:
+        shutil.rmtree(gecici, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
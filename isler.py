@@ -0,0 +1,204 @@
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import traceback
+from contextlib import nullcontext
+
+log = logging.getLogger(__name__)
+
+# SQLite üzerinde kalıcı iş kuyruğu: isteğin yapmasına gerek olmayan yavaş işler (resim küçültme,
+# görüntülenme yazımı) buraya eklenir, işçiler sırayla çalıştırır.
+#   kuyruk.ekle(conn, "resim", {...})  -> isteğin transaction'ına girer; commit olmazsa iş de yok
+#   @kuyruk.gorev("resim")             -> işi yapan fonksiyon, veri sözlüğünü keyword olarak alır
+#   kuyruk.baslat(2)                   -> süreç içinde işçi thread'leri; ya da `flask is-iscisi`
+#   kuyruk.baslat(2, turler={"resim"}) -> bu işçiler sadece bu türleri alır (ağır işler ayrı süreçte kalsın)
+# Hata veren iş bekleme_sn * 2^(deneme-1) sonra tekrar denenir; azami_deneme'den sonra "hata"da kalır.
+# Çalışırken ölen sürecin işi zaman_asimi_sn sonra tekrar kuyruğa döner (en az bir kez çalışma).
+# Tekrar çalışması zararlı olan görev kuyruk.tamamla(conn) ile işi kendi yazılarıyla aynı transaction'da
+# bitirir; False dönerse iş zaman aşımıyla başka işçiye geçmiş ya da bitmiştir, yazılar geri alınmalı.
+# Tablo şeması SEMA; app.py göç 10 ile kurar.
+
+BEKLIYOR, CALISIYOR, BITTI, HATA = "bekliyor", "calisiyor", "bitti", "hata"
+
+SEMA = [
+    "CREATE TABLE IF NOT EXISTS isler ("
+    " id INTEGER PRIMARY KEY, tur TEXT NOT NULL, veri TEXT NOT NULL DEFAULT '{}',"
+    " durum TEXT NOT NULL, deneme INTEGER NOT NULL DEFAULT 0,"
+    " zaman REAL NOT NULL, eklenme REAL NOT NULL, baslama REAL, bitis REAL, hata TEXT)",
+    # işçiler vadesi gelen en eski işi bununla alır
+    "CREATE INDEX IF NOT EXISTS idx_isler_sira ON isler (durum, zaman)",
+]
+
+_AL_SQL = f"""
+    UPDATE isler SET durum = '{CALISIYOR}', deneme = deneme + 1, baslama = :simdi
+    WHERE id = (
+        SELECT id FROM isler WHERE durum = '{BEKLIYOR}' AND zaman <= :simdi
+            AND (:turler IS NULL OR tur IN (SELECT value FROM json_each(:turler)))
+        ORDER BY zaman LIMIT 1
+    )
+    RETURNING id, tur, veri, deneme, zaman
+"""
+
+
+class IsKuyrugu:
+    def __init__(self, baglan, baglam=None, azami_deneme=5, bekleme_sn=2, zaman_asimi_sn=600,
+                 yoklama_sn=0.5, saklama_sn=24 * 3600):
+        # baglan: işçi başına yeni sqlite bağlantısı; baglam: her işin etrafında açılacak bağlam (app_context)
+        self.baglan = baglan
+        self.baglam = baglam or nullcontext
+        self.azami_deneme = azami_deneme
+        self.bekleme_sn = bekleme_sn
+        self.zaman_asimi_sn = zaman_asimi_sn
+        self.yoklama_sn = yoklama_sn
+        self.saklama_sn = saklama_sn
+        self.gorevler = {}
+        self._uyandir = threading.Event()
+        self._dur = threading.Event()
+        self._threadler = []
+        self._kilit = threading.Lock()
+        # işçi thread'inin şu an çalıştırdığı iş (id, deneme); tamamla() için
+        self._yerel = threading.local()
+        # bu süreçte işlenenler; /metrics için (tür -> sayaçlar)
+        self.sayaclar = {}
+
+    def gorev(self, ad):
+        def kaydet(fonksiyon):
+            self.gorevler[ad] = fonksiyon
+            return fonksiyon
+        return kaydet
+
+    def ekle(self, conn, tur, veri=None, gecikme=0):
+        if tur not in self.gorevler:
+            raise ValueError(f"bilinmeyen iş türü: {tur}")
+        simdi = time.time()
+        conn.execute(
+            "INSERT INTO isler (tur, veri, durum, zaman, eklenme) VALUES (?, ?, ?, ?, ?)",
+            (tur, json.dumps(veri or {}), BEKLIYOR, simdi + gecikme, simdi),
+        )
+        self._uyandir.set()
+
+    def tamamla(self, conn):
+        # görevin içinden: işi conn'un açık transaction'ında bitti işaretler (commit görevde).
+        # işin bu denemesi hâlâ çalışıyorsa True; zaman aşımıyla geri alınmış/bitmişse False
+        is_ = getattr(self._yerel, "is_", None)
+        if is_ is None:
+            return True
+        return conn.execute(
+            "UPDATE isler SET durum = ?, bitis = ?, hata = NULL WHERE id = ? AND durum = ? AND deneme = ?",
+            (BITTI, time.time(), is_[0], CALISIYOR, is_[1]),
+        ).rowcount == 1
+
+    # --- işçi tarafı ---
+    def al(self, conn, turler=None):
+        # turler: sadece bu türlerden (None = hepsi)
+        turler = None if turler is None else json.dumps(sorted(turler))
+        satir = conn.execute(_AL_SQL, {"simdi": time.time(), "turler": turler}).fetchone()
+        conn.commit()
+        return satir
+
+    def calistir(self, conn, is_):
+        is_id, tur, veri, deneme, zaman = is_
+        baslama = time.time()
+        self._yerel.is_ = (is_id, deneme)
+        try:
+            with self.baglam():
+                self.gorevler[tur](**json.loads(veri))
+        except Exception as hata:
+            son = deneme >= self.azami_deneme or tur not in self.gorevler
+            if son:
+                log.exception("iş kalıcı olarak başarısız: #%s %s", is_id, tur)
+            else:
+                log.warning("iş başarısız, tekrar denenecek: #%s %s (%s)", is_id, tur, hata)
+            # üstel geri çekilme + biraz rastgelelik (aynı anda düşen işler aynı anda dönmesin)
+            sonraki = baslama + self.bekleme_sn * 2 ** (deneme - 1) * random.uniform(1, 1.25)
+            conn.execute(
+                "UPDATE isler SET durum = ?, zaman = ?, bitis = ?, hata = ? WHERE id = ? AND durum = ? AND deneme = ?",
+                (HATA if son else BEKLIYOR, sonraki, time.time(),
+                 "".join(traceback.format_exception_only(type(hata), hata)).strip(), is_id, CALISIYOR, deneme),
+            )
+            conn.commit()
+            self._say(tur, "hata" if son else "tekrar", baslama - zaman, time.time() - baslama)
+            return False
+        finally:
+            self._yerel.is_ = None
+        # görev tamamla() ile bitirdiyse ya da iş zaman aşımıyla başka denemeye geçtiyse dokunulmaz
+        conn.execute(
+            "UPDATE isler SET durum = ?, bitis = ?, hata = NULL WHERE id = ? AND durum = ? AND deneme = ?",
+            (BITTI, time.time(), is_id, CALISIYOR, deneme),
+        )
+        conn.commit()
+        self._say(tur, "tamam", baslama - zaman, time.time() - baslama)
+        return True
+
+    def _say(self, tur, sonuc, bekleme, sure):
+        with self._kilit:
+            s = self.sayaclar.setdefault(tur, {"tamam": 0, "tekrar": 0, "hata": 0, "bekleme": 0.0, "sure": 0.0})
+            s[sonuc] += 1
+            s["bekleme"] += max(bekleme, 0.0)
+            s["sure"] += sure
+
+    def bakim(self, conn):
+        # çalışırken süreci ölen işleri geri al, eski bitmiş kayıtları sil
+        simdi = time.time()
+        conn.execute(
+            "UPDATE isler SET durum = ?, zaman = ? WHERE durum = ? AND baslama < ?",
+            (BEKLIYOR, simdi, CALISIYOR, simdi - self.zaman_asimi_sn),
+        )
+        conn.execute("DELETE FROM isler WHERE durum = ? AND bitis < ?", (BITTI, simdi - self.saklama_sn))
+        conn.commit()
+
+    def bosalt(self, conn=None, turler=None):
+        # vadesi gelmiş işleri bitene kadar çalıştırır (CLI --bir-kez ve testler için)
+        conn = conn or self.baglan()
+        adet = 0
+        while (is_ := self.al(conn, turler)) is not None:
+            self.calistir(conn, is_)
+            adet += 1
+        return adet
+
+    def dongu(self, turler=None):
+        conn = self.baglan()
+        son_bakim = 0.0
+        while not self._dur.is_set():
+            try:
+                if time.monotonic() - son_bakim > 60:
+                    self.bakim(conn)
+                    son_bakim = time.monotonic()
+                is_ = self.al(conn, turler)
+                if is_ is not None:
+                    self.calistir(conn, is_)
+                    continue
+            except sqlite3.OperationalError:
+                # veritabanı kilitli vb.: biraz bekleyip tekrar (yarım kalan iş zaman aşımında geri döner)
+                log.warning("iş kuyruğu yazılamadı", exc_info=True)
+                conn.rollback()
+            self._uyandir.wait(self.yoklama_sn)
+            self._uyandir.clear()
+        conn.close()
+
+    def baslat(self, adet, turler=None):
+        if self._threadler:
+            return
+        with self._kilit:
+            if self._threadler:
+                return
+            for i in range(adet):
+                t = threading.Thread(target=self.dongu, args=(turler,), name=f"is-iscisi-{i}", daemon=True)
+                t.start()
+                self._threadler.append(t)
+
+    def durdur(self, bekle=5):
+        self._dur.set()
+        self._uyandir.set()
+        for t in self._threadler:
+            t.join(bekle)
+
+    def durum(self, conn):
+        # bitmemiş işlerin tür/durum başına sayısı ve en eski vadesi (tüm süreçler, tablodan)
+        return conn.execute(
+            "SELECT tur, durum, count(*), min(zaman) FROM isler WHERE durum IN (?, ?, ?) GROUP BY tur, durum",
+            (BEKLIYOR, CALISIYOR, HATA),
+        ).fetchall()
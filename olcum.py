@@ -0,0 +1,120 @@
+import bisect
+import logging
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# İstek/SQL ölçümü için küçük yardımcılar; Prometheus metin biçiminde yazılır (/metrics).
+#   OlculenBaglanti: sqlite3.connect(..., factory=OlculenBaglanti); execute süreleri bağlantıda birikir,
+#                    eşiği aşan sorgu loglanır. İstek başında sifirla(), sonunda adet/sure okunur.
+#   Histogram / Sayac: etiket demeti başına değerler (süreç başına; gunicorn'da her worker kendi sayar)
+
+# saniye; anasayfa önbellekten ~1 ms, soğuk detay ~10-50 ms
+SURE_KOVALARI = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class OlculenBaglanti(sqlite3.Connection):
+    yavas_esik = 0.1  # sn; bağlantı başına değiştirilebilir
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sifirla()
+
+    def sifirla(self):
+        self.adet = 0
+        self.sure = 0.0
+
+    def _say(self, sql, gecen):
+        self.adet += 1
+        self.sure += gecen
+        if gecen >= self.yavas_esik:
+            log.warning("yavaş sorgu (%.1f ms): %s", gecen * 1000, " ".join(sql.split())[:300])
+
+    # not: dönen cursor'dan sonradan çekilen satırlar (fetchall) execute süresine dahil değil
+    def execute(self, sql, parametreler=()):
+        bas = time.perf_counter()
+        try:
+            return super().execute(sql, parametreler)
+        finally:
+            self._say(sql, time.perf_counter() - bas)
+
+    def executemany(self, sql, parametreler):
+        bas = time.perf_counter()
+        try:
+            return super().executemany(sql, parametreler)
+        finally:
+            self._say(sql, time.perf_counter() - bas)
+
+    def commit(self):
+        # WAL'da commit disk senkronu bekleyebilir; süreye eklenir, sorgu sayılmaz
+        bas = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            self.sure += time.perf_counter() - bas
+
+
+def _etiket_metni(adlar, degerler, ek=""):
+    parcalar = [f'{ad}="{deger}"' for ad, deger in zip(adlar, degerler)]
+    if ek:
+        parcalar.append(ek)
+    return "{" + ",".join(parcalar) + "}" if parcalar else ""
+
+
+def aile_satirlari(ad, yardim, tur, etiketler, degerler):
+    # bir metrik ailesi: HELP/TYPE ve tüm örnekler art arda (metin biçimi aileyi bölmeye izin vermez).
+    # degerler: [(etiket demeti, değer)]; anlık hesaplanan değerler (tablodan sayım vb.) doğrudan verilir
+    yield f"# HELP {ad} {yardim}"
+    yield f"# TYPE {ad} {tur}"
+    for etiket_degerleri, deger in degerler:
+        deger = deger if isinstance(deger, int) else f"{deger:.6f}"
+        yield f"{ad}{_etiket_metni(etiketler, etiket_degerleri)} {deger}"
+
+
+class Sayac:
+    def __init__(self, ad, yardim, etiketler=()):
+        self.ad, self.yardim, self.etiketler = ad, yardim, etiketler
+        self._degerler = {}
+        self._kilit = threading.Lock()
+
+    def ekle(self, etiket_degerleri, miktar=1):
+        with self._kilit:
+            self._degerler[etiket_degerleri] = self._degerler.get(etiket_degerleri, 0) + miktar
+
+    def satirlar(self):
+        with self._kilit:
+            degerler = sorted(self._degerler.items())
+        return aile_satirlari(self.ad, self.yardim, "counter", self.etiketler, degerler)
+
+
+class Histogram:
+    def __init__(self, ad, yardim, etiketler=(), kovalar=SURE_KOVALARI):
+        self.ad, self.yardim, self.etiketler, self.kovalar = ad, yardim, etiketler, kovalar
+        self._degerler = {}  # etiket demeti -> [kova sayıları (+Inf dahil), toplam]
+        self._kilit = threading.Lock()
+
+    def gozlemle(self, etiket_degerleri, deger):
+        kova = bisect.bisect_left(self.kovalar, deger)
+        with self._kilit:
+            kayit = self._degerler.get(etiket_degerleri)
+            if kayit is None:
+                kayit = self._degerler[etiket_degerleri] = [[0] * (len(self.kovalar) + 1), 0.0]
+            kayit[0][kova] += 1
+            kayit[1] += deger
+
+    def satirlar(self):
+        yield f"# HELP {self.ad} {self.yardim}"
+        yield f"# TYPE {self.ad} histogram"
+        with self._kilit:
+            degerler = sorted((k, (list(v[0]), v[1])) for k, v in self._degerler.items())
+        for etiket_degerleri, (sayilar, toplam) in degerler:
+            birikimli = 0
+            for sinir, sayi in zip((*(f"{k:g}" for k in self.kovalar), "+Inf"), sayilar):
+                birikimli += sayi
+                le = f'le="{sinir}"'
+                yield f"{self.ad}_bucket{_etiket_metni(self.etiketler, etiket_degerleri, le)} {birikimli}"
+            etiket = _etiket_metni(self.etiketler, etiket_degerleri)
+            yield f"{self.ad}_sum{etiket} {toplam:.6f}"
+            yield f"{self.ad}_count{etiket} {birikimli}"
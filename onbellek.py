@@ -0,0 +1,145 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+# Önbellek arka uçları. İkisi de aynı arayüzü sunar:
+#   al(anahtar) -> değer ya da None
+#   koy(anahtar, deger, ttl, etiketler=())
+#   etiketleri_sil(etiketler)   -> o etiketlerle konmuş tüm kayıtları düşürür
+#   temizle(), len()
+# etiketler yazma yollarından hassas silme içindir ("yazi:12", "kullanici:3" gibi).
+
+
+class BellekOnbellek:
+    # süreç içi, boyutu sınırlı LRU + TTL. gunicorn'da her worker'ın kendi kopyası olur.
+    def __init__(self, boyut=512):
+        self.boyut = boyut
+        self._kayitlar = OrderedDict()  # anahtar -> (bitis, deger, etiketler)
+        self._etiketler = {}  # etiket -> {anahtar}
+        self._kilit = threading.Lock()
+        self.isabet = 0
+        self.iska = 0
+
+    def al(self, anahtar):
+        with self._kilit:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is None or kayit[0] < time.monotonic():
+                if kayit is not None:
+                    self._cikar(anahtar)
+                self.iska += 1
+                return None
+            self._kayitlar.move_to_end(anahtar)
+            self.isabet += 1
+            return kayit[1]
+
+    def koy(self, anahtar, deger, ttl, etiketler=()):
+        with self._kilit:
+            if anahtar in self._kayitlar:
+                self._cikar(anahtar)
+            self._kayitlar[anahtar] = (time.monotonic() + ttl, deger, tuple(etiketler))
+            for etiket in etiketler:
+                self._etiketler.setdefault(etiket, set()).add(anahtar)
+            while len(self._kayitlar) > self.boyut:
+                self._cikar(next(iter(self._kayitlar)))
+
+    def etiketleri_sil(self, etiketler):
+        with self._kilit:
+            for etiket in etiketler:
+                for anahtar in list(self._etiketler.get(etiket, ())):
+                    self._cikar(anahtar)
+
+    def temizle(self):
+        with self._kilit:
+            self._kayitlar.clear()
+            self._etiketler.clear()
+
+    def __len__(self):
+        return len(self._kayitlar)
+
+    def _cikar(self, anahtar):
+        _, _, etiketler = self._kayitlar.pop(anahtar)
+        for etiket in etiketler:
+            anahtarlar = self._etiketler.get(etiket)
+            if anahtarlar is not None:
+                anahtarlar.discard(anahtar)
+                if not anahtarlar:
+                    del self._etiketler[etiket]
+
+
+class DiskOnbellek:
+    # ayrı bir SQLite dosyası; aynı makinedeki tüm gunicorn worker'ları paylaşır,
+    # bir worker'daki silme diğerlerine de yansır. Taşınca en eski kayıtlar atılır.
+    def __init__(self, yol, boyut=5000):
+        self.yol = yol
+        self.boyut = boyut
+        self._yerel = threading.local()
+        self.isabet = 0
+        self.iska = 0
+        os.makedirs(os.path.dirname(os.path.abspath(yol)), exist_ok=True)
+        conn = self._baglanti()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS kayitlar (anahtar TEXT PRIMARY KEY, deger BLOB, bitis REAL, eklenme REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_kayitlar_eklenme ON kayitlar (eklenme)")
+        conn.execute("CREATE TABLE IF NOT EXISTS etiketler (etiket TEXT, anahtar TEXT, PRIMARY KEY (etiket, anahtar))")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_etiketler_anahtar ON etiketler (anahtar)")
+        conn.commit()
+
+    def _baglanti(self):
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.yol, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")  # kaybolursa yeniden üretilir
+            self._yerel.conn = conn
+        return conn
+
+    def al(self, anahtar):
+        satir = self._baglanti().execute(
+            "SELECT deger FROM kayitlar WHERE anahtar = ? AND bitis > ?", (anahtar, time.time())
+        ).fetchone()
+        if satir is None:
+            self.iska += 1
+            return None
+        self.isabet += 1
+        return pickle.loads(satir[0])
+
+    def koy(self, anahtar, deger, ttl, etiketler=()):
+        conn = self._baglanti()
+        simdi = time.time()
+        with conn:
+            conn.execute("DELETE FROM etiketler WHERE anahtar = ?", (anahtar,))
+            conn.execute(
+                "INSERT OR REPLACE INTO kayitlar (anahtar, deger, bitis, eklenme) VALUES (?, ?, ?, ?)",
+                (anahtar, pickle.dumps(deger, pickle.HIGHEST_PROTOCOL), simdi + ttl, simdi),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO etiketler (etiket, anahtar) VALUES (?, ?)",
+                [(etiket, anahtar) for etiket in etiketler],
+            )
+            fazla = conn.execute("SELECT count(*) FROM kayitlar").fetchone()[0] - self.boyut
+            if fazla > 0:
+                eskiler = "SELECT anahtar FROM kayitlar ORDER BY eklenme LIMIT ?"
+                conn.execute(f"DELETE FROM etiketler WHERE anahtar IN ({eskiler})", (fazla,))
+                conn.execute(f"DELETE FROM kayitlar WHERE anahtar IN ({eskiler})", (fazla,))
+
+    def etiketleri_sil(self, etiketler):
+        conn = self._baglanti()
+        with conn:
+            for etiket in etiketler:
+                anahtarlar = "SELECT anahtar FROM etiketler WHERE etiket = ?"
+                conn.execute(f"DELETE FROM kayitlar WHERE anahtar IN ({anahtarlar})", (etiket,))
+                conn.execute(f"DELETE FROM etiketler WHERE anahtar IN ({anahtarlar})", (etiket,))
+
+    def temizle(self):
+        conn = self._baglanti()
+        with conn:
+            conn.execute("DELETE FROM kayitlar")
+            conn.execute("DELETE FROM etiketler")
+
+    def __len__(self):
+        return self._baglanti().execute("SELECT count(*) FROM kayitlar").fetchone()[0]
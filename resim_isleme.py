@@ -0,0 +1,116 @@
+import os
+import threading
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# yüklenen orijinal bu boyutu aşarsa küçültülür (EXIF/metadata da atılır).
+# Yükleme önce yayımlanmayan bir klasöre düşer; temizlenmiş kopya kendi hash'iyle yayımlanır (app.py)
+MAKS_BOYUT = 2560
+# kullanım yeri -> üretilecek genişlikler (srcset). avatar kare kırpılır.
+VARYANTLAR = {
+    "kart": (400, 800),
+    "kapak": (800, 1200, 1600),
+    "avatar": (120, 240),
+}
+FORMATLAR = {"webp": ("WEBP", {"quality": 80, "method": 4}), "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True})}
+ISLENEN_FORMATLAR = ("JPEG", "PNG", "WEBP")
+
+_hazirlar = set()
+
+
+def varyant_adi(dosya, tur, genislik, uzanti):
+    return f"{dosya}-{tur}-{genislik}.{uzanti}"
+
+
+def _gecici_ad(yol):
+    # aynı dosyanın iki işi (tekrar yükleme) aynı anda çalışırsa geçici adlar çakışmasın
+    return f"{yol}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+
+def _rgb(im):
+    # JPEG saydamlık taşımaz: beyaz zemine yapıştır
+    if im.mode in ("RGBA", "LA", "P"):
+        im = im.convert("RGBA")
+        zemin = Image.new("RGB", im.size, (255, 255, 255))
+        zemin.paste(im, mask=im.getchannel("A"))
+        return zemin
+    return im.convert("RGB")
+
+
+def ac(yol):
+    # işlenebilir resimse (EXIF'e göre çevrilmiş, MAKS_BOYUT'a sığdırılmış görüntü, biçim), değilse None
+    try:
+        acilan = Image.open(yol)
+    except UnidentifiedImageError:
+        return None  # resim değil (CKEditor'a pdf vb. de yüklenebiliyor)
+    with acilan:
+        bicim = acilan.format
+        if bicim not in ISLENEN_FORMATLAR:
+            return None  # gif: animasyon bozulmasın diye dokunmuyoruz
+        im = ImageOps.exif_transpose(acilan)
+        im.load()
+    im.thumbnail((MAKS_BOYUT, MAKS_BOYUT), Image.LANCZOS)
+    return im, bicim
+
+
+def temiz_kaydet(im, bicim, hedef):
+    # metadata'sız yeniden kodlanmış orijinal; yayımlanan dosya budur (yüklenen bayt değil)
+    if bicim == "JPEG":
+        _rgb(im).save(hedef, "JPEG", quality=88, optimize=True, progressive=True)
+    else:
+        im.save(hedef, bicim, **({"optimize": True} if bicim == "PNG" else {"quality": 85}))
+
+
+def varyantlari_yaz(im, hedef_klasor, dosya, turler):
+    # dosya: yayımlanmış içerik adresli yol; varyantlar da aynı alt klasör yapısında durur
+    turler = [tur for tur in turler if not hazir_mi(hedef_klasor, dosya, tur)]
+    if not turler:
+        return
+    os.makedirs(os.path.dirname(os.path.join(hedef_klasor, dosya)), exist_ok=True)
+    for tur in turler:
+        for genislik in VARYANTLAR[tur]:
+            if tur == "avatar":
+                kopya = ImageOps.fit(im, (genislik, genislik), Image.LANCZOS)
+            elif im.width > genislik:
+                kopya = im.resize((genislik, round(im.height * genislik / im.width)), Image.LANCZOS)
+            else:
+                kopya = im
+            for uzanti, (pil_bicim, ayarlar) in FORMATLAR.items():
+                hedef = os.path.join(hedef_klasor, varyant_adi(dosya, tur, genislik, uzanti))
+                cikti = kopya if pil_bicim == "WEBP" else _rgb(kopya)
+                gecici = _gecici_ad(hedef)
+                cikti.save(gecici, pil_bicim, **ayarlar)
+                os.replace(gecici, hedef)
+        _hazirlar.add((dosya, tur))
+
+
+def varyantlari_uret(kaynak_klasor, hedef_klasor, dosya, turler):
+    # yayımlanmış dosyanın eksik varyantları (tekrar yükleme, yeni kullanım yeri); dosyanın kendisine dokunmaz
+    if all(hazir_mi(hedef_klasor, dosya, tur) for tur in turler):
+        return
+    acilan = ac(os.path.join(kaynak_klasor, dosya))
+    if acilan is not None:
+        varyantlari_yaz(acilan[0], hedef_klasor, dosya, turler)
+
+
+def olcu(yol):
+    # sadece başlık okunur (piksel verisi açılmaz); EXIF'e göre dik çekimler çevrilir
+    try:
+        with Image.open(yol) as im:
+            genislik, yukseklik = im.size
+            if im.getexif().get(0x0112) in (5, 6, 7, 8):
+                genislik, yukseklik = yukseklik, genislik
+            return genislik, yukseklik
+    except (UnidentifiedImageError, OSError):
+        return None, None
+
+
+def hazir_mi(hedef_klasor, dosya, tur):
+    # son yazılan dosya en büyük jpg; o varsa tüm varyantlar hazırdır
+    if (dosya, tur) in _hazirlar:
+        return True
+    son = varyant_adi(dosya, tur, VARYANTLAR[tur][-1], "jpg")
+    if os.path.exists(os.path.join(hedef_klasor, son)):
+        _hazirlar.add((dosya, tur))
+        return True
+    return False
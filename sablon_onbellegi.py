@@ -0,0 +1,39 @@
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+# Şablon parçası önbelleği:
+#   {% cache "kart:" ~ yazi['id'], 600, "yazi:" ~ yazi['id'] %} ... {% endcache %}
+# ilk ifade anahtar, ikincisi TTL (sn, verilmezse varsayılan), kalanlar etiket.
+# Arka uç env.parca_onbellegi (onbellek.BellekOnbellek arayüzü); None ise blok her seferinde çizilir.
+# Anahtar bloğun çıktısını belirleyen her şeyi içermeli (rol, aktif sayfa vb.); etiketler silme içindir.
+
+
+class ParcaOnbellegi(Extension):
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(parca_onbellegi=None, parca_onbellegi_ttl=300)
+
+    def parse(self, parser):
+        satir = next(parser.stream).lineno
+        anahtar = parser.parse_expression()
+        ttl = nodes.Const(None)
+        etiketler = []
+        if parser.stream.skip_if("comma"):
+            ttl = parser.parse_expression()
+            while parser.stream.skip_if("comma"):
+                etiketler.append(parser.parse_expression())
+        govde = parser.parse_statements(("name:endcache",), drop_needle=True)
+        cagri = self.call_method("_parca", [anahtar, ttl, nodes.List(etiketler)])
+        return nodes.CallBlock(cagri, [], [], govde).set_lineno(satir)
+
+    def _parca(self, anahtar, ttl, etiketler, caller):
+        onbellek = self.environment.parca_onbellegi
+        if onbellek is None:
+            return caller()
+        cikti = onbellek.al(anahtar)
+        if cikti is None:
+            cikti = caller()
+            onbellek.koy(anahtar, cikti, ttl or self.environment.parca_onbellegi_ttl, etiketler)
+        return cikti
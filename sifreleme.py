@@ -0,0 +1,92 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+log = logging.getLogger(__name__)
+
+# Şifre özetleri (scrypt/pbkdf2) bilerek yavaş; istek thread'inde hesaplanırsa bir giriş dalgası
+# tüm thread'leri tutar ve okurlar bekler. Burada sınırlı bir süreç havuzunda hesaplanır:
+#   havuz.ozetle(sifre)         -> yeni özet (kayıt)
+#   havuz.dogrula(ozet, sifre)  -> (doğru mu, yeni özet ya da None)
+# Aynı anda en fazla isci özet hesaplanır, kuyruk kadarı sırada bekler; bekleme_sn içinde yer açılmazsa
+# Mesgul fırlatılır (istek "tekrar deneyin" döner). isci=0: havuz yok, istek thread'inde hesaplanır.
+# Kayıtlı özetin parametreleri yontem'den farklıysa (maliyet artırıldı) doğru girişte yeniden özetlenir.
+
+
+class Mesgul(Exception):
+    pass
+
+
+def _dogrula(ozet, sifre, yontem, parametre):
+    # havuz sürecinde çalışır; yeniden özetleme gerekiyorsa aynı işte yapılır (ikinci kez kuyruğa girmez)
+    if not check_password_hash(ozet, sifre):
+        return False, None
+    if ozet.split("$", 1)[0] != parametre:
+        return True, generate_password_hash(sifre, yontem)
+    return True, None
+
+
+class SifreHavuzu:
+    def __init__(self, isci=2, kuyruk=16, bekleme_sn=3, yontem="scrypt"):
+        self.isci = isci
+        self.bekleme_sn = bekleme_sn
+        self.yontem = yontem
+        self._yer = threading.BoundedSemaphore(isci + kuyruk) if isci else None
+        self._havuz = None
+        self._parametre = None
+        self._kilit = threading.Lock()
+
+    @property
+    def parametre(self):
+        # "scrypt" -> "scrypt:32768:8:1": werkzeug'un özetin başına yazdığı, varsayılanları açılmış hali
+        if self._parametre is None:
+            self._parametre = generate_password_hash("", self.yontem).split("$", 1)[0]
+        return self._parametre
+
+    def _havuz_al(self):
+        with self._kilit:
+            if self._havuz is None:
+                # spawn: çocuk süreçler web sürecinin thread/kilit durumunu (fork) devralmasın
+                self._havuz = ProcessPoolExecutor(self.isci, mp_context=multiprocessing.get_context("spawn"))
+            return self._havuz
+
+    def _calistir(self, fonksiyon, *argumanlar):
+        if not self.isci:
+            return fonksiyon(*argumanlar)
+        if not self._yer.acquire(timeout=self.bekleme_sn):
+            raise Mesgul()
+        havuz = None
+        try:
+            havuz = self._havuz_al()
+            gelecek = havuz.submit(fonksiyon, *argumanlar)
+        except BaseException:
+            self._yer.release()
+            raise
+        # yer iş bitince açılır: sonucu beklemekten vazgeçen olsa da havuzdaki iş sayısı sınırlı kalır
+        gelecek.add_done_callback(lambda _: self._yer.release())
+        try:
+            return gelecek.result()
+        except BrokenProcessPool:
+            # bir çocuk süreç öldü (OOM vb.); havuz bir sonraki istekte baştan kurulur
+            log.exception("şifre havuzu bozuldu, yeniden kurulacak")
+            with self._kilit:
+                if self._havuz is havuz:
+                    self._havuz = None
+            havuz.shutdown(wait=False)
+            raise Mesgul() from None
+
+    def ozetle(self, sifre):
+        return self._calistir(generate_password_hash, sifre, self.yontem)
+
+    def dogrula(self, ozet, sifre):
+        return self._calistir(_dogrula, ozet, sifre, self.yontem, self.parametre)
+
+    def kapat(self):
+        with self._kilit:
+            havuz, self._havuz = self._havuz, None
+        if havuz is not None:
+            havuz.shutdown(wait=False, cancel_futures=True)
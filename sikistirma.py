@@ -0,0 +1,68 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli yoksa sadece gzip
+    brotli = None
+
+# Dinamik yanıtlar (HTML/JSON) için gzip/brotli yardımcıları.
+#   kodlama_sec(request.accept_encodings) -> "br" / "gzip" / None
+#   sikistir(veri, kodlama)               -> tek seferde (tamponlu yanıtlar, önbelleğe girecek gövdeler)
+#   akis(parcalar, kodlama)               -> parça parça (stream edilen yanıtlar)
+# Seviyeler hız için orta düzeyde; statik dosyalar varlik_derle.py ile en yüksek seviyede önceden sıkıştırılır.
+
+KODLAMALAR = ("br", "gzip") if brotli is not None else ("gzip",)
+SEVIYELER = {"br": 5, "gzip": 6}
+SIKISTIRILABILIR = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def uygun_tur(mimetype):
+    return bool(mimetype) and mimetype.startswith(SIKISTIRILABILIR)
+
+
+def kodlama_sec(kabul, mevcut=KODLAMALAR):
+    # sunucunun tercih sırası (br önce); istemcinin q=0 dediği atlanır
+    for kodlama in mevcut:
+        if kabul[kodlama]:
+            return kodlama
+    return None
+
+
+def _gzip():
+    # wbits=31: gzip başlığı; zaman damgası 0 yazılır, aynı gövde hep aynı çıktıyı verir
+    return zlib.compressobj(SEVIYELER["gzip"], zlib.DEFLATED, 31)
+
+
+def sikistir(veri, kodlama):
+    if kodlama == "br":
+        return brotli.compress(veri, quality=SEVIYELER["br"])
+    s = _gzip()
+    return s.compress(veri) + s.flush()
+
+
+def hepsi(veri):
+    # önbelleğe konacak gövdenin tüm kodlamaları; her isabette yeniden sıkıştırılmaz
+    return {kodlama: sikistir(veri, kodlama) for kodlama in KODLAMALAR}
+
+
+def akis(parcalar, kodlama):
+    # her parça hemen flush edilir: tarayıcı sayfanın başını beklemeden alır
+    if kodlama == "br":
+        s = brotli.Compressor(quality=SEVIYELER["br"])
+        isle, bosalt, bitir = s.process, s.flush, s.finish
+    else:
+        s = _gzip()
+        isle, bosalt, bitir = s.compress, lambda: s.flush(zlib.Z_SYNC_FLUSH), s.flush
+    try:
+        for parca in parcalar:
+            if isinstance(parca, str):
+                parca = parca.encode("utf-8")
+            if parca:
+                cikti = isle(parca) + bosalt()
+                if cikti:
+                    yield cikti
+        yield bitir()
+    finally:
+        kapat = getattr(parcalar, "close", None)
+        if kapat is not None:
+            kapat()
@@ -0,0 +1,52 @@
+import itertools
+import threading
+import time
+
+# Jeton kovası ile deneme sınırı (giriş/kayıt). Her anahtar (IP, e-posta) için kapasite kadar jeton;
+# kova periyot_sn'de boştan tam dolar, yani uzun vadede periyot başına kapasite deneme.
+#   bekle = kova.dene(anahtar)   -> 0: izin (bir jeton harcandı); >0: kaç sn sonra tekrar denenebilir
+#   kova.bekleme(anahtar)        -> harcamadan bakar
+# Süreç başına bellekte tutulur; gunicorn'da her worker kendi sayar (sınır worker sayısıyla çarpılır).
+
+
+class JetonKovasi:
+    def __init__(self, kapasite, periyot_sn, en_fazla_anahtar=100_000):
+        self.kapasite = kapasite
+        self.hiz = kapasite / periyot_sn  # saniyede eklenen jeton
+        self.en_fazla_anahtar = en_fazla_anahtar
+        self._kovalar = {}  # anahtar -> (jeton, son güncelleme)
+        self._kilit = threading.Lock()
+
+    def _jeton(self, anahtar, simdi):
+        kayit = self._kovalar.get(anahtar)
+        if kayit is None:
+            return self.kapasite
+        jeton, son = kayit
+        return min(self.kapasite, jeton + (simdi - son) * self.hiz)
+
+    def bekleme(self, anahtar):
+        with self._kilit:
+            jeton = self._jeton(anahtar, time.monotonic())
+        return 0.0 if jeton >= 1 else (1 - jeton) / self.hiz
+
+    def dene(self, anahtar):
+        simdi = time.monotonic()
+        with self._kilit:
+            jeton = self._jeton(anahtar, simdi)
+            if jeton < 1:
+                return (1 - jeton) / self.hiz
+            # sona taşı: sözlük sırası = son kullanım sırası (temizlikte en eskiler önce gider)
+            self._kovalar.pop(anahtar, None)
+            self._kovalar[anahtar] = (jeton - 1, simdi)
+            if len(self._kovalar) > self.en_fazla_anahtar:
+                self._temizle(simdi)
+        return 0.0
+
+    def _temizle(self, simdi):
+        # tam dolmuş kova hiç yokmuş gibi davranır, silinebilir; yine de çoksa en eskiler gider
+        for anahtar in [a for a in self._kovalar if self._jeton(a, simdi) >= self.kapasite]:
+            del self._kovalar[anahtar]
+        fazla = len(self._kovalar) - self.en_fazla_anahtar // 2
+        if fazla > 0:
+            for anahtar in list(itertools.islice(self._kovalar, fazla)):
+                del self._kovalar[anahtar]
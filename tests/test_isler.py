@@ -0,0 +1,241 @@
+import sqlite3
+import time
+
+import pytest
+
+import isler
+
+# IsKuyrugu'nun alma/tekrar deneme/geri çekilme/zaman aşımı davranışı, geçici bir veritabanında bosalt() ile.
+
+
+@pytest.fixture
+def yol(tmp_path):
+    yol = tmp_path / "isler.db"
+    conn = sqlite3.connect(yol)
+    for sql in isler.SEMA:
+        conn.execute(sql)
+    conn.commit()
+    conn.close()
+    return yol
+
+
+@pytest.fixture
+def baglan(yol):
+    acik = []
+
+    def baglan():
+        conn = sqlite3.connect(yol)
+        acik.append(conn)
+        return conn
+
+    yield baglan
+    for conn in acik:
+        conn.close()
+
+
+@pytest.fixture
+def kuyruk(baglan):
+    # bekleme_sn=0: başarısız iş hemen tekrar vadesine girer, bosalt() deneme hakkı bitene kadar döner
+    return isler.IsKuyrugu(baglan, azami_deneme=3, bekleme_sn=0, zaman_asimi_sn=60)
+
+
+def _isler(conn):
+    return conn.execute("SELECT tur, durum, deneme, hata FROM isler ORDER BY id").fetchall()
+
+
+def test_basarili_is_bir_kez_calisir(kuyruk, baglan):
+    cagrilar = []
+    kuyruk.gorev("topla")(lambda a, b: cagrilar.append(a + b))
+    conn = baglan()
+    kuyruk.ekle(conn, "topla", {"a": 1, "b": 2})
+    conn.commit()
+
+    assert kuyruk.bosalt() == 1
+    assert cagrilar == [3]
+    assert _isler(conn) == [("topla", isler.BITTI, 1, None)]
+    assert kuyruk.bosalt() == 0
+
+
+def test_commit_edilmeyen_is_kaybolur(kuyruk, baglan):
+    # iş isteğin transaction'ına girer: istek geri alınırsa iş de yok
+    kuyruk.gorev("yan_etki")(lambda: None)
+    conn = baglan()
+    kuyruk.ekle(conn, "yan_etki")
+    conn.rollback()
+
+    assert kuyruk.bosalt() == 0
+    assert _isler(conn) == []
+
+
+def test_bilinmeyen_tur_eklenemez(kuyruk, baglan):
+    with pytest.raises(ValueError):
+        kuyruk.ekle(baglan(), "yok")
+
+
+def test_alma_vadesi_gelmemisi_atlar_ve_en_eskiyi_verir(kuyruk, baglan):
+    kuyruk.gorev("is")(lambda n: None)
+    conn = baglan()
+    kuyruk.ekle(conn, "is", {"n": "gelecek"}, gecikme=3600)
+    kuyruk.ekle(conn, "is", {"n": "ilk"})
+    kuyruk.ekle(conn, "is", {"n": "ikinci"})
+    conn.commit()
+
+    birinci = kuyruk.al(baglan())
+    ikinci = kuyruk.al(baglan())
+    assert '"ilk"' in birinci[2] and '"ikinci"' in ikinci[2]
+    # alınan iş çalışıyor işaretlenir, ikinci işçi aynı işi alamaz; gelecekteki iş vadesini bekler
+    assert kuyruk.al(baglan()) is None
+    durumlar = conn.execute("SELECT durum, deneme FROM isler ORDER BY id").fetchall()
+    assert durumlar == [(isler.BEKLIYOR, 0), (isler.CALISIYOR, 1), (isler.CALISIYOR, 1)]
+
+
+def test_tur_listesi_disindaki_isler_alinmaz(kuyruk, baglan):
+    # web süreçlerinin işçileri ağır türleri almaz; onları türsüz çalışan ayrı süreç alır
+    calisan = []
+    kuyruk.gorev("hafif")(lambda: calisan.append("hafif"))
+    kuyruk.gorev("agir")(lambda: calisan.append("agir"))
+    conn = baglan()
+    kuyruk.ekle(conn, "agir")
+    kuyruk.ekle(conn, "hafif")
+    conn.commit()
+
+    assert kuyruk.bosalt(turler={"hafif"}) == 1
+    assert calisan == ["hafif"]
+    assert _isler(conn)[0][:2] == ("agir", isler.BEKLIYOR)
+    assert kuyruk.bosalt() == 1
+    assert calisan == ["hafif", "agir"]
+
+
+def test_hata_veren_is_geri_cekilerek_tekrar_denenir(baglan):
+    kuyruk = isler.IsKuyrugu(baglan, azami_deneme=3, bekleme_sn=10)
+    kuyruk.gorev("kirik")(lambda: 1 / 0)
+    conn = baglan()
+    kuyruk.ekle(conn, "kirik")
+    conn.commit()
+
+    once = time.time()
+    assert kuyruk.bosalt() == 1  # sonraki deneme vadesi gelecekte
+    durum, deneme, zaman, hata = conn.execute("SELECT durum, deneme, zaman, hata FROM isler").fetchone()
+    assert (durum, deneme) == (isler.BEKLIYOR, 1)
+    assert once + 10 <= zaman <= time.time() + 10 * 1.25
+    assert "ZeroDivisionError" in hata
+
+    # ikinci hata: bekleme ikiye katlanır
+    conn.execute("UPDATE isler SET zaman = 0")
+    conn.commit()
+    once = time.time()
+    kuyruk.bosalt()
+    zaman = conn.execute("SELECT zaman FROM isler").fetchone()[0]
+    assert once + 20 <= zaman <= time.time() + 20 * 1.25
+    assert kuyruk.sayaclar["kirik"]["tekrar"] == 2
+
+
+def test_deneme_hakki_bitince_hata_da_kalir(kuyruk, baglan):
+    denemeler = []
+    kuyruk.gorev("kirik")(lambda: denemeler.append(1) or 1 / 0)
+    conn = baglan()
+    kuyruk.ekle(conn, "kirik")
+    conn.commit()
+
+    assert kuyruk.bosalt() == 3
+    assert len(denemeler) == 3
+    assert _isler(conn) == [("kirik", isler.HATA, 3, "ZeroDivisionError: division by zero")]
+    assert kuyruk.sayaclar["kirik"]["hata"] == 1
+    # kalıcı hatadaki iş bir daha alınmaz
+    assert kuyruk.bosalt() == 0
+
+
+def test_kaydi_olmayan_tur_hemen_hataya_duser(kuyruk, baglan):
+    # başka sürümün eklediği, bu süreçte görevi olmayan iş tekrar tekrar denenmez
+    conn = baglan()
+    conn.execute(
+        "INSERT INTO isler (tur, veri, durum, zaman, eklenme) VALUES ('eski_tur', '{}', ?, 0, 0)", (isler.BEKLIYOR,)
+    )
+    conn.commit()
+
+    assert kuyruk.bosalt() == 1
+    assert _isler(conn)[0][:3] == ("eski_tur", isler.HATA, 1)
+
+
+def test_bakim_zaman_asimindaki_isi_geri_alir(kuyruk, baglan):
+    calisan = []
+    kuyruk.gorev("uzun")(lambda: calisan.append(1))
+    conn = baglan()
+    kuyruk.ekle(conn, "uzun")
+    conn.commit()
+
+    # işçi işi aldı ve öldü: iş "calisiyor"da kaldı
+    assert kuyruk.al(baglan()) is not None
+    kuyruk.bakim(conn)
+    assert kuyruk.bosalt() == 0  # zaman aşımı dolmadı, dokunulmaz
+
+    conn.execute("UPDATE isler SET baslama = baslama - 61")
+    conn.commit()
+    kuyruk.bakim(conn)
+    assert _isler(conn) == [("uzun", isler.BEKLIYOR, 1, None)]
+    assert kuyruk.bosalt() == 1
+    assert calisan == [1]
+    assert _isler(conn) == [("uzun", isler.BITTI, 2, None)]
+
+
+def test_bakim_eski_bitmis_isleri_siler(kuyruk, baglan):
+    kuyruk.gorev("is")(lambda: None)
+    conn = baglan()
+    kuyruk.ekle(conn, "is")
+    kuyruk.ekle(conn, "is")
+    conn.commit()
+    kuyruk.bosalt()
+
+    conn.execute("UPDATE isler SET bitis = bitis - ? WHERE id = 1", (kuyruk.saklama_sn + 1,))
+    conn.commit()
+    kuyruk.bakim(conn)
+    assert [s[0] for s in conn.execute("SELECT id FROM isler")] == [2]
+
+
+@pytest.fixture
+def sayacli(kuyruk, baglan):
+    # tamamla() kullanan görev: artış ve "bitti" aynı commit'te
+    conn = baglan()
+    conn.execute("CREATE TABLE sayac (n INTEGER)")
+    conn.execute("INSERT INTO sayac VALUES (0)")
+    conn.commit()
+
+    def artir(n):
+        c = baglan()
+        if not kuyruk.tamamla(c):
+            c.rollback()
+            return
+        c.execute("UPDATE sayac SET n = n + ?", (n,))
+        c.commit()
+
+    kuyruk.gorev("artir")(artir)
+    kuyruk.ekle(conn, "artir", {"n": 1})
+    conn.commit()
+    return conn
+
+
+def test_tamamla_isci_yazamasa_da_isi_bitirir(kuyruk, baglan, sayacli):
+    isci = baglan()
+    is_ = kuyruk.al(isci)
+    isci.close()  # görevden sonra işçinin kendi yazısı başarısız
+    with pytest.raises(sqlite3.ProgrammingError):
+        kuyruk.calistir(isci, is_)
+
+    assert sayacli.execute("SELECT n FROM sayac").fetchone()[0] == 1
+    sayacli.execute("UPDATE isler SET baslama = baslama - 61")
+    sayacli.commit()
+    kuyruk.bakim(sayacli)
+    assert _isler(sayacli) == [("artir", isler.BITTI, 1, None)]
+    assert kuyruk.bosalt() == 0
+
+
+def test_zaman_asimindan_sonra_biten_eski_deneme_yazmaz(kuyruk, baglan, sayacli):
+    eski = kuyruk.al(baglan())
+    sayacli.execute("UPDATE isler SET baslama = baslama - 61")
+    sayacli.commit()
+    kuyruk.bakim(sayacli)
+    assert kuyruk.bosalt() == 1  # ikinci deneme
+
+    kuyruk.calistir(baglan(), eski)  # ilk deneme geç de olsa bitti
+    assert sayacli.execute("SELECT n FROM sayac").fetchone()[0] == 1
+    assert _isler(sayacli) == [("artir", isler.BITTI, 2, None)]
@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+import pytest
+
+# app modülü DB_PATH'i içe aktarılırken okur; göçler boş, geçici bir veritabanına uygulanır
+os.environ["PROMETHEON_DB"] = os.path.join(tempfile.mkdtemp(), "sema.db")
+os.environ["PROMETHEON_IS_ISCI"] = "0"
+os.environ["PROMETHEON_SIFRE_ISCI"] = "0"
+os.environ["PROMETHEON_SABLON_ISIT"] = "0"
+
+import app  # noqa: E402
+
+# Sıcak sorguların hiçbiri tabloyu baştan sona taramamalı (EXPLAIN QUERY PLAN, `flask sorgu-plani` ile aynı).
+
+
+@pytest.fixture(scope="module")
+def conn():
+    with app.app.app_context():
+        yield app.db_baglantisi_kur()
+
+
+@pytest.mark.parametrize("ad", list(app.SICAK_SORGULAR))
+def test_sicak_sorgu_tam_tarama_yapmaz(conn, ad):
+    planlar = {ad: (adimlar, tam) for ad, adimlar, tam in app.sorgu_planlari(app.bos_sema(conn))}
+    adimlar, tam = planlar[ad]
+    assert tam == [], "\n".join(adimlar)
+
+
+def test_kontrol_veriye_bagli_degil(conn):
+    # birkaç satır + ANALYZE: planlayıcı gerçek veritabanında taramayı seçer, boş şema kopyası seçmez
+    conn.execute("INSERT INTO users (ad_soyad, email, sifre, rol) VALUES ('A', 'a@b.c', 'x', 'yazar')")
+    for i in range(20):
+        conn.execute(
+            "INSERT INTO yazilar (author_id, baslik, icerik, kategori, durum) VALUES (1, ?, '', 'Felsefe', 1)",
+            (f"yazı {i}",),
+        )
+    conn.execute("ANALYZE")
+    conn.commit()
+
+    assert [t for _, _, tam in app.sorgu_planlari(app.bos_sema(conn)) for t in tam] == []
+
+
+def test_eksik_indeks_yakalanir(conn):
+    # indeks yoksa plan "SCAN" demeyebilir: rowid aralığı ya da her sorguda kurulan geçici (AUTOMATIC) indeks
+    kopya = app.bos_sema(conn)
+    kopya.execute("DROP INDEX idx_yorumlar_post")
+    taramalar = {ad for ad, _, tam in app.sorgu_planlari(kopya) if tam}
+    assert {"detay ana yorumlar", "cevap sayfası", "yorum ağacı"} <= taramalar
@@ -0,0 +1,251 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import urllib.request
+
+try:
+    import brotli
+except ImportError:  # brotli yoksa sadece .gz üretilir
+    brotli = None
+
+# CDN'den gelen css/js/yazı tiplerini kendi sunucumuzdan, parmak izli ve önceden sıkıştırılmış sunar.
+#   python varlik_derle.py --indir   # vendor/ klasörünü CDN'den bir kez doldurur
+#   python varlik_derle.py           # static/dist/ altına paket.<hash>.css/js + .gz/.br + manifest.json
+# manifest uygulama açılışında okunur; derledikten sonra worker'ları yeniden başlatın.
+
+STATIC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+VENDOR = os.path.join(STATIC, "vendor")
+DIST = os.path.join(STATIC, "dist")
+MANIFEST = os.path.join(DIST, "manifest.json")
+
+BOOTSTRAP = "https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/"
+FONTAWESOME = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/"
+# layout.html ve style.css'in istediği tüm aileler tek istekte
+YAZI_TIPLERI = (
+    "https://fonts.googleapis.com/css2?family=Dancing+Script:wght@600"
+    "&family=Inter:wght@300;400;600"
+    "&family=Merriweather:ital,wght@0,300;0,400;0,700;1,400"
+    "&family=Playfair+Display:ital,wght@0,400;0,700;1,400&display=swap"
+)
+# Google woff2 dosyalarını yalnızca güncel tarayıcılara verir
+TARAYICI = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+# vendor/ altındaki yerel yol -> kaynak adres
+KAYNAKLAR = {
+    "bootstrap-5.3.0/bootstrap.min.css": BOOTSTRAP + "css/bootstrap.min.css",
+    "bootstrap-5.3.0/bootstrap.bundle.min.js": BOOTSTRAP + "js/bootstrap.bundle.min.js",
+    "fontawesome-6.4.0/css/all.min.css": FONTAWESOME + "css/all.min.css",
+}
+FA_YAZI_TIPLERI = [
+    f"fa-{ad}.{uzanti}"
+    for ad in ("brands-400", "regular-400", "solid-900", "v4compatibility")
+    for uzanti in ("woff2", "ttf")
+]
+
+# paket -> static/ altındaki kaynak dosyalar (sıra = cascade sırası, layout.html'deki eski sıra)
+PAKETLER = {
+    "paket.css": [
+        "vendor/fonts/fonts.css",
+        "vendor/bootstrap-5.3.0/bootstrap.min.css",
+        "vendor/fontawesome-6.4.0/css/all.min.css",
+        "style.css",
+        "tema.css",
+    ],
+    "paket.js": ["vendor/bootstrap-5.3.0/bootstrap.bundle.min.js"],
+}
+# pakete girmeyip doğrudan parmak izi alan dosyalar
+TEKLER = ["logo.png"]
+
+# kendi barındırdığımız yazı tiplerinin uzak @import'ları pakette atılır
+ATILAN_IMPORT = ("fonts.googleapis.com",)
+SIKISTIRILACAK = (".css", ".js", ".svg", ".ttf", ".json")
+EN_AZ_SIKISTIRMA = 256
+
+URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+IMPORT_RE = re.compile(r"""@import\s+(?:url\()?\s*['"]?([^'")\s]+)['"]?\s*\)?[^;]*;""")
+YORUM_RE = re.compile(r"/\*(?!!).*?\*/", re.S)
+CHARSET_RE = re.compile(r"""@charset\s+['"][^'"]*['"]\s*;""", re.I)
+KAYNAK_HARITASI_RE = re.compile(r"/[*/][#@]\s*sourceMappingURL=[^\n]*")
+
+
+# --- İNDİRME ---
+def _getir(adres):
+    istek = urllib.request.Request(adres, headers={"User-Agent": TARAYICI})
+    with urllib.request.urlopen(istek, timeout=30) as cevap:
+        return cevap.read()
+
+
+def _yaz(yol, veri):
+    os.makedirs(os.path.dirname(yol), exist_ok=True)
+    with open(yol, "wb") as f:
+        f.write(veri)
+
+
+def indir():
+    for yerel, adres in KAYNAKLAR.items():
+        print("indiriliyor:", adres)
+        _yaz(os.path.join(VENDOR, yerel), _getir(adres))
+    for ad in FA_YAZI_TIPLERI:
+        print("indiriliyor:", ad)
+        _yaz(os.path.join(VENDOR, "fontawesome-6.4.0", "webfonts", ad), _getir(FONTAWESOME + "webfonts/" + ad))
+
+    # Google css'indeki fonts.gstatic.com adresleri yerel kopyalara çevrilir
+    css = _getir(YAZI_TIPLERI).decode("utf-8")
+
+    def yerellestir(m):
+        adres = m.group(2)
+        if not adres.startswith("http"):
+            return m.group(0)
+        ad = hashlib.sha256(adres.encode()).hexdigest()[:12] + os.path.splitext(adres)[1]
+        hedef = os.path.join(VENDOR, "fonts", ad)
+        if not os.path.exists(hedef):
+            _yaz(hedef, _getir(adres))
+        return f"url({ad})"
+
+    css = URL_RE.sub(yerellestir, css)
+    _yaz(os.path.join(VENDOR, "fonts", "fonts.css"), css.encode("utf-8"))
+    print("vendor hazır:", VENDOR)
+
+
+# --- DERLEME ---
+def _parmak_izi(veri):
+    return hashlib.sha256(veri).hexdigest()[:10]
+
+
+def _izli_ad(goreli, veri):
+    kok, uzanti = os.path.splitext(goreli)
+    return f"{kok}.{_parmak_izi(veri)}{uzanti}"
+
+
+def _sikistir(yol, veri):
+    if not yol.endswith(SIKISTIRILACAK) or len(veri) < EN_AZ_SIKISTIRMA:
+        return
+    with open(yol + ".gz", "wb") as f:
+        # mtime=0: aynı içerik her derlemede aynı .gz
+        with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=9, mtime=0) as gz:
+            gz.write(veri)
+    if brotli is not None:
+        with open(yol + ".br", "wb") as f:
+            f.write(brotli.compress(veri, quality=11))
+
+
+class Derleyici:
+    def __init__(self):
+        self.manifest = {}
+
+    def dosya(self, goreli):
+        # static/ altındaki dosyayı dist/'e parmak izli kopyalar, dist içindeki yolunu döndürür
+        goreli = os.path.normpath(goreli).replace(os.sep, "/")
+        if goreli in self.manifest:
+            return self.manifest[goreli]
+        with open(os.path.join(STATIC, goreli), "rb") as f:
+            veri = f.read()
+        return self._yayinla(goreli, veri)
+
+    def _yayinla(self, goreli, veri):
+        izli = "dist/" + _izli_ad(goreli, veri)
+        hedef = os.path.join(STATIC, izli)
+        if not os.path.exists(hedef):
+            _yaz(hedef, veri)
+            _sikistir(hedef, veri)
+        self.manifest[goreli] = izli
+        return izli
+
+    def css(self, goreli):
+        # url()'leri parmak izli kopyalara çevirir; yollar dist/ köküne göre yazılır
+        with open(os.path.join(STATIC, goreli), encoding="utf-8") as f:
+            metin = f.read()
+        klasor = os.path.dirname(goreli)
+
+        def cevir(m):
+            adres = m.group(2).strip()
+            if adres.startswith(("data:", "http:", "https:", "//", "#", "/")):
+                return m.group(0)
+            yol, ek = _ayir(adres)
+            kaynak = os.path.normpath(os.path.join(klasor, yol))
+            if not os.path.isfile(os.path.join(STATIC, kaynak)):
+                print("uyarı: bulunamadı", kaynak, "(", goreli, ")")
+                return m.group(0)
+            izli = self.dosya(kaynak)
+            return f"url({izli[len('dist/'):]}{ek})"
+
+        return URL_RE.sub(cevir, metin)
+
+    def paket(self, ad, parcalar):
+        if ad.endswith(".css"):
+            importlar, govdeler = [], []
+            for parca in parcalar:
+                metin = KAYNAK_HARITASI_RE.sub("", self.css(parca))
+                metin = CHARSET_RE.sub("", metin)
+
+                def topla(m):
+                    if not any(alan in m.group(1) for alan in ATILAN_IMPORT):
+                        importlar.append(m.group(0))
+                    return ""
+
+                metin = IMPORT_RE.sub(topla, YORUM_RE.sub("", metin))
+                govdeler.append(_kucult(metin))
+            # @charset ve @import yalnızca dosyanın başında geçerli
+            metin = '@charset "UTF-8";\n' + "".join(importlar) + "\n".join(govdeler)
+        else:
+            metin = ""
+            for parca in parcalar:
+                with open(os.path.join(STATIC, parca), encoding="utf-8") as f:
+                    metin += KAYNAK_HARITASI_RE.sub("", f.read()).rstrip() + "\n;\n"
+        return self._yayinla(ad, metin.encode("utf-8"))
+
+
+def _ayir(adres):
+    # "fa-solid-900.woff2?v=6#iefix" -> ("fa-solid-900.woff2", "?v=6#iefix")
+    m = re.match(r"([^?#]*)(.*)", adres)
+    return m.group(1), m.group(2)
+
+
+def _kucult(metin):
+    # sadece güvenli boşluk temizliği; vendor dosyaları zaten küçültülmüş
+    metin = re.sub(r"\s+", " ", metin)
+    metin = re.sub(r"\s*([{};,])\s*", r"\1", metin)
+    return metin.replace(";}", "}").strip()
+
+
+def derle(temizle=False):
+    eksik = [p for parcalar in PAKETLER.values() for p in parcalar if not os.path.isfile(os.path.join(STATIC, p))]
+    if eksik:
+        raise SystemExit("eksik kaynak dosyalar (önce --indir):\n  " + "\n  ".join(eksik))
+    if temizle:
+        shutil.rmtree(DIST, ignore_errors=True)
+    os.makedirs(DIST, exist_ok=True)
+
+    derleyici = Derleyici()
+    for ad, parcalar in PAKETLER.items():
+        derleyici.paket(ad, parcalar)
+    for goreli in TEKLER:
+        derleyici.dosya(goreli)
+
+    # manifest en son ve atomik yazılır: yarım derleme çalışan uygulamaya görünmez
+    gecici = MANIFEST + ".tmp"
+    with open(gecici, "w", encoding="utf-8") as f:
+        json.dump(derleyici.manifest, f, indent=2, sort_keys=True)
+    os.replace(gecici, MANIFEST)
+
+    for goreli, izli in sorted(derleyici.manifest.items()):
+        boyut = os.path.getsize(os.path.join(STATIC, izli))
+        gz = os.path.join(STATIC, izli + ".gz")
+        ek = f"  gzip {os.path.getsize(gz) / 1024:.1f} KB" if os.path.exists(gz) else ""
+        print(f"{goreli:55s} -> {izli}  {boyut / 1024:.1f} KB{ek}")
+    if brotli is None:
+        print("not: brotli modülü yok, .br dosyaları üretilmedi (pip install Brotli)")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="statik varlıkları paketle, parmak izi ekle, önceden sıkıştır")
+    ap.add_argument("--indir", action="store_true", help="bootstrap/font awesome/yazı tiplerini vendor/'a indir")
+    ap.add_argument("--temizle", action="store_true", help="derlemeden önce eski dist/ dosyalarını sil")
+    args = ap.parse_args()
+    if args.indir:
+        indir()
+    derle(temizle=args.temizle)
@@ -0,0 +1,207 @@
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+# Gerçekçi ölçekte deneme veritabanı: N kullanıcı, M yazı (CKEditor'dan çıkmış gibi HTML), ağaç yapılı yorumlar.
+#   python veri_uret.py deneme.db --kullanici 500 --yazi 20000 --yorum 200000
+# Aynı --tohum her seferinde aynı veritabanını üretir. Tüm kullanıcıların şifresi SIFRE;
+# e-postalar kullanici<id>@ornek.test (1 numara admin). Şemayı uygulamanın göçleri kurar.
+
+KELIMELER = (
+    "düşünce ateşi özgürlük ışık iktisat felsefe hukuk anayasa sanat resim şiir ekonomi enflasyon "
+    "faiz piyasa devlet toplum birey çağdaş gelenek tarih bilgi akıl vicdan adalet eşitlik seçim "
+    "meclis yargı karar özgür irade dil edebiyat roman tiyatro müzik sinema şehir köy göç emek "
+    "sermaye üretim tüketim ticaret vergi bütçe kamu özel reform kriz büyüme istikrar ilke"
+).split()
+EKLER = ["", "in", "de", "den", "e", "ler", "lerin", "sel", "ci", "lik", "siz", "leri", "deki"]
+HECELER = "ba be bı bi ka ke kı ki la le lı li ma me mı mi ra re rı ri sa se şa şe ta te ya ye za ze".split()
+
+
+def _uydurma_kelimeler(adet):
+    rnd = random.Random(7)
+    return ["".join(rnd.choices(HECELER, k=rnd.randint(3, 5))) for _ in range(adet)]
+
+
+# ek almış biçimler + ~20 bin seyrek kelime; Zipf dağılımı (az kelime çok, çok kelime az geçer)
+SOZLUK = [k + e for e in EKLER for k in KELIMELER] + _uydurma_kelimeler(20_000)
+AGIRLIKLAR = [1 / (i + 1) for i in range(len(SOZLUK))]
+# choices(weights=...) her çağrıda birikimli toplamı baştan hesaplar; üretimde bu kullanılır
+KUMULATIF = list(itertools.accumulate(AGIRLIKLAR))
+KATEGORILER = ["Politika", "Hukuk", "Felsefe", "Sanat", "Ekonomi"]
+
+ADLAR = "Ayşe Mehmet Zeynep Ali Elif Mustafa Fatma Emre Deniz Can Selin Burak Ece Kerem Defne Oğuz Merve Hakan İrem Tolga".split()
+SOYADLAR = "Yılmaz Kaya Demir Şahin Çelik Yıldız Aydın Öztürk Arslan Doğan Kılıç Aslan Koç Kurt Özdemir".split()
+SIFRE = "deneme123"
+YAZAR_ORANI = 0.1
+YAYINDA_ORANI = 0.92
+CEVAP_ORANI = 0.45
+BASLANGIC = datetime(2024, 1, 1)
+
+
+def ornek_icerik(rnd, kelime_sayisi=120):
+    paragraflar = []
+    for _ in range(3):
+        kelimeler = rnd.choices(SOZLUK, cum_weights=KUMULATIF, k=kelime_sayisi // 3)
+        paragraflar.append("<p>" + " ".join(kelimeler) + "</p>")
+    return "".join(paragraflar)
+
+
+def cumle(rnd, uzunluk):
+    kelimeler = rnd.choices(SOZLUK, cum_weights=KUMULATIF, k=uzunluk)
+    # birkaç kelimeyi vurgula/linkle: editör çıktısındaki etiket yoğunluğu
+    for i in range(len(kelimeler)):
+        zar = rnd.random()
+        if zar < 0.02:
+            kelimeler[i] = f"<strong>{kelimeler[i]}</strong>"
+        elif zar < 0.03:
+            kelimeler[i] = f"<em>{kelimeler[i]}</em>"
+        elif zar < 0.035:
+            kelimeler[i] = f'<a href="https://ornek.test/{kelimeler[i]}">{kelimeler[i]}</a>'
+    return " ".join(kelimeler).capitalize() + "."
+
+
+def zengin_icerik(rnd):
+    # uzunluk log-normal: çoğu yazı 300-1200 kelime, birkaçı çok uzun
+    hedef = int(min(max(rnd.lognormvariate(math.log(600), 0.6), 80), 4000))
+    bloklar, yazilan = [], 0
+    while yazilan < hedef:
+        zar = rnd.random()
+        if zar < 0.1 and bloklar:
+            bloklar.append(f"<h2>{cumle(rnd, rnd.randint(3, 7))[:-1]}</h2>")
+        elif zar < 0.17:
+            bloklar.append(f"<blockquote><p>{cumle(rnd, rnd.randint(15, 35))}</p></blockquote>")
+        elif zar < 0.24:
+            maddeler = "".join(f"<li>{cumle(rnd, rnd.randint(5, 14))}</li>" for _ in range(rnd.randint(3, 6)))
+            bloklar.append(f"<ul>{maddeler}</ul>")
+        elif zar < 0.27:
+            bloklar.append(f'<p><img src="/static/uploads/ornek-{rnd.randint(1, 50)}.jpg" class="img-fluid" alt=""></p>')
+            continue
+        else:
+            cumleler = [cumle(rnd, rnd.randint(8, 25)) for _ in range(rnd.randint(2, 6))]
+            bloklar.append("<p>" + " ".join(cumleler) + "</p>")
+        yazilan += bloklar[-1].count(" ") + 1
+    return "\n".join(bloklar)
+
+
+def _tarih(zaman):
+    return zaman.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _kullanicilar(rnd, adet, sifre):
+    for i in range(1, adet + 1):
+        rol = "admin" if i == 1 else ("yazar" if i == 2 or rnd.random() < YAZAR_ORANI else "okur")
+        ad = f"{rnd.choice(ADLAR)} {rnd.choice(SOYADLAR)}"
+        yield i, ad, f"kullanici{i}@ornek.test", sifre, rol, f"{ad}, {rnd.choice(KATEGORILER).lower()} üzerine yazar."
+
+
+def _yazilar(uygulama, rnd, adet, yazarlar):
+    # id sırası = tarih sırası; ortalama ~6 saatte bir yazı
+    zaman = BASLANGIC
+    for i in range(1, adet + 1):
+        zaman += timedelta(minutes=rnd.expovariate(1 / 360))
+        icerik = zengin_icerik(rnd)
+        baslik = " ".join(rnd.choices(SOZLUK, cum_weights=KUMULATIF, k=rnd.randint(3, 8))).capitalize()
+        yield (
+            i, rnd.choice(yazarlar), baslik, icerik, rnd.choice(KATEGORILER),
+            1 if rnd.random() < YAYINDA_ORANI else 0, _tarih(zaman),
+            int(rnd.paretovariate(1.2) * 40), *uygulama.ozet_hesapla(icerik),
+        )
+
+
+def _yorumlar(rnd, adet, yayinda, kullanici_sayisi):
+    # popüler yazılar yorumların çoğunu alır; cevaplar aynı yazının son yorumlarına gelir
+    sirali = list(yayinda)
+    rnd.shuffle(sirali)
+    agirliklar = [1 / (sira + 1) ** 0.8 for sira in range(len(sirali))]
+    yazi_yorumlari = {}
+    for i, post_id in enumerate(rnd.choices(sirali, weights=agirliklar, k=adet), start=1):
+        onceki = yazi_yorumlari.setdefault(post_id, [])
+        parent_id = rnd.choice(onceki[-20:]) if onceki and rnd.random() < CEVAP_ORANI else None
+        onceki.append(i)
+        zaman = BASLANGIC + timedelta(minutes=i * 3 + rnd.randint(0, 2))
+        yield i, post_id, rnd.randint(1, kullanici_sayisi), cumle(rnd, rnd.randint(5, 60)), _tarih(zaman), parent_id
+
+
+def _parti_parti(conn, sql, satirlar, boyut, etiket):
+    parti, toplam, bas = [], 0, time.perf_counter()
+    for satir in satirlar:
+        parti.append(satir)
+        if len(parti) >= boyut:
+            conn.executemany(sql, parti)
+            conn.commit()
+            toplam += len(parti)
+            parti.clear()
+            print(f"\r{etiket}: {toplam}", end="", flush=True)
+    if parti:
+        conn.executemany(sql, parti)
+        conn.commit()
+        toplam += len(parti)
+    print(f"\r{etiket}: {toplam} ({time.perf_counter() - bas:.1f} sn)")
+    return toplam
+
+
+def uret(uygulama, yol, kullanici=100, yazi=2000, yorum=20000, tohum=42):
+    # boş bir dosyaya üretir; FTS ve sayaç tetikleyicileri her satırda çalışır (gerçek yazma yolu gibi)
+    rnd = random.Random(tohum)
+    uygulama.DB_PATH = yol
+    with uygulama.app.app_context():
+        conn = uygulama.db_baglantisi_kur()
+        if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is not None:
+            raise SystemExit(f"{yol} boş değil")
+        conn.yavas_esik = float("inf")  # toplu yazımda yavaş sorgu uyarısı anlamsız
+
+        kullanicilar = list(_kullanicilar(rnd, kullanici, generate_password_hash(SIFRE)))
+        _parti_parti(
+            conn, "INSERT INTO users (id, ad_soyad, email, sifre, rol, biyografi) VALUES (?, ?, ?, ?, ?, ?)",
+            kullanicilar, 1000, "kullanıcı",
+        )
+        yazarlar = [k[0] for k in kullanicilar if k[4] in ("admin", "yazar")]
+        _parti_parti(
+            conn,
+            "INSERT INTO yazilar (id, author_id, baslik, icerik, kategori, durum, tarih, goruntulenme, "
+            "ozet, kelime_sayisi, metin) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _yazilar(uygulama, rnd, yazi, yazarlar), 500, "yazı",
+        )
+        yayinda = [s[0] for s in conn.execute("SELECT id FROM yazilar WHERE durum = 1")]
+        _parti_parti(
+            conn, "INSERT INTO yorumlar (id, post_id, user_id, yorum, tarih, parent_id) VALUES (?, ?, ?, ?, ?, ?)",
+            _yorumlar(rnd, yorum, yayinda, kullanici), 5000, "yorum",
+        )
+        conn.execute("ANALYZE")
+        conn.commit()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Prometheon deneme veritabanı üretici")
+    ap.add_argument("yol", help="üretilecek sqlite dosyası")
+    ap.add_argument("--kullanici", type=int, default=100)
+    ap.add_argument("--yazi", type=int, default=2000)
+    ap.add_argument("--yorum", type=int, default=20000)
+    ap.add_argument("--tohum", type=int, default=42)
+    ap.add_argument("--uzerine-yaz", action="store_true", help="dosya varsa silip baştan üret")
+    args = ap.parse_args()
+
+    if os.path.exists(args.yol):
+        if not args.uzerine_yaz:
+            sys.exit(f"{args.yol} zaten var (--uzerine-yaz)")
+        for ek in ("", "-wal", "-shm"):
+            if os.path.exists(args.yol + ek):
+                os.remove(args.yol + ek)
+    # uygulama import edilirken bu dosyayı görsün; işçiler üretim sırasında kuyruğu kurcalamasın
+    os.environ["PROMETHEON_DB"] = os.path.abspath(args.yol)
+    os.environ.setdefault("PROMETHEON_IS_ISCI", "0")
+    import app as uygulama
+
+    uret(uygulama, os.path.abspath(args.yol), args.kullanici, args.yazi, args.yorum, args.tohum)
+    print(f"✅ {args.yol} hazır. Giriş: kullanici1@ornek.test / {SIFRE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import threading
+import time
+
+# Kullanıcıların görünen alanları (ad, resim, biyografi, rol) için süreç içi dizin. Yorum ve yazı
+# sorguları users'a JOIN yapmaz; adlar buradan çözülür.
+#   dizin.al([3, 7])  -> {id: kayıt}; eksikler tek sorguyla çekilip eklenir
+#   dizin.yazarlar()  -> admin/yazar listesi (/yazarlar)
+#   dizin.surum()     -> surumler tablosundaki "users" değeri (ETag/Last-Modified için)
+# Geçerlilik surumler'deki "users" sürümüne bağlı (tetikleyicilerle artar). Sürüm en fazla kontrol_sn'de bir
+# okunur; değişmişse her şey atılır. Diğer worker'lardaki değişiklik en geç kontrol_sn sonra görünür,
+# aynı süreçteki değişiklik için yazan yol gecersiz_kil() çağırır.
+
+ALANLAR = "id, ad_soyad, profil_resmi, biyografi, rol"
+
+
+class YazarOnbellegi:
+    def __init__(self, baglan, kontrol_sn=2):
+        # baglan: istek bağlantısını veren fonksiyon (db_baglantisi_kur)
+        self.baglan = baglan
+        self.kontrol_sn = kontrol_sn
+        self._surum = None
+        self._kontrol = 0.0
+        self._kayitlar = {}
+        self._yazarlar = None
+        self._kilit = threading.Lock()
+        self.isabet = 0
+        self.iska = 0
+
+    def gecersiz_kil(self):
+        with self._kilit:
+            self._surum = None
+
+    def surum(self):
+        simdi = time.monotonic()
+        if self._surum is not None and simdi - self._kontrol < self.kontrol_sn:
+            return self._surum
+        satir = self.baglan().execute("SELECT deger FROM surumler WHERE ad = 'users'").fetchone()
+        surum = satir[0] if satir else 0
+        with self._kilit:
+            if surum != self._surum:
+                # sürüm önce okunur, kayıtlar sonra: arada yazılan değişiklik sonraki kontrolde yakalanır
+                self._kayitlar = {}
+                self._yazarlar = None
+            self._surum = surum
+            self._kontrol = simdi
+        return surum
+
+    def al(self, idler):
+        self.surum()
+        kayitlar = self._kayitlar
+        eksik = {i for i in idler if i not in kayitlar}
+        self.isabet += len(idler) - len(eksik)
+        if eksik:
+            self.iska += len(eksik)
+            yer = ",".join("?" * len(eksik))
+            satirlar = self.baglan().execute(f"SELECT {ALANLAR} FROM users WHERE id IN ({yer})", tuple(eksik))
+            yeni = {s["id"]: dict(s) for s in satirlar}
+            with self._kilit:
+                # bu arada sürüm değiştiyse sözlük yenilenmiştir; eski satırlar yenisine karışmasın
+                if kayitlar is self._kayitlar:
+                    kayitlar.update(yeni)
+            kayitlar = {**kayitlar, **yeni}
+        return {i: kayitlar[i] for i in idler if i in kayitlar}
+
+    def ad(self, id):
+        kayit = self.al([id]).get(id)
+        return kayit["ad_soyad"] if kayit else None
+
+    def yazarlar(self):
+        self.surum()
+        yazarlar, nesil = self._yazarlar, self._kayitlar
+        if yazarlar is None:
+            self.iska += 1
+            satirlar = self.baglan().execute(
+                f"SELECT {ALANLAR} FROM users WHERE rol IN ('admin','yazar') ORDER BY id"
+            )
+            yazarlar = [dict(s) for s in satirlar]
+            with self._kilit:
+                # kayıt sözlüğü her sürüm değişiminde yenilenir; aynıysa liste hâlâ bu sürüme ait
+                if self._kayitlar is nesil:
+                    self._yazarlar = yazarlar
+        else:
+            self.isabet += 1
+        return yazarlar
+
+    def __len__(self):
+        return len(self._kayitlar)
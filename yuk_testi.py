@@ -0,0 +1,367 @@
+import argparse
+import http.cookiejar
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+
+import veri_uret
+
+# Yük testi: üretilmiş bir veritabanında ana yollara eşzamanlı istek atar; senaryo başına
+# p50/p95/p99 gecikme, ilk byte süresi (TTFB) ve istek/sn ölçer, sonucu JSON'a yazar.
+#   python yuk_testi.py --yazi 5000 --yorum 50000 --cikti sonuc.json    # geçici veritabanı üretir
+#   python yuk_testi.py --db deneme.db --karsilastir onceki.json         # p95 eşikten fazla kötüleşirse çıkış 1
+#   python yuk_testi.py --db deneme.db --adres http://127.0.0.1:8000     # test istemcisi yerine çalışan sunucu
+#   python yuk_testi.py --db deneme.db --senaryo giris --senaryo detay --arka-plan giris
+#       # giriş (şifre özeti) yükü altında okur gecikmesi; arka plan istek/sn'i de yazılır
+# --adres'te sunucu aynı veritabanıyla (PROMETHEON_DB) çalışıyor olmalı; yazı/yorum id'leri oradan okunur.
+# Giriş senaryosu için sunucuda deneme sınırı kapalı olmalı (PROMETHEON_GIRIS_SINIRI=0); tüm istekler tek IP'den.
+
+SENARYOLAR = ["anasayfa", "detay", "arama", "kategori", "yorum-ekle", "yorum-yanitla", "giris"]
+# arama terimleri sözlüğün sık geçen başından; seyrek kelimeler de arada bir
+ARAMA_TERIMLERI = veri_uret.SOZLUK[:400] + veri_uret.SOZLUK[-100:]
+
+
+class TestIstemcisi:
+    # uygulama aynı süreçte; ağ/sunucu maliyeti yok, sadece uygulama kodu ölçülür.
+    # gövde parça parça okunur; ilk parçaya kadar geçen süre ilk_bayt'ta (akışlı yanıtlarda farklıdır)
+    def __init__(self, app):
+        self.istemci = app.test_client()
+        self.ilk_bayt = 0.0
+
+    def get(self, yol):
+        bas = time.perf_counter()
+        cevap = self.istemci.get(yol, buffered=False)
+        self.ilk_bayt = None
+        for _ in cevap.response:
+            if self.ilk_bayt is None:
+                self.ilk_bayt = time.perf_counter() - bas
+        cevap.close()
+        if self.ilk_bayt is None:
+            self.ilk_bayt = time.perf_counter() - bas
+        return cevap.status_code
+
+    def post(self, yol, veri):
+        bas = time.perf_counter()
+        durum = self.istemci.post(yol, data=veri).status_code
+        self.ilk_bayt = time.perf_counter() - bas
+        return durum
+
+
+class _YonlendirmeYok(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpIstemcisi:
+    def __init__(self, adres):
+        self.adres = adres.rstrip("/")
+        self.acici = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _YonlendirmeYok
+        )
+        self.ilk_bayt = 0.0
+
+    def _istek(self, yol, veri=None):
+        govde = urllib.parse.urlencode(veri).encode() if veri is not None else None
+        bas = time.perf_counter()
+        try:
+            with self.acici.open(self.adres + yol, data=govde, timeout=30) as cevap:
+                cevap.read(1)
+                self.ilk_bayt = time.perf_counter() - bas
+                cevap.read()
+                return cevap.status
+        except urllib.error.HTTPError as hata:
+            self.ilk_bayt = time.perf_counter() - bas
+            hata.read()
+            return hata.code
+
+    def get(self, yol):
+        return self._istek(yol)
+
+    def post(self, yol, veri):
+        return self._istek(yol, veri)
+
+
+class Senaryo:
+    # rnd: thread başına; yazılar popülerliğe göre (Zipf), yorumlar rastgele seçilir
+    def __init__(self, yazilar, yorumlar, kullanici_sayisi):
+        self.yazilar = yazilar
+        # birikimli ağırlık bir kez; her seçim O(log n)
+        self.kumulatif = list(itertools.accumulate(1 / (i + 1) ** 0.8 for i in range(len(yazilar))))
+        self.yorumlar = yorumlar
+        self.kullanici_sayisi = kullanici_sayisi
+
+    def yazi(self, rnd):
+        return rnd.choices(self.yazilar, cum_weights=self.kumulatif)[0]
+
+    def giris_bilgisi(self, sira):
+        # 1 numara admin (giriş admin paneline yönlendirir); diğerleri sırayla
+        no = 2 + sira % max(self.kullanici_sayisi - 1, 1)
+        return {"email": f"kullanici{no}@ornek.test", "sifre": veri_uret.SIFRE}
+
+    def calistir(self, ad, istemci, rnd):
+        if ad == "anasayfa":
+            return istemci.get("/"), 200
+        if ad == "detay":
+            return istemci.get(f"/{self.yazi(rnd)}"), 200
+        if ad == "arama":
+            q = urllib.parse.quote(rnd.choice(ARAMA_TERIMLERI))
+            return istemci.get(f"/arama?q={q}"), 200
+        if ad == "kategori":
+            return istemci.get(f"/kategori/{rnd.choice(veri_uret.KATEGORILER)}"), 200
+        if ad == "giris":
+            return istemci.post("/giris", self.giris_bilgisi(rnd.randrange(self.kullanici_sayisi))), 302
+        metin = {"yorum": veri_uret.cumle(rnd, rnd.randint(5, 40))}
+        if ad == "yorum-ekle":
+            return istemci.post(f"/yorum-ekle/{self.yazi(rnd)}", metin), 302
+        yorum_id, post_id = rnd.choice(self.yorumlar)
+        return istemci.post(f"/yorum-yanitla/{post_id}/{yorum_id}", metin), 302
+
+
+def _yuzdelik(sureler, p):
+    if len(sureler) < 2:
+        return sureler[0] if sureler else 0.0
+    return statistics.quantiles(sureler, n=100, method="inclusive")[p - 1]
+
+
+def senaryo_olc(ad, senaryo, istemci_uret, istek, thread_sayisi, isinma, tohum, giris):
+    # her thread kendi istemcisiyle (kendi çerezleri) çalışır; ısınma istekleri sayılmaz
+    sureler, ilk_baytlar, hatalar = [], [], {}
+    kilit = threading.Lock()
+    hazir = threading.Barrier(thread_sayisi + 1)
+    pay = [istek // thread_sayisi + (1 if i < istek % thread_sayisi else 0) for i in range(thread_sayisi)]
+
+    def isci(sira):
+        rnd = random.Random(tohum * 1000 + sira)
+        istemci = istemci_uret()
+        try:
+            if giris:
+                durum = istemci.post("/giris", senaryo.giris_bilgisi(sira))
+                assert durum == 302, f"giriş başarısız ({durum})"
+            for _ in range(isinma):
+                senaryo.calistir(ad, istemci, rnd)
+        except BaseException:
+            hazir.abort()
+            raise
+        hazir.wait()
+        yerel, yerel_ilk, yerel_hata = [], [], {}
+        for _ in range(pay[sira]):
+            bas = time.perf_counter()
+            durum, beklenen = senaryo.calistir(ad, istemci, rnd)
+            yerel.append(time.perf_counter() - bas)
+            yerel_ilk.append(istemci.ilk_bayt)
+            if durum != beklenen:
+                yerel_hata[durum] = yerel_hata.get(durum, 0) + 1
+        with kilit:
+            sureler.extend(yerel)
+            ilk_baytlar.extend(yerel_ilk)
+            for durum, adet in yerel_hata.items():
+                hatalar[str(durum)] = hatalar.get(str(durum), 0) + adet
+
+    threadler = [threading.Thread(target=isci, args=(i,)) for i in range(thread_sayisi)]
+    for t in threadler:
+        t.start()
+    hazir.wait()
+    bas = time.perf_counter()
+    for t in threadler:
+        t.join()
+    gecen = time.perf_counter() - bas
+
+    ms = sorted(s * 1000 for s in sureler)
+    ilk_ms = sorted(s * 1000 for s in ilk_baytlar)
+    return {
+        "istek": len(ms),
+        "hata": hatalar,
+        "sure_sn": round(gecen, 3),
+        "istek_sn": round(len(ms) / gecen, 1) if gecen else 0.0,
+        "ort_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "p50_ms": round(_yuzdelik(ms, 50), 3),
+        "p95_ms": round(_yuzdelik(ms, 95), 3),
+        "p99_ms": round(_yuzdelik(ms, 99), 3),
+        "en_cok_ms": round(ms[-1], 3) if ms else 0.0,
+        "ttfb_p50_ms": round(_yuzdelik(ilk_ms, 50), 3),
+        "ttfb_p95_ms": round(_yuzdelik(ilk_ms, 95), 3),
+    }
+
+
+def arka_plan_baslat(ad, senaryo, istemci_uret, thread_sayisi, tohum):
+    # ölçüm süresince ad senaryosunu durmadan çalıştırır; durdur() -> (istek/sn, hata sayısı)
+    dur = threading.Event()
+    sayac = {"istek": 0, "hata": 0}
+    kilit = threading.Lock()
+
+    def isci(sira):
+        rnd = random.Random(tohum * 1000 + 500 + sira)
+        istemci = istemci_uret()
+        if ad.startswith("yorum"):
+            istemci.post("/giris", senaryo.giris_bilgisi(sira))
+        while not dur.is_set():
+            durum, beklenen = senaryo.calistir(ad, istemci, rnd)
+            with kilit:
+                sayac["istek"] += 1
+                sayac["hata"] += durum != beklenen
+
+    threadler = [threading.Thread(target=isci, args=(i,), daemon=True) for i in range(thread_sayisi)]
+    bas = time.perf_counter()
+    for t in threadler:
+        t.start()
+
+    def durdur():
+        dur.set()
+        for t in threadler:
+            t.join()
+        gecen = time.perf_counter() - bas
+        return round(sayac["istek"] / gecen, 1), sayac["hata"]
+
+    return durdur
+
+
+def _git_surumu():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def karsilastir(onceki, simdiki, esik):
+    # p95 ve istek/sn'e bakar; eşikten fazla kötüleşen senaryoları döndürür
+    gerilemeler = []
+    print(f"\n{'senaryo':<16}{'p95 önce':>10}{'p95 şimdi':>11}{'fark':>8}{'istek/sn önce':>15}{'şimdi':>9}")
+    for ad, s in simdiki["senaryolar"].items():
+        o = onceki["senaryolar"].get(ad)
+        if o is None:
+            continue
+        fark = s["p95_ms"] / o["p95_ms"] - 1 if o["p95_ms"] else 0.0
+        isaret = ""
+        if fark > esik or (o["istek_sn"] and s["istek_sn"] < o["istek_sn"] * (1 - esik)):
+            gerilemeler.append(ad)
+            isaret = "  ❌"
+        print(f"{ad:<16}{o['p95_ms']:>10.2f}{s['p95_ms']:>11.2f}{fark:>+8.0%}{o['istek_sn']:>15.1f}"
+              f"{s['istek_sn']:>9.1f}{isaret}")
+    return gerilemeler
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Prometheon yük testi (p50/p95/p99, istek/sn, JSON çıktı)")
+    ap.add_argument("--db", help="hazır veritabanı (veri_uret.py ile); verilmezse geçici olarak üretilir")
+    ap.add_argument("--kullanici", type=int, default=100)
+    ap.add_argument("--yazi", type=int, default=2000)
+    ap.add_argument("--yorum", type=int, default=20000)
+    ap.add_argument("--tohum", type=int, default=42)
+    ap.add_argument("--senaryo", action="append", choices=SENARYOLAR, help="sadece bunlar (tekrarlanabilir)")
+    ap.add_argument("--istek", type=int, default=500, help="senaryo başına ölçülen istek")
+    ap.add_argument("--thread", type=int, default=8)
+    ap.add_argument("--isinma", type=int, default=5, help="thread başına sayılmayan ilk istek")
+    ap.add_argument("--oturum", action="store_true", help="GET senaryoları da giriş yapmış kullanıcıyla (önbelleksiz)")
+    ap.add_argument("--adres", help="çalışan sunucu (http://127.0.0.1:8000); verilmezse test istemcisi")
+    ap.add_argument("--arka-plan", choices=SENARYOLAR, help="ölçüm boyunca arka planda çalışan senaryo")
+    ap.add_argument("--arka-thread", type=int, default=4)
+    ap.add_argument("--ayar", action="append", default=[], metavar="AD=JSON",
+                    help='test istemcisinde app.config değeri, örn. AKIS_ROTALARI=[] (tekrarlanabilir)')
+    ap.add_argument("--cikti", help="sonuç JSON dosyası")
+    ap.add_argument("--karsilastir", help="önceki JSON; gerileme varsa çıkış kodu 1")
+    ap.add_argument("--esik", type=float, default=0.15, help="kabul edilen kötüleşme oranı")
+    args = ap.parse_args()
+
+    gecici = None
+    db = args.db
+    if db is None:
+        gecici = tempfile.mkdtemp(prefix="prometheon_yuk_")
+        db = os.path.join(gecici, "yuk.db")
+    db = os.path.abspath(db)
+    os.environ["PROMETHEON_DB"] = db
+    import app as uygulama
+
+    # test istemcisinde tüm istekler aynı adresten gelir; giriş denemesi sınırı ölçümü bozmasın
+    uygulama.app.config["GIRIS_SINIRI"] = False
+    ayarlar = {}
+    for ayar in args.ayar:
+        ad, _, deger = ayar.partition("=")
+        ayarlar[ad] = json.loads(deger)
+    uygulama.app.config.update(ayarlar)
+
+    try:
+        if gecici is not None:
+            print(f"{args.kullanici} kullanıcı, {args.yazi} yazı, {args.yorum} yorum üretiliyor...")
+            veri_uret.uret(uygulama, db, args.kullanici, args.yazi, args.yorum, args.tohum)
+        uygulama.DB_PATH = db
+        with uygulama.app.app_context():
+            conn = uygulama.db_baglantisi_kur()
+            yazilar = [s[0] for s in conn.execute("SELECT id FROM yazilar WHERE durum = 1 ORDER BY id DESC")]
+            kullanici_sayisi = conn.execute("SELECT count(*) FROM users").fetchone()[0]
+            yorumlar = [tuple(s) for s in conn.execute(
+                "SELECT yorumlar.id, yorumlar.post_id FROM yorumlar JOIN yazilar ON yazilar.id = yorumlar.post_id "
+                "WHERE yazilar.durum = 1 ORDER BY random() LIMIT 5000"
+            )]
+        if not yazilar or not yorumlar:
+            sys.exit("veritabanında yayında yazı/yorum yok")
+        senaryo = Senaryo(yazilar, yorumlar, kullanici_sayisi)
+
+        def istemci_uret():
+            return HttpIstemcisi(args.adres) if args.adres else TestIstemcisi(uygulama.app)
+
+        sonuc = {
+            "zaman": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git": _git_surumu(),
+            "python": platform.python_version(),
+            "hedef": args.adres or "test-istemcisi",
+            "ayarlar": {
+                **{k: getattr(args, k) for k in ("istek", "thread", "isinma", "oturum", "tohum")},
+                "arka_plan": args.arka_plan,
+                "arka_thread": args.arka_thread,
+                "app": ayarlar,
+            },
+            "veri": {"yazi": len(yazilar), "db": os.path.basename(db)},
+            "senaryolar": {},
+        }
+        print(f"\n{'senaryo':<16}{'istek/sn':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ttfb p95':>10}{'hata':>8}")
+        for ad in args.senaryo or SENARYOLAR:
+            giris = args.oturum or ad.startswith("yorum")
+            durdur = None
+            if args.arka_plan:
+                durdur = arka_plan_baslat(args.arka_plan, senaryo, istemci_uret, args.arka_thread, args.tohum)
+            try:
+                s = senaryo_olc(ad, senaryo, istemci_uret, args.istek, args.thread, args.isinma, args.tohum, giris)
+            finally:
+                if durdur is not None:
+                    arka_istek_sn, arka_hata = durdur()
+            sonuc["senaryolar"][ad] = s
+            print(f"{ad:<16}{s['istek_sn']:>10.1f}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}"
+                  f"{s['ttfb_p95_ms']:>10.2f}{sum(s['hata'].values()):>8}")
+            if durdur is not None:
+                s["arka_plan"] = {"senaryo": args.arka_plan, "istek_sn": arka_istek_sn, "hata": arka_hata}
+                print(f"{'':<16}+ arka planda {args.arka_plan}: {arka_istek_sn} istek/sn, {arka_hata} hata")
+
+        if args.cikti:
+            with open(args.cikti, "w", encoding="utf-8") as f:
+                json.dump(sonuc, f, ensure_ascii=False, indent=2)
+            print(f"\nsonuç: {args.cikti}")
+        if args.karsilastir:
+            with open(args.karsilastir, encoding="utf-8") as f:
+                gerilemeler = karsilastir(json.load(f), sonuc, args.esik)
+            if gerilemeler:
+                print(f"\n❌ gerileme: {', '.join(gerilemeler)}")
+                sys.exit(1)
+            print("\n✅ gerileme yok.")
+    finally:
+        if gecici is not None:
+            shutil.rmtree(gecici, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()